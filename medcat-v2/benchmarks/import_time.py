@@ -0,0 +1,148 @@
+"""Measure the time it takes to import medcat.
+
+Each measurement is done in a fresh python process (with `-X importtime`)
+so that nothing is imported beforehand. The following are reported (as
+the median over the repeats):
+- The total import time of each of the modules.
+- The (self) import time per top level package (e.g `numpy`, `pydantic`,
+  `medcat`) so that it is clear where the time goes.
+- Which of the heavy optional dependencies (e.g `spacy`, `torch`) were
+  imported along the way (none should be).
+- The time it takes to create the first and the second `Config`.
+
+Example:
+
+    python -m benchmarks.import_time --modules medcat medcat.cat \\
+        --repeats 10 --output import_time.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Optional
+
+from benchmarks.run import get_metadata
+
+
+HEAVY_MODULES = ["pandas", "spacy", "torch", "transformers", "peft",
+                 "sklearn", "scipy", "ahocorasick", "datasets"]
+
+_CONFIG_SCRIPT = """
+import time
+from medcat.config import Config
+start = time.perf_counter()
+Config()
+first = time.perf_counter()
+Config()
+print(first - start, time.perf_counter() - first)
+"""
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    # NOTE: lines are of the form
+    #       "import time: <self us> | <cumulative us> | <indent><module>"
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cum_us)))
+    return entries
+
+
+def measure_import(module: str) -> dict:
+    """Measure importing a module in a fresh process.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        dict: The total import time (in seconds), the self import time per
+            top level package and the heavy modules that were imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys, {module}; print(*sys.modules, sep=chr(10))"],
+        capture_output=True, text=True, check=True)
+    entries = _parse_importtime(result.stderr)
+    per_package: dict[str, float] = defaultdict(float)
+    for name, self_us, _ in entries:
+        per_package[name.split(".")[0]] += self_us / 1e6
+    # NOTE: the module itself is the last (outermost) entry by its name
+    total = next(cum_us for name, _, cum_us in reversed(entries)
+                 if name == module) / 1e6
+    imported = set(result.stdout.split())
+    return {
+        "total": total,
+        "per_package": dict(per_package),
+        "heavy_modules": [mod for mod in HEAVY_MODULES if mod in imported],
+    }
+
+
+def measure_config_creation() -> dict:
+    """Measure creating a `Config` in a fresh process.
+
+    Returns:
+        dict: The time (in seconds) to create the first and second config.
+    """
+    result = subprocess.run([sys.executable, "-c", _CONFIG_SCRIPT],
+                            capture_output=True, text=True, check=True)
+    first, second = map(float, result.stdout.split())
+    return {"first": first, "second": second}
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the import time benchmark.
+
+    Args:
+        args (argparse.Namespace): The arguments.
+
+    Returns:
+        dict: The results.
+    """
+    results: dict = {"metadata": get_metadata(args), "imports": {}}
+    for module in args.modules:
+        runs = [measure_import(module) for _ in range(args.repeats)]
+        packages = {pkg for run in runs for pkg in run["per_package"]}
+        per_package = {
+            pkg: statistics.median(run["per_package"].get(pkg, 0.0)
+                                   for run in runs)
+            for pkg in packages}
+        results["imports"][module] = {
+            "total": statistics.median(run["total"] for run in runs),
+            "per_package": dict(sorted(
+                per_package.items(), key=lambda item: -item[1])[:args.top]),
+            "heavy_modules": sorted({
+                mod for run in runs for mod in run["heavy_modules"]}),
+        }
+    config_runs = [measure_config_creation() for _ in range(args.repeats)]
+    results["config_creation"] = {
+        key: statistics.median(run[key] for run in config_runs)
+        for key in ("first", "second")}
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", nargs="+", default=["medcat.cat"],
+                        help="The modules to import")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="The number of (fresh process) measurements")
+    parser.add_argument("--top", type=int, default=15,
+                        help="The number of top level packages to report")
+    parser.add_argument("--output", help="The JSON file for the results")
+    args = parser.parse_args(argv)
+    results = run(args)
+    out = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the memory use of spawned and forked multiprocessing workers.
+
+For each worker count, a worker pool is created with spawned workers
+(each with its own copy of the model) and with forked workers (sharing the
+model with the main process through copy-on-write). Some texts are then
+annotated so that the workers have actually used the model, after which
+the memory of the worker processes is measured.
+
+The proportional set size (PSS) is the most meaningful total since shared
+pages are split between the processes sharing them. The unique set size
+(USS) is what a worker would free up upon exit.
+
+NOTE: Requires Linux (for `/proc/<pid>/smaps_rollup`).
+
+Example:
+
+    python benchmarks/mp_memory.py path/to/model_pack.zip \\
+        --workers 8 16 --output mp_memory.json
+
+This can also be run as part of the benchmark suite (on a synthetic
+model) with `python -m benchmarks.run --mp-memory`.
+"""
+import argparse
+import json
+import logging
+from typing import Optional
+
+from medcat.cat import CAT, MPWorkerPool
+
+
+logger = logging.getLogger(__name__)
+
+
+_TEXTS = [
+    "The patient presented with chronic kidney failure and hypertension.",
+    "No signs of diabetes mellitus were found upon examination.",
+] * 50
+
+
+def measure_workers(cat: CAT, n_workers: int, use_fork: bool) -> dict:
+    """Measure the memory use of the workers of a worker pool.
+
+    Args:
+        cat (CAT): The model to use.
+        n_workers (int): The number of workers.
+        use_fork (bool): Whether to fork the workers.
+
+    Returns:
+        dict: The measurements (in bytes).
+    """
+    with MPWorkerPool(cat, n_workers, use_fork=use_fork) as pool:
+        for _ in cat.get_entities_multi_texts(
+                _TEXTS, batch_size=5, batch_size_chars=-1,
+                worker_pool=pool):
+            pass
+        per_worker = pool.get_worker_memory_usage()
+    totals = {
+        key: sum(usage[key] for usage in per_worker.values())
+        for key in ("rss", "pss", "uss")
+    }
+    return {
+        "n_workers": n_workers,
+        "start_method": "fork" if use_fork else "spawn",
+        "workers_total": totals,
+        "per_worker": list(per_worker.values()),
+    }
+
+
+def main(model_pack_path: str, worker_counts: list[int],
+         output: Optional[str] = None) -> list[dict]:
+    """Measure the memory use for each worker count and start method.
+
+    Args:
+        model_pack_path (str): The model pack to use.
+        worker_counts (list[int]): The numbers of workers to measure for.
+        output (Optional[str]): The JSON file to write the results to.
+            Defaults to None.
+
+    Returns:
+        list[dict]: The measurements.
+    """
+    cat = CAT.load_model_pack(model_pack_path)
+    results = []
+    for n_workers in worker_counts:
+        for use_fork in (False, True):
+            res = measure_workers(cat, n_workers, use_fork)
+            logger.info(
+                "%2d workers (%s): PSS %.1f MB, USS %.1f MB in total",
+                n_workers, res["start_method"],
+                res["workers_total"]["pss"] / 2**20,
+                res["workers_total"]["uss"] / 2**20)
+            results.append(res)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("model_pack_path", help="The model pack to use")
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 16],
+                        help="The numbers of worker processes to measure")
+    parser.add_argument("--output", help="The JSON file for the results")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    main(args.model_pack_path, args.workers, args.output)
@@ -0,0 +1,357 @@
+"""Run the medcat-v2 benchmark suite.
+
+By default, a synthetic model (CDB, vocab) and corpus are generated (see
+`benchmarks.synthetic`). Alternatively, an existing model pack can be used
+along with a corpus file (one document per line).
+
+The following are measured:
+- The time it takes to generate the synthetic model (if applicable).
+- The model pack size, load time and peak RSS upon load (in a fresh
+  process so that nothing else affects the numbers).
+- The documents / characters per second end to end (both one document at a
+  time and through `CAT.pipe`) and for each pipeline component.
+- The tagging throughput with and without the memo of the tagger.
+- The multiprocess scaling for the specified numbers of processes.
+- Optionally, the memory use of spawned and forked worker processes (see
+  `benchmarks/mp_memory.py`).
+- The peak RSS of the benchmarking process.
+
+The results are written as JSON so that they can be compared between
+releases / changes.
+
+Examples:
+
+    python -m benchmarks.run --concepts 100000 --docs 500 \\
+        --processes 1 2 4 8 --output results.json
+    python -m benchmarks.run --model-pack path/to/model_pack.zip \\
+        --corpus texts.txt --output results.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import medcat
+from medcat.cat import CAT
+from medcat.components.tagging.tagger import TagAndSkipTagger
+from medcat.pipeline.profiling import TOKENIZER_NAME
+
+from benchmarks.synthetic import SyntheticModelGenerator
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: The peak RSS in bytes, or None if unavailable.
+    """
+    try:
+        import resource
+    except ImportError:  # e.g Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _get_git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(__file__), text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_metadata(args: argparse.Namespace) -> dict:
+    """Get the information about the environment the benchmark ran in.
+
+    Args:
+        args (argparse.Namespace): The arguments of the run.
+
+    Returns:
+        dict: The metadata.
+    """
+    return {
+        "medcat_version": medcat.__version__,
+        "git_revision": _get_git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now().isoformat(),
+        "args": vars(args),
+    }
+
+
+def _load_model_pack(model_pack_path: str) -> dict:
+    start = time.perf_counter()
+    CAT.load_model_pack(model_pack_path)
+    return {
+        "load_time": time.perf_counter() - start,
+        "peak_rss": get_peak_rss(),
+    }
+
+
+def measure_load(model_pack_path: str) -> dict:
+    """Measure loading a model pack in a fresh process.
+
+    Args:
+        model_pack_path (str): The model pack path.
+
+    Returns:
+        dict: The load time (in seconds), the peak RSS of the loading
+            process (in bytes) and the model pack size (in bytes).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+        res = executor.submit(_load_model_pack, model_pack_path).result()
+    res["model_pack_size"] = os.path.getsize(model_pack_path)
+    return res
+
+
+def _rates(num_docs: int, num_chars: int, wall_time: float) -> dict:
+    return {
+        "docs": num_docs,
+        "chars": num_chars,
+        "wall_time": wall_time,
+        "docs_per_s": num_docs / wall_time if wall_time else None,
+        "chars_per_s": num_chars / wall_time if wall_time else None,
+    }
+
+
+def measure_throughput(cat: CAT, texts: list[str],
+                       batch_size: int = 32) -> dict:
+    """Measure the throughput end to end and for each component.
+
+    Args:
+        cat (CAT): The model.
+        texts (list[str]): The texts to annotate.
+        batch_size (int): The batch size for `CAT.pipe`. Defaults to 32.
+
+    Returns:
+        dict: The throughput end to end (per document and piped) and for
+            each component.
+    """
+    num_chars = sum(len(text) for text in texts)
+    # warm up (e.g lazy init of components)
+    for text in texts[:5]:
+        cat.get_entities(text)
+    with cat.profile_pipeline() as profile:
+        start = time.perf_counter()
+        for text in texts:
+            cat.get_entities(text)
+        wall_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in cat.pipe(texts, batch_size=batch_size):
+        pass
+    piped_time = time.perf_counter() - start
+    components = {}
+    for name, comp_profile in profile:
+        rates = _rates(comp_profile.docs, num_chars, comp_profile.wall_time)
+        rates.update(cpu_time=comp_profile.cpu_time,
+                     tokens=comp_profile.tokens,
+                     entities=comp_profile.entities)
+        components[name] = rates
+    return {
+        "end_to_end": _rates(len(texts), num_chars, wall_time),
+        "piped": _rates(len(texts), num_chars, piped_time),
+        "components": components,
+    }
+
+
+def measure_tagging(cat: CAT, texts: list[str]) -> dict:
+    """Measure the tagging throughput with and without the tagger's memo.
+
+    The texts are tokenized beforehand so that only the tagging is timed.
+    With the memo, the first pass over the texts fills it up and the
+    second pass shows the steady state.
+
+    Args:
+        cat (CAT): The model.
+        texts (list[str]): The texts to tag.
+
+    Returns:
+        dict: The throughput without the memo and for the first and second
+            pass with the memo, along with the speedup of the latter.
+    """
+    num_chars = sum(len(text) for text in texts)
+    docs = [cat._pipeline.tokenizer(text) for text in texts]
+    cnf_p = cat.config.preprocessing.model_copy()
+    cnf_p.tagging_cache_size = 0
+    taggers = {
+        "uncached": TagAndSkipTagger(cnf_p),
+        "cached_first_pass": TagAndSkipTagger(cat.config.preprocessing),
+    }
+    taggers["cached"] = taggers["cached_first_pass"]
+    results: dict = {}
+    for name, tagger in taggers.items():
+        start = time.perf_counter()
+        for doc in docs:
+            tagger(doc)
+        results[name] = _rates(len(docs), num_chars,
+                               time.perf_counter() - start)
+    results["memo_size"] = len(taggers["cached"]._memo)
+    results["speedup"] = (results["uncached"]["wall_time"] /
+                          results["cached"]["wall_time"])
+    return results
+
+
+def measure_mp_scaling(cat: CAT, texts: list[str], process_counts: list[int],
+                       batch_size_chars: int) -> list[dict]:
+    """Measure the multiprocess throughput for each number of processes.
+
+    Args:
+        cat (CAT): The model.
+        texts (list[str]): The texts to annotate.
+        process_counts (list[int]): The numbers of processes.
+        batch_size_chars (int): The number of characters per batch.
+
+    Returns:
+        list[dict]: The throughput and speedup for each number of processes.
+    """
+    num_chars = sum(len(text) for text in texts)
+    results: list[dict] = []
+    for n_process in process_counts:
+        start = time.perf_counter()
+        for _ in cat.get_entities_multi_texts(
+                texts, n_process=n_process,
+                batch_size_chars=batch_size_chars):
+            pass
+        res = _rates(len(texts), num_chars, time.perf_counter() - start)
+        res["n_process"] = n_process
+        res["speedup"] = (results[0]["wall_time"] / res["wall_time"]
+                          if results else 1.0)
+        logger.info("%2d processes: %.1f docs/s", n_process,
+                    res["docs_per_s"])
+        results.append(res)
+    return results
+
+
+def _read_corpus(corpus_path: str) -> list[str]:
+    with open(corpus_path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the benchmarks.
+
+    Args:
+        args (argparse.Namespace): The arguments.
+
+    Returns:
+        dict: The results.
+    """
+    results: dict = {"meta": get_metadata(args)}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.model_pack:
+            model_pack_path = args.model_pack
+            texts = _read_corpus(args.corpus)
+        else:
+            start = time.perf_counter()
+            gen = SyntheticModelGenerator(
+                args.concepts, args.names_per_concept, args.ambiguity,
+                seed=args.seed)
+            cat = gen.generate_model(n_train_docs=args.train_docs)
+            results["generation"] = {
+                "time": time.perf_counter() - start,
+                "concepts": len(cat.cdb.cui2info),
+                "names": len(cat.cdb.name2info),
+                "vocab_words": len(cat.vocab.vocab),
+            }
+            logger.info("Generated model in %.1fs",
+                        results["generation"]["time"])
+            texts = gen.generate_corpus(args.docs)
+            model_pack_path = cat.save_model_pack(
+                temp_dir, pack_name="benchmark_model", only_archive=True)
+            del cat
+        results["load"] = measure_load(model_pack_path)
+        logger.info("Loaded model in %.1fs", results["load"]["load_time"])
+        cat = CAT.load_model_pack(model_pack_path)
+    results["corpus"] = {
+        "docs": len(texts),
+        "chars": sum(len(text) for text in texts),
+    }
+    results["throughput"] = measure_throughput(cat, texts, args.batch_size)
+    logger.info("End to end: %.1f docs/s (tokenizer: %.1f docs/s)",
+                results["throughput"]["end_to_end"]["docs_per_s"],
+                results["throughput"]["components"][TOKENIZER_NAME][
+                    "docs_per_s"])
+    results["tagging"] = measure_tagging(cat, texts)
+    logger.info("Tagging: %.1fx faster with the memo",
+                results["tagging"]["speedup"])
+    results["mp_scaling"] = measure_mp_scaling(
+        cat, texts, args.processes, args.batch_size_chars)
+    if args.mp_memory:
+        from benchmarks.mp_memory import measure_workers
+        results["mp_memory"] = [
+            measure_workers(cat, n_process - 1, use_fork)
+            for n_process in args.processes if n_process > 1
+            for use_fork in (False, True)
+        ]
+    results["peak_rss"] = get_peak_rss()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--concepts", type=int, default=10_000,
+                        help="The number of synthetic concepts")
+    parser.add_argument("--names-per-concept", type=int, default=3,
+                        help="The maximum number of names per concept")
+    parser.add_argument("--ambiguity", type=float, default=0.1,
+                        help="The fraction of concepts sharing a name with "
+                        "another concept")
+    parser.add_argument("--train-docs", type=int, default=500,
+                        help="The number of documents to train the "
+                        "synthetic model on")
+    parser.add_argument("--docs", type=int, default=200,
+                        help="The number of synthetic documents to annotate")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="The random seed for the synthetic data")
+    parser.add_argument("--model-pack",
+                        help="Use this model pack instead of a synthetic one")
+    parser.add_argument("--corpus",
+                        help="The corpus (one document per line) to use "
+                        "along with --model-pack")
+    parser.add_argument("--batch-size", type=int, default=32,
+                        help="The batch size for `CAT.pipe`")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="The numbers of processes for multiprocessing")
+    parser.add_argument("--batch-size-chars", type=int, default=50_000,
+                        help="The characters per batch for multiprocessing")
+    parser.add_argument("--mp-memory", action="store_true",
+                        help="Also measure the memory use of the worker "
+                        "processes (Linux only)")
+    parser.add_argument("--output", help="The JSON file for the results")
+    args = parser.parse_args(argv)
+    if args.model_pack and not args.corpus:
+        parser.error("--corpus is required along with --model-pack")
+    results = run(args)
+    out = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out)
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig()
+    # NOTE: only the benchmarks' own progress since the pipeline logs a
+    #       line for every component run at the INFO level
+    for logger_name in (__name__, "benchmarks"):
+        logging.getLogger(logger_name).setLevel(logging.INFO)
+    main()
@@ -0,0 +1,212 @@
+"""Generators for synthetic models and corpora for benchmarking.
+
+The generated concept names, vocabulary and texts are made up of
+pseudo-words built from syllables. So they have no relation to real
+clinical terms, but the sizes (number of concepts, names per concept,
+shared names, document lengths) can be controlled and the results are
+reproducible for a given seed.
+"""
+import itertools
+import random
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from medcat.cat import CAT
+from medcat.cdb import CDB
+from medcat.config import Config
+from medcat.model_creation.cdb_maker import CDBMaker
+from medcat.vocab import Vocab
+
+
+_SYLLABLES = [
+    "ab", "ac", "al", "an", "ar", "ba", "be", "bi", "bo", "ca", "ce", "ci",
+    "co", "da", "de", "di", "do", "el", "en", "er", "fa", "fe", "fi", "ga",
+    "ge", "gi", "go", "ha", "he", "hi", "id", "il", "in", "ir", "ka", "ke",
+    "la", "le", "li", "lo", "lu", "ma", "me", "mi", "mo", "mu", "na", "ne",
+    "ni", "no", "nu", "ol", "om", "on", "or", "os", "pa", "pe", "pi", "po",
+    "ra", "re", "ri", "ro", "ru", "sa", "se", "si", "so", "ta", "te", "ti",
+    "to", "tu", "ul", "um", "ur", "us", "va", "ve", "vi", "xa", "za", "zo",
+]
+
+_FILLER_WORDS = [
+    "the", "patient", "was", "with", "and", "of", "a", "history", "no",
+    "signs", "for", "on", "in", "is", "has", "had", "been", "left", "right",
+    "mild", "severe", "acute", "chronic", "daily", "mg", "noted", "today",
+    "reports", "denies", "since", "last", "week", "year", "treated",
+]
+
+_TEMPLATES = [
+    "The patient presented with {} and a history of {}.",
+    "No signs of {} were found upon examination.",
+    "Patient reports {} since last week, treated for {}.",
+    "History of {}, {} and {}.",
+    "Severe {} noted on the left, mild {} on the right.",
+    "Denies {}. Started on {} 5 mg daily.",
+    "Was seen today for {}.",
+    "Chronic {} has been stable this year.",
+]
+
+
+def _generate_words(rng: random.Random, num: int, min_syl: int = 2,
+                    max_syl: int = 4) -> list[str]:
+    words: set[str] = set()
+    reserved = set(_FILLER_WORDS)
+    while len(words) < num:
+        word = "".join(rng.choice(_SYLLABLES)
+                       for _ in range(rng.randint(min_syl, max_syl)))
+        if word not in reserved:
+            words.add(word)
+    # NOTE: sorted for reproducibility (set order depends on hash seed)
+    words_list = sorted(words)
+    rng.shuffle(words_list)
+    return words_list
+
+
+class SyntheticModelGenerator:
+    """Generates a synthetic CDB, Vocab and corpus.
+
+    Args:
+        n_concepts (int): The number of concepts.
+        names_per_concept (int): The maximum number of names per concept.
+            Each concept gets between 1 and this many names. Defaults to 3.
+        ambiguity (float): The fraction of concepts that get an extra name
+            shared with another concept. Defaults to 0.1.
+        n_words (Optional[int]): The number of (pseudo-)words the concept
+            names are made of. Defaults to a number that scales with the
+            number of concepts.
+        vec_size (int): The size of the word vectors. Defaults to 300.
+        seed (int): The random seed. Defaults to 42.
+    """
+
+    def __init__(self, n_concepts: int, names_per_concept: int = 3,
+                 ambiguity: float = 0.1, n_words: Optional[int] = None,
+                 vec_size: int = 300, seed: int = 42):
+        if not 0 <= ambiguity <= 1:
+            raise ValueError(f"Ambiguity needs to be in [0, 1]: {ambiguity}")
+        self.n_concepts = n_concepts
+        self.names_per_concept = names_per_concept
+        self.ambiguity = ambiguity
+        self.vec_size = vec_size
+        self.seed = seed
+        self._rng = random.Random(seed)
+        if n_words is None:
+            n_words = max(1000, int(20 * n_concepts ** 0.75))
+        self.words = _generate_words(self._rng, n_words)
+        self.concept_names = self._generate_concept_names()
+
+    def _generate_name(self) -> str:
+        n_tokens = self._rng.choices((1, 2, 3, 4), weights=(4, 3, 2, 1))[0]
+        return " ".join(self._rng.choice(self.words)
+                        for _ in range(n_tokens))
+
+    def _generate_concept_names(self) -> dict[str, list[str]]:
+        concept_names: dict[str, list[str]] = {}
+        for num in range(self.n_concepts):
+            n_names = self._rng.randint(1, self.names_per_concept)
+            concept_names[f"C{num:07d}"] = [
+                self._generate_name() for _ in range(n_names)]
+        cuis = list(concept_names)
+        for cui in self._rng.sample(
+                cuis, int(self.ambiguity * self.n_concepts)):
+            other_cui = self._rng.choice(cuis)
+            if other_cui != cui:
+                concept_names[cui].append(
+                    self._rng.choice(concept_names[other_cui]))
+        return concept_names
+
+    def generate_cdb(self, config: Optional[Config] = None) -> CDB:
+        """Generate the CDB.
+
+        Args:
+            config (Optional[Config]): The config to use. Defaults to None.
+
+        Returns:
+            CDB: The generated CDB.
+        """
+        config = config or Config()
+        sep = config.cdb_maker.multi_separator
+        df = pd.DataFrame({
+            "cui": list(self.concept_names),
+            "name": [sep.join(names) for names in self.concept_names.values()],
+        })
+        return CDBMaker(config).prepare_csvs([df])
+
+    def generate_vocab(self) -> Vocab:
+        """Generate the vocab.
+
+        All the words used in concept names and texts get a (random)
+        vector and a Zipf distributed count.
+
+        Returns:
+            Vocab: The generated vocab.
+        """
+        np_rng = np.random.default_rng(self.seed)
+        vocab = Vocab()
+        all_words = _FILLER_WORDS + self.words
+        vecs = np_rng.standard_normal(
+            (len(all_words), self.vec_size)).astype(np.float32)
+        for rank, (word, vec) in enumerate(zip(all_words, vecs), start=1):
+            vocab.add_word(word, cnt=max(1, 10_000_000 // rank), vec=vec)
+        vocab.init_cumsums()
+        return vocab
+
+    def generate_model(self, config: Optional[Config] = None,
+                       n_train_docs: int = 500) -> CAT:
+        """Generate the model.
+
+        The model is trained (unsupervised) on a synthetic corpus so that
+        (some of) the concepts have context vectors.
+
+        Args:
+            config (Optional[Config]): The config to use. Defaults to None.
+            n_train_docs (int): The number of documents to train on.
+                Defaults to 500.
+
+        Returns:
+            CAT: The generated model.
+        """
+        cat = CAT(self.generate_cdb(config), self.generate_vocab())
+        if n_train_docs:
+            cat.trainer.train_unsupervised(
+                self.generate_corpus(n_train_docs, seed=self.seed + 1),
+                progress_print=n_train_docs + 1)
+        cat.config.components.linking.train = False
+        return cat
+
+    def generate_corpus(self, n_docs: int, min_sents: int = 5,
+                        max_sents: int = 30,
+                        seed: Optional[int] = None) -> list[str]:
+        """Generate a corpus of clinical-like texts from templates.
+
+        The concepts mentioned follow a Zipf-like distribution so that
+        some concepts are common while most are rare.
+
+        Args:
+            n_docs (int): The number of documents.
+            min_sents (int): The minimum number of sentences per document.
+                Defaults to 5.
+            max_sents (int): The maximum number of sentences per document.
+                Defaults to 30.
+            seed (Optional[int]): The random seed. Defaults to the seed of
+                the generator.
+
+        Returns:
+            list[str]: The documents.
+        """
+        rng = random.Random(self.seed if seed is None else seed)
+        all_names = list(self.concept_names.values())
+        cum_weights = list(itertools.accumulate(
+            1 / rank for rank in range(1, len(all_names) + 1)))
+        docs = []
+        for _ in range(n_docs):
+            sents = []
+            for _ in range(rng.randint(min_sents, max_sents)):
+                template = rng.choice(_TEMPLATES)
+                names = rng.choices(all_names, cum_weights=cum_weights,
+                                    k=template.count("{}"))
+                sents.append(template.format(
+                    *[rng.choice(cui_names) for cui_names in names]))
+            docs.append(" ".join(sents))
+        return docs
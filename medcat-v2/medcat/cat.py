@@ -1,27 +1,35 @@
 from typing import Optional, Union, Any, overload, Literal, Iterable, Iterator
-from typing import cast, Type, TypeVar
+from typing import cast, Type, TypeVar, TYPE_CHECKING
 import os
 import json
 from datetime import date
-from concurrent.futures import ProcessPoolExecutor, as_completed, Future
+from concurrent.futures import Future
+from concurrent.futures import wait, FIRST_COMPLETED
 import itertools
 from contextlib import contextmanager
+import pickle
+import gc
+import sys
 
 import shutil
 import logging
 
+import numpy as np
+
 from medcat.utils.defaults import DEFAULT_PACK_NAME, COMPONENTS_FOLDER
-from medcat.cdb import CDB
+from medcat.cdb import CDB, FrozenCDB
 from medcat.vocab import Vocab
 from medcat.config.config import Config, get_important_config_parameters
 from medcat.trainer import Trainer
 from medcat.storage.serialisers import serialise, AvailableSerialisers
 from medcat.storage.serialisers import deserialise
 from medcat.storage.serialisables import AbstractSerialisable
-from medcat.storage.mp_ents_save import BatchAnnotationSaver
+from medcat.storage.mp_ents_save import BatchAnnotationSaver, AvailableSinks
+from medcat.storage.zip_utils import unpack_to_cache
 from medcat.utils.fileutils import ensure_folder_if_parent
 from medcat.utils.hasher import Hasher
 from medcat.pipeline.pipeline import Pipeline
+from medcat.pipeline.profiling import PipelineProfile
 from medcat.tokenizing.tokens import MutableDocument, MutableEntity
 from medcat.tokenizing.tokenizers import SaveableTokenizer, TOKENIZER_PREFIX
 from medcat.data.entities import Entity, Entities, OnlyCUIEntities
@@ -32,9 +40,15 @@ from medcat.utils.legacy.identifier import is_legacy_model_pack
 from medcat.utils.defaults import avoid_legacy_conversion
 from medcat.utils.defaults import doing_legacy_conversion_message
 from medcat.utils.defaults import LegacyConversionDisabledError
+from medcat.utils.defaults import get_unpack_cache_dir
 from medcat.utils.usage_monitoring import UsageMonitor, _NoDelUM
 from medcat.utils.import_utils import MissingDependenciesError
 
+if TYPE_CHECKING:
+    # NOTE: (along with multiprocessing) these are only imported upon use
+    #       to keep `import medcat` fast
+    from concurrent.futures import ProcessPoolExecutor
+
 
 logger = logging.getLogger(__name__)
 
@@ -54,19 +68,27 @@ class CAT(AbstractSerialisable):
                  model_load_path: Optional[str] = None,
                  config_dict: Optional[dict] = None,
                  addon_config_dict: Optional[dict[str, dict]] = None,
+                 freeze_cdb: bool = False,
+                 context_vector_dtype: Union[str, Type, None] = None,
                  ) -> None:
-        self.cdb = cdb
         self.vocab = vocab
         # ensure  config
-        if config is None and self.cdb.config is None:
+        if config is None and cdb.config is None:
             raise ValueError("Need to specify a config for either CDB or CAT")
         elif config is None:
             config = cdb.config
         elif config is not None:
-            self.cdb.config = config
+            cdb.config = config
         self.config = config
         if config_dict:
             self.config.merge_config(config_dict)
+        # NOTE: freezing after the config is merged so that the frozen CDB
+        #       uses the final config
+        if context_vector_dtype is not None:
+            cdb = FrozenCDB.from_cdb(cdb, context_vector_dtype)
+        elif freeze_cdb and not isinstance(cdb, FrozenCDB):
+            cdb = FrozenCDB.from_cdb(cdb)
+        self.cdb = cdb
 
         self._trainer: Optional[Trainer] = None
         self._pipeline = self._recreate_pipe(model_load_path, addon_config_dict)
@@ -104,6 +126,97 @@ class CAT(AbstractSerialisable):
             self.usage_monitor.log_inference(len(text), len(doc.linked_ents))
         return doc
 
+    def pipe(self, texts: Iterable[str], batch_size: int = 32
+             ) -> Iterator[MutableDocument]:
+        """Get the documents for a number of texts.
+
+        Each batch of texts goes through the tokenizer and each component
+        together. So components that are able to process a batch of
+        documents at once (e.g MetaCAT, TransformersNER) can do so.
+
+        Args:
+            texts (Iterable[str]): The input texts.
+            batch_size (int): The number of texts in a batch.
+                Defaults to 32.
+
+        Yields:
+            Iterator[MutableDocument]: The resulting documents (in order).
+        """
+        for doc in self._pipeline.pipe(texts, batch_size):
+            if self.usage_monitor.should_monitor:
+                self.usage_monitor.log_inference(
+                    len(doc.base.text), len(doc.linked_ents))
+            yield doc
+
+    def enable_pipeline_profiling(self, reset: bool = True
+                                  ) -> PipelineProfile:
+        """Enable profiling of the pipeline components.
+
+        While enabled, the (cumulative) wall clock and CPU time, the number
+        of calls, and the number of documents, tokens and entities are
+        recorded for the tokenizer and each component. When annotating with
+        `get_entities_multi_texts` over multiple processes, the profiles
+        of the workers are merged into this one.
+
+        Args:
+            reset (bool): Whether to start with a new profile rather than
+                carry on with the existing one (if any). Defaults to True.
+
+        Returns:
+            PipelineProfile: The profile that will be recorded into.
+        """
+        return self._pipeline.enable_profiling(reset)
+
+    def disable_pipeline_profiling(self) -> Optional[PipelineProfile]:
+        """Disable profiling of the pipeline components.
+
+        Returns:
+            Optional[PipelineProfile]: The profile recorded (if any).
+        """
+        return self._pipeline.disable_profiling()
+
+    def get_pipeline_profile(self) -> Optional[PipelineProfile]:
+        """Get the current pipeline profile.
+
+        Returns:
+            Optional[PipelineProfile]: The profile, or None if profiling
+                is not enabled.
+        """
+        return self._pipeline.profile
+
+    def get_component_load_times(self) -> dict[str, float]:
+        """Get the time it took to load each pipeline component.
+
+        This includes the tokenizer and the addons. When the components
+        are loaded concurrently (see
+        `config.general.component_load_workers`), the times overlap.
+
+        Returns:
+            dict[str, float]: The wall clock time (in seconds) per
+                component name.
+        """
+        return dict(self._pipeline.load_times)
+
+    @contextmanager
+    def profile_pipeline(self) -> Iterator[PipelineProfile]:
+        """Profile the pipeline components within a context.
+
+        For example:
+
+            with cat.profile_pipeline() as profile:
+                for text in texts:
+                    cat.get_entities(text)
+            print(profile)
+
+        Yields:
+            Iterator[PipelineProfile]: The (new) profile recorded into.
+        """
+        profile = self._pipeline.enable_profiling()
+        try:
+            yield profile
+        finally:
+            self._pipeline.disable_profiling()
+
     def _ensure_not_training(self) -> None:
         """Method to ensure config is not set to train.
 
@@ -166,10 +279,7 @@ class CAT(AbstractSerialisable):
             return {}
         return self._doc_to_out(doc, only_cui=only_cui)
 
-    def _mp_worker_func(
-            self,
-            texts_and_indices: list[tuple[str, str, bool]]
-            ) -> list[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
+    def _init_addon_data_paths(self) -> None:
         # NOTE: this is needed for subprocess as otherwise they wouldn't have
         #       any of these set
         # NOTE: these need to by dynamic in case the extra's aren't included
@@ -189,9 +299,35 @@ class CAT(AbstractSerialisable):
                 addon._init_data_paths(self._pipeline.tokenizer)
             elif has_rel_cat and isinstance(addon, RelCATAddon):
                 addon._rel_cat._init_data_paths()
+
+    def _process_batch(
+            self,
+            texts_and_indices: list[tuple[str, str, bool]]
+            ) -> list[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
+        self._ensure_not_training()
+        docs = self.pipe((text for text, _, _ in texts_and_indices),
+                         batch_size=max(len(texts_and_indices), 1))
         return [
-            (text_index, self.get_entities(text, only_cui=only_cui))
-            for text, text_index, only_cui in texts_and_indices]
+            (text_index, self._doc_to_out(doc, only_cui=only_cui)
+             if doc else {})
+            for doc, (_, text_index, only_cui) in zip(docs, texts_and_indices)]
+
+    def _skip_annotated(
+            self,
+            text_iter: Union[Iterator[str], Iterator[tuple[str, str]]],
+            annotated_ids: set[str],
+            ) -> Iterator[tuple[str, str]]:
+        # NOTE: the indices need to be attached before skipping anything
+        #       so that raw texts keep the indices they'd otherwise get
+        num_skipped = 0
+        for i, _doc in enumerate(text_iter):
+            doc_index, doc = (
+                _doc if isinstance(_doc, tuple) else (str(i), _doc))
+            if doc_index in annotated_ids:
+                num_skipped += 1
+                continue
+            yield doc_index, doc
+        logger.info("Skipped %d previously annotated texts", num_skipped)
 
     def _generate_batches_by_char_length(
             self,
@@ -262,57 +398,6 @@ class CAT(AbstractSerialisable):
             ]
             text_index += len(batch)
 
-    def _mp_one_batch_per_process(
-            self,
-            executor: ProcessPoolExecutor,
-            batch_iter: Iterator[list[tuple[str, str, bool]]],
-            external_processes: int,
-            saver: Optional[BatchAnnotationSaver],
-            ) -> Iterator[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
-        futures: list[Future] = []
-        # submit batches, one for each external processes
-        for _ in range(external_processes):
-            try:
-                batch = next(batch_iter)
-                futures.append(
-                    executor.submit(self._mp_worker_func, batch))
-            except StopIteration:
-                break
-        if not futures:
-            # NOTE: if there wasn't any data, we didn't process anything
-            raise OutOfDataException()
-        # Main process works on next batch while workers are busy
-        main_batch: Optional[list[tuple[str, str, bool]]]
-        try:
-            main_batch = next(batch_iter)
-            main_results = self._mp_worker_func(main_batch)
-            if saver:
-                saver(main_results)
-            # Yield main process results immediately
-            yield from main_results
-
-        except StopIteration:
-            main_batch = None
-        # since the main process did around the same amount of work
-        # we would expect all subprocess to have finished by now
-        # so we're going to wait for them to finish, yield their results,
-        # and subsequently submit the next batch to keep them busy
-        for _ in range(external_processes):
-            if not futures:
-                # NOTE: if there's no futures then there can't be
-                #       anything to batch
-                break
-            # Wait for any future to complete
-            done_future = next(as_completed(futures))
-            futures.remove(done_future)
-
-            cur_results = done_future.result()
-            if saver:
-                saver(cur_results)
-
-            # Yield all results from this batch
-            yield from cur_results
-
     def get_entities_multi_texts(
             self,
             texts: Union[Iterable[str], Iterable[tuple[str, str]]],
@@ -322,12 +407,19 @@ class CAT(AbstractSerialisable):
             batch_size_chars: int = 1_000_000,
             save_dir_path: Optional[str] = None,
             batches_per_save: int = 20,
+            worker_pool: Optional['MPWorkerPool'] = None,
+            batches_per_worker: int = 2,
+            ordered: bool = False,
+            resume: bool = False,
+            save_format: Union[str, AvailableSinks] = AvailableSinks.pickle,
+            background_saving: bool = False,
             ) -> Iterator[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
         """Get entities from multiple texts (potentially in parallel).
 
         If `n_process` > 1, `n_process - 1` new processes will be created
         and data will be processed on those as well as the main process in
-        parallel.
+        parallel. Each worker process is given a new batch as soon as it
+        finishes one, so a single long batch does not hold up the others.
 
         Args:
             texts (Union[Iterable[str], Iterable[tuple[str, str]]]):
@@ -350,44 +442,98 @@ class CAT(AbstractSerialisable):
                 to 1,000,000 characters. Set to -1 to disable.
             save_dir_path (Optional[str]):
                 The path to where (if specified) the results are saved.
-                The directory will have a `annotated_ids.pickle` file
-                containing the tuple[list[str], int] with a list of
-                indices already saved and then umber of parts already saved.
-                In addition there will be (usually multuple) files in the
-                `part_<num>.pickle` format with the partial outputs.
+                With the default (`pickle`) format, the directory will have
+                a `annotated_ids.pickle` file (written once done) containing
+                the tuple[list[str], int] with a list of indices already
+                saved and then umber of parts already saved. The indices are
+                also appended to `annotated_ids.jsonl` as the parts are
+                saved. In addition there
+                will be (usually multuple) files in the `part_<num>.pickle`
+                format with the partial outputs. See `save_format` for the
+                other options.
             batches_per_save (int):
                 The number of patches to save (if `save_dir_path` is specified)
                 at once. Defaults to 20.
+            worker_pool (Optional[MPWorkerPool]):
+                A (persistent) worker pool created with `create_worker_pool`.
+                If specified, its workers are used instead of creating new
+                processes and `n_process` is ignored. This allows the same
+                worker processes (and the models loaded within them) to be
+                reused across multiple calls. Defaults to None.
+            batches_per_worker (int):
+                The maximum number of batches queued up for each worker
+                process at a time (when multiprocessing). Having more than
+                one means a worker can start on its next batch right away.
+                Defaults to 2.
+            ordered (bool):
+                Whether to yield the results in the same order as the
+                input texts (when multiprocessing). If False, results are
+                yielded as soon as a batch is done. Ordered results may
+                leave workers idle while waiting for a slow batch to finish.
+                Defaults to False.
+            resume (bool):
+                Whether to resume a previous (interrupted) run that saved
+                its results to `save_dir_path`. Texts whose indices have
+                already been saved are skipped (before any processing) and
+                new parts are numbered after the existing ones. Requires
+                `save_dir_path` to be specified. Defaults to False.
+            save_format (Union[str, AvailableSinks]):
+                The format to save the results in (if `save_dir_path` is
+                specified). The `jsonl` and `parquet` formats only append
+                to what's on disk which is preferred for large corpora.
+                Defaults to `pickle`.
+            background_saving (bool):
+                Whether to save the results on a background thread so that
+                annotation doesn't need to wait for the writes. Defaults
+                to False.
 
         Yields:
             Iterator[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
                 The results in the format of (text_index, entities).
         """
+        if batches_per_worker < 1:
+            raise ValueError(
+                "Need at least 1 batch per worker, got "
+                f"{batches_per_worker}")
+        if resume and not save_dir_path:
+            raise ValueError(
+                "Need to specify `save_dir_path` in order to resume")
         text_iter = cast(
             Union[Iterator[str], Iterator[tuple[str, str]]], iter(texts))
-        batch_iter = self._generate_batches(
-            text_iter, batch_size, batch_size_chars, only_cui)
         if save_dir_path:
-            saver = BatchAnnotationSaver(save_dir_path, batches_per_save)
+            saver = BatchAnnotationSaver(
+                save_dir_path, batches_per_save, sink=save_format,
+                background=background_saving)
         else:
             saver = None
-        if n_process == 1:
-            # just do in series
-            for batch in batch_iter:
-                batch_results = self._mp_worker_func(batch)
-                if saver is not None:
-                    saver(batch_results)
-                yield from batch_results
+        if resume and saver is not None:
+            text_iter = self._skip_annotated(
+                text_iter, saver.get_annotated_ids())
+        batch_iter = self._generate_batches(
+            text_iter, batch_size, batch_size_chars, only_cui)
+        self._init_addon_data_paths()
+        if worker_pool is not None:
+            n_process = worker_pool.n_workers + 1
+        try:
+            if n_process == 1:
+                # just do in series
+                for batch in batch_iter:
+                    batch_results = self._process_batch(batch)
+                    if saver is not None:
+                        saver(batch_results)
+                    yield from batch_results
+                return
+
+            with self._no_usage_monitor_exit_flushing():
+                yield from self._multiprocess(
+                    n_process, batch_iter, saver, worker_pool,
+                    batches_per_worker=batches_per_worker, ordered=ordered)
+        finally:
+            # NOTE: also upon failure or if the generator is abandoned
+            #       so that the buffered results are saved as well
             if saver:
                 # save remainder
-                saver._save_cache()
-            return
-
-        with self._no_usage_monitor_exit_flushing():
-            yield from self._multiprocess(n_process, batch_iter, saver)
-        if saver:
-            # save remainder
-            saver._save_cache()
+                saver.close()
 
     @contextmanager
     def _no_usage_monitor_exit_flushing(self):
@@ -404,26 +550,147 @@ class CAT(AbstractSerialisable):
         finally:
             self.usage_monitor.__class__ = original_cls
 
+    def create_worker_pool(self, n_workers: int,
+                           model_pack_path: Optional[str] = None,
+                           use_fork: bool = False,
+                           ) -> 'MPWorkerPool':
+        """Create a persistent pool of worker processes.
+
+        Each worker receives (or loads) the model once upon start up.
+        After that, only the batches of texts and their results are
+        passed between the processes. The pool can then be passed to
+        (multiple calls of) `get_entities_multi_texts`.
+
+        NOTE: The workers hold a copy of the model as it was when the pool
+              was created. Any changes (e.g training) made to the model
+              afterwards will not be reflected within the workers.
+
+        The pool should be shut down once it's no longer needed. The
+        easiest way to do that is to use it as a context manager:
+
+            with cat.create_worker_pool(4) as pool:
+                for texts in text_chunks:
+                    for text_index, ents in cat.get_entities_multi_texts(
+                            texts, worker_pool=pool):
+                        ...
+
+        Args:
+            n_workers (int): The number of worker processes. The main
+                process will do some of the work as well.
+            model_pack_path (Optional[str]): If specified, each worker
+                loads the model from this model pack instead of being sent
+                a copy of the in-memory model. Defaults to None.
+            use_fork (bool): Whether to fork the workers off of the main
+                process (where available, i.e Linux) so that they share the
+                memory of the already loaded model (copy-on-write) rather
+                than each having a copy of their own. See `MPWorkerPool`
+                for details. Defaults to False.
+
+        Returns:
+            MPWorkerPool: The worker pool.
+        """
+        return MPWorkerPool(self, n_workers, model_pack_path,
+                            use_fork=use_fork)
+
     def _multiprocess(
             self, n_process: int,
             batch_iter: Iterator[list[tuple[str, str, bool]]],
             saver: Optional[BatchAnnotationSaver],
+            worker_pool: Optional['MPWorkerPool'] = None,
+            batches_per_worker: int = 2,
+            ordered: bool = False,
             ) -> Iterator[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
-        external_processes = n_process - 1
-        if self.FORCE_SPAWN_MP:
-            import multiprocessing as mp
-            logger.info(
-                "Forcing multiprocessing start method to 'spawn' "
-                "due to known compatibility issues with 'fork' and "
-                "libraries using threads or native extensions.")
-            mp.set_start_method("spawn", force=True)
-        with ProcessPoolExecutor(max_workers=external_processes) as executor:
-            while True:
-                try:
-                    yield from self._mp_one_batch_per_process(
-                        executor, batch_iter, external_processes, saver=saver)
-                except OutOfDataException:
+        if worker_pool is not None:
+            if worker_pool.cat is not self:
+                raise ValueError(
+                    "The worker pool was created for a different model")
+            yield from self._multiprocess_in_pool(
+                worker_pool, batch_iter, saver, batches_per_worker, ordered)
+            return
+        with self.create_worker_pool(n_process - 1) as pool:
+            yield from self._multiprocess_in_pool(
+                pool, batch_iter, saver, batches_per_worker, ordered)
+
+    def _multiprocess_in_pool(
+            self, worker_pool: 'MPWorkerPool',
+            batch_iter: Iterator[list[tuple[str, str, bool]]],
+            saver: Optional[BatchAnnotationSaver],
+            batches_per_worker: int,
+            ordered: bool,
+            ) -> Iterator[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
+        # NOTE: Each worker is kept busy with (up to) `batches_per_worker`
+        #       batches and gets a new one as soon as it finishes one.
+        #       So a long batch only holds up the worker processing it
+        #       rather than every process as it would with lock-step rounds.
+        executor = worker_pool.executor
+        # NOTE: if profiling, the workers send back their profiles along
+        #       with the results
+        profile = self._pipeline.profile
+        worker_func = (_mp_worker_process_batch if profile is None
+                       else _mp_worker_process_batch_profiled)
+        max_in_flight = worker_pool.n_workers * batches_per_worker
+        # NOTE: the total number of batches that have been taken from the
+        #       iterator but not yet yielded (incl. the main process' batch)
+        #       is bounded so that (in ordered mode) a slow batch cannot
+        #       cause the finished ones to pile up in memory
+        max_pending = max_in_flight + 1
+        in_flight: dict[Future, int] = {}
+        finished: dict[
+            int, list[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]
+        ] = {}
+        next_batch_num = 0
+        next_to_yield = 0
+        out_of_data = False
+        while True:
+            # top up the workers
+            while (not out_of_data and len(in_flight) < max_in_flight and
+                   len(in_flight) + len(finished) < max_pending):
+                batch = next(batch_iter, None)
+                if batch is None:
+                    out_of_data = True
                     break
+                future = executor.submit(worker_func, batch)
+                in_flight[future] = next_batch_num
+                next_batch_num += 1
+            # the workers have their next batch(es) queued up, so the main
+            # process can work on a batch without starving them
+            main_did_work = False
+            if (not out_of_data and
+                    len(in_flight) + len(finished) < max_pending):
+                batch = next(batch_iter, None)
+                if batch is None:
+                    out_of_data = True
+                else:
+                    finished[next_batch_num] = self._process_batch(batch)
+                    next_batch_num += 1
+                    main_did_work = True
+            if in_flight:
+                # NOTE: if the main process did some work, we just collect
+                #       what's been done in the meantime, otherwise we wait
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED,
+                               timeout=0 if main_did_work else None)
+                for future in done:
+                    # NOTE: the profiled workers return a tuple of the
+                    #       results and their profile
+                    worker_out: Any = future.result()
+                    if profile is not None:
+                        worker_out, worker_profile = worker_out
+                        profile.merge(worker_profile)
+                    finished[in_flight.pop(future)] = worker_out
+            if ordered:
+                to_yield = []
+                while next_to_yield in finished:
+                    to_yield.append(next_to_yield)
+                    next_to_yield += 1
+            else:
+                to_yield = list(finished)
+            for batch_num in to_yield:
+                batch_results = finished.pop(batch_num)
+                if saver:
+                    saver(batch_results)
+                yield from batch_results
+            if out_of_data and not in_flight and not finished:
+                break
 
     def _get_entity(self, ent: MutableEntity,
                     doc_tokens: list[str],
@@ -554,6 +821,26 @@ class CAT(AbstractSerialisable):
             self._trainer = Trainer(self.cdb, self.__call__, self._pipeline)
         return self._trainer
 
+    def compact_for_inference(self, dtype: Type = np.float32) -> None:
+        """Compact the model for inference (in place).
+
+        This removes the parts of the CDB and vocab that are not used for
+        inference (e.g the concept descriptions) and downcasts the vectors.
+        So the model pack is smaller (once saved) and takes up less memory.
+        See `medcat.utils.compaction` for details.
+
+        Args:
+            dtype (Type): The data type of the vectors.
+                Defaults to np.float32.
+
+        Raises:
+            ValueError: If the CDB is frozen.
+        """
+        from medcat.utils.compaction import compact_cdb, compact_vocab
+        compact_cdb(self.cdb, dtype)
+        if self.vocab is not None:
+            compact_vocab(self.vocab, dtype)
+
     def save_model_pack(
             self, target_folder: str, pack_name: str = DEFAULT_PACK_NAME,
             serialiser_type: Union[str, AvailableSerialisers] = 'dill',
@@ -650,17 +937,31 @@ class CAT(AbstractSerialisable):
         return hex_hash
 
     @classmethod
-    def attempt_unpack(cls, zip_path: str) -> str:
+    def attempt_unpack(cls, zip_path: str,
+                       unpack_cache_dir: Optional[str] = None) -> str:
         """Attempt unpack the zip to a folder and get the model pack path.
 
         If the folder already exists, no unpacking is done.
 
+        If an unpack cache folder is specified (or set through the
+        `MEDCAT_UNPACK_CACHE_DIR` environmental variable), the zip is
+        instead unpacked into a sub folder of it named after the hash
+        of the zip contents. This way the same model pack only gets
+        unpacked once per host, even when loaded by multiple processes
+        at the same time.
+
         Args:
             zip_path (str): The ZIP path
+            unpack_cache_dir (Optional[str]): The folder to cache the
+                unpacked model packs in. Defaults to None.
 
         Returns:
             str: The model pack path
         """
+        if unpack_cache_dir is None:
+            unpack_cache_dir = get_unpack_cache_dir()
+        if unpack_cache_dir is not None:
+            return unpack_to_cache(zip_path, unpack_cache_dir)
         base_dir = os.path.dirname(zip_path)
         filename = os.path.basename(zip_path)
 
@@ -679,7 +980,10 @@ class CAT(AbstractSerialisable):
     @classmethod
     def load_model_pack(cls, model_pack_path: str,
                         config_dict: Optional[dict] = None,
-                        addon_config_dict: Optional[dict[str, dict]] = None
+                        addon_config_dict: Optional[dict[str, dict]] = None,
+                        freeze_cdb: bool = False,
+                        unpack_cache_dir: Optional[str] = None,
+                        context_vector_dtype: Union[str, Type, None] = None,
                         ) -> 'CAT':
         """Load the model pack from file.
 
@@ -692,6 +996,20 @@ class CAT(AbstractSerialisable):
                 If specified, it needs to have an addon dict per name.
                 For instance, `{"meta_cat.Subject": {}}` would apply
                 to the specific MetaCAT.
+            freeze_cdb (bool): Whether to convert the CDB to the compact,
+                read only `FrozenCDB` before initialising the pipe. This
+                reduces the memory use for inference, but the model can
+                not be trained. If the model pack was saved with a frozen
+                CDB, it is loaded as such regardless. Defaults to False.
+            unpack_cache_dir (Optional[str]): The folder to cache unpacked
+                model packs in (see `attempt_unpack`). Defaults to None.
+            context_vector_dtype (Union[str, Type, None]): If specified,
+                the CDB is frozen with its context vectors kept in this
+                data type (e.g `float16`, or `int8` for quantised vectors).
+                This further reduces the memory use, but the similarities
+                (and thus some linking decisions) may change slightly. See
+                `medcat.utils.quantisation` for evaluating the effect.
+                Defaults to None.
 
         Raises:
             ValueError: If the saved data does not represent a model pack.
@@ -700,7 +1018,8 @@ class CAT(AbstractSerialisable):
             CAT: The loaded model pack.
         """
         if model_pack_path.endswith(".zip"):
-            model_pack_path = cls.attempt_unpack(model_pack_path)
+            model_pack_path = cls.attempt_unpack(model_pack_path,
+                                                 unpack_cache_dir)
         logger.info("Attempting to load model from file: %s",
                     model_pack_path)
         is_legacy = is_legacy_model_pack(model_pack_path)
@@ -726,7 +1045,9 @@ class CAT(AbstractSerialisable):
                             # ignore hidden files/folders
                             '.'},
                           config_dict=config_dict,
-                          addon_config_dict=addon_config_dict)
+                          addon_config_dict=addon_config_dict,
+                          freeze_cdb=freeze_cdb,
+                          context_vector_dtype=context_vector_dtype)
         # NOTE: deserialising of components that need serialised
         #       will be dealt with upon pipeline creation automatically
         if not isinstance(cat, CAT):
@@ -875,5 +1196,204 @@ class CAT(AbstractSerialisable):
         ]
 
 
-class OutOfDataException(ValueError):
-    pass
+class MPWorkerPool:
+    """A persistent pool of model-resident worker processes.
+
+    Each worker gets the model once (through the pool initialiser) and
+    keeps it in memory. Subsequently, only the batches of texts (and their
+    results) are passed between the main process and the workers.
+
+    By default, the workers are spawned and each gets its own copy of the
+    model. So the memory use grows with the number of workers. With
+    `use_fork`, the workers are instead forked off of the main process
+    and share the memory of the model with it for as long as it isn't
+    written to (copy-on-write). To keep it that way:
+    - The garbage collector is frozen while forking so that the
+      collections within the workers don't touch the model's objects.
+    - The torch intra-op threads and the (HF) tokenizers parallelism are
+      limited within the workers since their thread pools do not survive
+      a fork.
+    Reference counting will still cause some of the pages to be copied.
+
+    This should generally be created through `CAT.create_worker_pool`.
+
+    Args:
+        cat (CAT): The model to use.
+        n_workers (int): The number of worker processes.
+        model_pack_path (Optional[str]): If specified, the workers load the
+            model from this model pack rather than receiving a copy of the
+            in-memory one.
+        use_fork (bool): Whether to fork the workers so that they share the
+            in-memory model. Defaults to False.
+    """
+
+    def __init__(self, cat: CAT, n_workers: int,
+                 model_pack_path: Optional[str] = None,
+                 use_fork: bool = False) -> None:
+        if n_workers < 1:
+            raise ValueError(
+                f"Need at least 1 worker process, got {n_workers}")
+        self.cat = cat
+        self.n_workers = n_workers
+        if use_fork:
+            self.executor = self._create_forked_executor(
+                cat, n_workers, model_pack_path)
+            return
+        cat_bytes: Optional[bytes]
+        if model_pack_path is None:
+            # NOTE: serialising just once here rather than for every batch
+            with cat._no_usage_monitor_exit_flushing():
+                cat_bytes = pickle.dumps(cat)
+        else:
+            cat_bytes = None
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        mp_context = None
+        if cat.FORCE_SPAWN_MP:
+            logger.info(
+                "Forcing multiprocessing start method to 'spawn' "
+                "due to known compatibility issues with 'fork' and "
+                "libraries using threads or native extensions.")
+            mp_context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=mp_context,
+            initializer=_init_mp_worker,
+            initargs=(cat_bytes, model_pack_path))
+
+    @classmethod
+    def _create_forked_executor(cls, cat: CAT, n_workers: int,
+                                model_pack_path: Optional[str]
+                                ) -> 'ProcessPoolExecutor':
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        if model_pack_path is not None:
+            raise ValueError(
+                "Cannot use a model pack path when forking workers since "
+                "they use the already loaded model")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError(
+                "The 'fork' start method is not available on this platform")
+        logger.info("Forking %d worker processes to share the loaded model",
+                    n_workers)
+        # NOTE: the tokenizers library would otherwise disable its own
+        #       parallelism (with a warning) upon the fork
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        # NOTE: with fork, the model is not pickled, the workers simply
+        #       inherit the (module level) reference
+        executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_forked_mp_worker, initargs=(cat,))
+        # NOTE: anything that survives a collection here is moved to the
+        #       permanent generation so the workers' garbage collector
+        #       doesn't write to (and thus copy) the pages of the model
+        gc.collect()
+        gc.freeze()
+        try:
+            # NOTE: when forking, all the workers are started upon the
+            #       first submission
+            with cat._no_usage_monitor_exit_flushing():
+                executor.submit(_mp_worker_is_ready).result()
+        finally:
+            # NOTE: this does not affect the (already forked) workers
+            gc.unfreeze()
+        return executor
+
+    def get_worker_memory_usage(self) -> dict[int, dict[str, int]]:
+        """Get the memory usage of each worker process.
+
+        This is based on `/proc/<pid>/smaps_rollup` so it is only available
+        on Linux. The values (in bytes) include:
+        - `rss`: The resident set size (including shared pages).
+        - `pss`: The proportional set size (shared pages divided by the
+          number of processes sharing them).
+        - `uss`: The unique set size (pages private to the process).
+
+        Returns:
+            dict[int, dict[str, int]]: The memory usage for each worker PID.
+                Empty if not available.
+        """
+        # NOTE: the executor doesn't expose its processes publicly
+        pids = list(getattr(self.executor, "_processes", None) or {})
+        return {pid: usage for pid in pids
+                if (usage := _read_process_memory(pid))}
+
+    def shutdown(self) -> None:
+        """Shut down the worker processes."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'MPWorkerPool':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+
+def _read_process_memory(pid: int) -> dict[str, int]:
+    path = f"/proc/{pid}/smaps_rollup"
+    if not os.path.exists(path):
+        return {}
+    raw: dict[str, int] = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                raw[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "rss": raw.get("Rss", 0),
+        "pss": raw.get("Pss", 0),
+        "uss": raw.get("Private_Clean", 0) + raw.get("Private_Dirty", 0),
+    }
+
+
+# NOTE: the model held by each worker process
+_MP_WORKER_CAT: Optional[CAT] = None
+
+
+def _init_mp_worker(cat_bytes: Optional[bytes],
+                    model_pack_path: Optional[str]) -> None:
+    global _MP_WORKER_CAT
+    if cat_bytes is not None:
+        cat = pickle.loads(cat_bytes)
+    elif model_pack_path is not None:
+        cat = CAT.load_model_pack(model_pack_path)
+    else:
+        raise ValueError("Need either the model or the model pack path")
+    cat._init_addon_data_paths()
+    cat.disable_pipeline_profiling()
+    _MP_WORKER_CAT = cat
+
+
+def _init_forked_mp_worker(cat: CAT) -> None:
+    global _MP_WORKER_CAT
+    # NOTE: the thread pools of the main process don't survive the fork
+    #       so using them can deadlock. So limiting torch to the one thread
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(1)
+    cat._init_addon_data_paths()
+    cat.disable_pipeline_profiling()
+    _MP_WORKER_CAT = cat
+
+
+def _mp_worker_is_ready() -> bool:
+    return _MP_WORKER_CAT is not None
+
+
+def _mp_worker_process_batch(
+        texts_and_indices: list[tuple[str, str, bool]]
+        ) -> list[tuple[str, Union[dict, Entities, OnlyCUIEntities]]]:
+    if _MP_WORKER_CAT is None:
+        raise ValueError("The worker process has not been initialised")
+    return _MP_WORKER_CAT._process_batch(texts_and_indices)
+
+
+def _mp_worker_process_batch_profiled(
+        texts_and_indices: list[tuple[str, str, bool]]
+        ) -> tuple[list[tuple[str, Union[dict, Entities, OnlyCUIEntities]]],
+                   PipelineProfile]:
+    if _MP_WORKER_CAT is None:
+        raise ValueError("The worker process has not been initialised")
+    with _MP_WORKER_CAT.profile_pipeline() as profile:
+        results = _MP_WORKER_CAT._process_batch(texts_and_indices)
+    return results, profile
@@ -1,3 +1,4 @@
 from .cdb import CDB
+from .frozen import FrozenCDB
 
-__all__ = ["CDB", ]
+__all__ = ["CDB", "FrozenCDB"]
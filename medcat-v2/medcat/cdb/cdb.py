@@ -34,6 +34,11 @@ class CDB(AbstractSerialisable):
         self.token_counts: dict[str, int] = {}
         self.addl_info: dict[str, Any] = {}
         self._subnames: set[str] = set()
+        # NOTE: the number of concepts that have each subname
+        self._subname_counts: dict[str, int] = {}
+        # NOTE: bumped upon every change to the subnames so that anything
+        #       built from them (e.g a trie) can tell when it is stale
+        self._subnames_version = 0
         self.is_dirty = False
         self.has_changed_names = False
 
@@ -44,10 +49,35 @@ class CDB(AbstractSerialisable):
     def _reset_subnames(self):
         logger.info("Resetting subnames")
         self._subnames.clear()
+        self._subname_counts.clear()
+        self._subnames_version += 1
         for info in self.cui2info.values():
-            self._subnames.update(info['subnames'])
+            self._add_subnames(info['subnames'])
         self.has_changed_names = False
 
+    def _add_subnames(self, subnames: Iterable[str]) -> None:
+        # NOTE: the subnames should be new for the concept
+        self._subnames_version += 1
+        counts = self._subname_counts
+        for subname in subnames:
+            if subname in counts:
+                counts[subname] += 1
+            else:
+                counts[subname] = 1
+                self._subnames.add(subname)
+
+    def _remove_subnames(self, subnames: Iterable[str]) -> None:
+        # NOTE: the subnames should be those of a removed concept
+        self._subnames_version += 1
+        counts = self._subname_counts
+        for subname in subnames:
+            count = counts.get(subname, 0)
+            if count > 1:
+                counts[subname] = count - 1
+            else:
+                counts.pop(subname, None)
+                self._subnames.discard(subname)
+
     def has_subname(self, name: str) -> bool:
         """Whether the CDB has the specified subname.
 
@@ -57,10 +87,17 @@ class CDB(AbstractSerialisable):
         Returns:
             bool: Whether the subname is present in this CDB.
         """
-        if (self.has_changed_names or
+        self._ensure_subnames()
+        return name in self._subnames
+
+    def _ensure_subnames(self) -> None:
+        # NOTE: the subname index is kept up to date upon adding and
+        #       removing concepts / names. It only needs to be rebuilt if
+        #       it is out of sync, e.g for a CDB saved without the counts
+        #       or if the subnames were changed directly
+        if (len(self._subname_counts) != len(self._subnames) or
                 len(self._subnames) < len(self.name2info)):
             self._reset_subnames()
-        return name in self._subnames
 
     def get_name(self, cui: str) -> str:
         """Returns preferred name if it exists, otherwise it will return
@@ -149,10 +186,14 @@ class CDB(AbstractSerialisable):
         for name, in_name_info in names.items():
             # add name and synonyms
             cui_info['names'].add(name)
-            cui_info['subnames'].update(in_name_info.snames)
+            new_subnames = set(in_name_info.snames).difference(
+                cui_info['subnames'])
+            cui_info['subnames'].update(new_subnames)
+            self._add_subnames(new_subnames)
 
             if name not in self.name2info:
                 self.name2info[name] = get_new_name_info(name=name)
+                self.has_changed_names = True
             # Add whether concept is uppercase
             name_info = self.name2info[name]
             name_info['is_upper'] = in_name_info.is_upper
@@ -170,7 +211,6 @@ class CDB(AbstractSerialisable):
                     self.token_counts[token] += 1
                 else:
                     self.token_counts[token] = 1
-            self._subnames.update(cui_info['subnames'])
             self.is_dirty = True
 
     def _add_full_build(self, cui: str, names: dict[str, NameDescriptor],
@@ -287,7 +327,6 @@ class CDB(AbstractSerialisable):
             reset_cui_training(cui_info)
         for name_info in self.name2info.values():
             name_info['count_train'] = 0
-        self._subnames.clear()
         # clear config entries as well
         self.config.meta.unsup_trained.clear()
         self.config.meta.sup_trained.clear()
@@ -342,6 +381,10 @@ class CDB(AbstractSerialisable):
                 # NOTE: already warned above
                 continue
             new_cui2info[cui] = self.cui2info[cui]
+        # remove the subnames of the removed concepts
+        for cui, ci in self.cui2info.items():
+            if cui not in new_cui2info:
+                self._remove_subnames(ci['subnames'])
 
         for name in names_to_keep:
             # NOTE: should all be in name2info since got from cui2info
@@ -350,8 +393,6 @@ class CDB(AbstractSerialisable):
         # set filtered dicts
         self.cui2info = new_cui2info
         self.name2info = new_name2info
-        # redo all subnames
-        self._reset_subnames()
         self.is_dirty = True
 
     def remove_cui(self, cui: str) -> None:
@@ -375,8 +416,7 @@ class CDB(AbstractSerialisable):
             # if name name corresponds to no CUIs
             if not ni['per_cui_status']:
                 del self.name2info[name]
-        # need to reset subnames
-        self._reset_subnames()
+        self._remove_subnames(ci['subnames'])
         self.is_dirty = True
 
     def _remove_names(self, cui: str, names: Iterable[str]) -> None:
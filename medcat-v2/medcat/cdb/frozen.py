@@ -0,0 +1,456 @@
+from typing import Any, Callable, Iterator, Collection, Iterable, Optional
+from typing import Mapping, TypeVar, Type, Union, cast
+from types import MappingProxyType
+
+import numpy as np
+
+from medcat.cdb.cdb import CDB
+from medcat.cdb.concepts import CUIInfo, NameInfo
+from medcat.config import Config
+from medcat.preprocessors.cleaners import NameDescriptor
+from medcat.utils.matutils import quantise_int8, dequantise_int8
+from medcat.utils.caching import LRUCache
+from medcat.utils.defaults import StatusTypes as ST
+
+
+_READ_ONLY_MSG = ("The frozen CDB is read only. Use `FrozenCDB.to_cdb` "
+                  "to get a CDB that can be modified (e.g trained)")
+
+# the optional CUI info parts that are kept only for the CUIs that have them
+_CUI_EXTRA_KEYS = ('description', 'original_names', 'tags', 'group',
+                   'in_other_ontology')
+
+
+T = TypeVar("T")
+
+
+def _to_csr(groups: Iterable[Iterable[int]]) -> tuple[np.ndarray, np.ndarray]:
+    indptr = [0]
+    indices: list[int] = []
+    for group in groups:
+        indices.extend(group)
+        indptr.append(len(indices))
+    return (np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int32))
+
+
+def _intern(values: Iterable[str], value2id: dict[str, int],
+            all_values: list[str]) -> list[int]:
+    ids = []
+    for value in values:
+        if value not in value2id:
+            value2id[value] = len(all_values)
+            all_values.append(value)
+        ids.append(value2id[value])
+    return ids
+
+
+class _FrozenInfoMap(Mapping[str, T]):
+    """A read only (dict-like) view of the infos of all CUIs or names.
+
+    The info of each CUI or name is put together upon access as a read
+    only mapping. Its values are immutable as well (e.g frozensets rather
+    than sets), so the infos can be shared. The most recently used infos
+    are cached so that the frequent ones needn't be put together again.
+
+    Args:
+        key2ind (Callable[[], dict[str, int]]): Gets the key to index map.
+        getter (Callable[[int, str], Any]): Gets a value of the info.
+        keys (tuple[str, ...]): The keys of the info.
+        cache_size (int): The maximum number of infos to cache.
+    """
+
+    def __init__(self, key2ind: Callable[[], dict[str, int]],
+                 getter: Callable[[int, str], Any],
+                 keys: tuple[str, ...], cache_size: int) -> None:
+        self._key2ind = key2ind
+        self._getter = getter
+        self._keys = keys
+        self._infos: LRUCache[str, T] = LRUCache(cache_size)
+
+    def __getitem__(self, key: str) -> T:
+        info = self._infos.get(key)
+        if info is None:
+            ind = self._key2ind()[key]
+            info = cast(T, MappingProxyType({
+                info_key: self._getter(ind, info_key)
+                for info_key in self._keys}))
+            self._infos.set(key, info)
+        return info
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key2ind()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key2ind())
+
+    def __len__(self) -> int:
+        return len(self._key2ind())
+
+
+class FrozenCDB(CDB):
+    """A compact, read only CDB for inference.
+
+    The CUIs and names are interned to integer IDs. The names, subnames
+    and type IDs of each CUI as well as the candidate CUIs (and their
+    status) of each name are kept in CSR arrays. The statuses are kept as
+    `uint8` codes and the context vectors of the trained CUIs in a dense
+    matrix per context type. This avoids the overhead of the (many)
+    Python dicts and sets of the regular CDB.
+
+    The context vectors can optionally be kept at a lower precision (see
+    `from_cdb`). When quantised to int8, the `cui2info` provides the int8
+    vectors (which have the same direction so they can be used for the
+    similarities as is) and their per-vector scales are kept separately.
+
+    The `cui2info` and `name2info` are read only dict-like views that
+    provide the same information as the regular CDB. So the frozen CDB
+    can be used for inference as is. It can not be modified (or trained),
+    but it can be converted to a regular CDB with `to_cdb`.
+
+    Args:
+        config (Config): The config.
+    """
+
+    def __init__(self, config: Config) -> None:
+        # NOTE: not calling super().__init__ since cui2info and name2info
+        #       are views of the arrays rather than dicts
+        self.config = config
+        self.type_id2info = {}
+        self.token_counts = {}
+        self.addl_info = {}
+        self._subnames = set()
+        self._subnames_version = 0
+        self.is_dirty = False
+        self.has_changed_names = False
+        # CUIs
+        self._cuis: list[str] = []
+        self._cui2ind: dict[str, int] = {}
+        self._preferred_names: list[str] = []
+        self._cui_count_train = np.zeros(0, dtype=np.int64)
+        self._cui_average_confidence = np.zeros(0, dtype=np.float64)
+        self._cui_extras: dict[str, dict[str, Any]] = {}
+        self._cui_names_indptr, self._cui_names = _to_csr([])
+        self._cui_subnames_indptr, self._cui_subnames = _to_csr([])
+        self._subname_list: list[str] = []
+        self._cui_type_ids_indptr, self._cui_type_ids = _to_csr([])
+        self._type_id_list: list[str] = []
+        # context vectors - a row for each CUI with vectors
+        self._cv_rows = np.zeros(0, dtype=np.int32)
+        self._cv_matrices: dict[str, np.ndarray] = {}
+        self._cv_has: dict[str, np.ndarray] = {}
+        # NOTE: the scale of each row (only if quantised to int8)
+        self._cv_scales: dict[str, np.ndarray] = {}
+        # names
+        self._names: list[str] = []
+        self._name2ind: dict[str, int] = {}
+        self._name_is_upper = np.zeros(0, dtype=bool)
+        self._name_count_train = np.zeros(0, dtype=np.int64)
+        self._name_cuis_indptr, self._name_cuis = _to_csr([])
+        self._name_statuses = np.zeros(0, dtype=np.uint8)
+        self._statuses: list[str] = []
+        self._init_views()
+
+    def _init_views(self) -> None:
+        cache_size = self.config.general.frozen_cdb_cache_size
+        self._cui2info_view: _FrozenInfoMap[CUIInfo] = _FrozenInfoMap(
+            lambda: self._cui2ind, self._get_cui_field,
+            tuple(CUIInfo.__annotations__), cache_size)
+        self._name2info_view: _FrozenInfoMap[NameInfo] = _FrozenInfoMap(
+            lambda: self._name2ind, self._get_name_field,
+            tuple(NameInfo.__annotations__), cache_size)
+
+    @classmethod
+    def ignore_attrs(cls) -> list[str]:
+        return ['_cui2info_view', '_name2info_view']
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_views()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items()
+                if k not in self.ignore_attrs()}
+
+    @property  # type: ignore
+    def cui2info(self) -> dict[str, CUIInfo]:  # type: ignore
+        return cast(dict[str, CUIInfo], self._cui2info_view)
+
+    @property  # type: ignore
+    def name2info(self) -> dict[str, NameInfo]:  # type: ignore
+        return cast(dict[str, NameInfo], self._name2info_view)
+
+    @staticmethod
+    def _csr_values(indptr: np.ndarray, indices: np.ndarray, ind: int,
+                    values: list[str]) -> frozenset[str]:
+        return frozenset(
+            values[i] for i in indices[indptr[ind]:indptr[ind + 1]])
+
+    def _get_context_vectors(self, ind: int
+                             ) -> Optional[Mapping[str, np.ndarray]]:
+        row = self._cv_rows[ind]
+        if row < 0:
+            return None
+        vectors = {}
+        for ct, mat in self._cv_matrices.items():
+            if not self._cv_has[ct][row]:
+                continue
+            # NOTE: a view of the row, so it can't be allowed to change
+            vec = mat[row]
+            vec.flags.writeable = False
+            vectors[ct] = vec
+        return MappingProxyType(vectors)
+
+    def _get_cui_field(self, ind: int, key: str) -> Any:
+        if key == 'cui':
+            return self._cuis[ind]
+        elif key == 'preferred_name':
+            return self._preferred_names[ind]
+        elif key == 'names':
+            return self._csr_values(self._cui_names_indptr, self._cui_names,
+                                    ind, self._names)
+        elif key == 'subnames':
+            return self._csr_values(
+                self._cui_subnames_indptr, self._cui_subnames, ind,
+                self._subname_list)
+        elif key == 'type_ids':
+            return self._csr_values(
+                self._cui_type_ids_indptr, self._cui_type_ids, ind,
+                self._type_id_list)
+        elif key == 'count_train':
+            return int(self._cui_count_train[ind])
+        elif key == 'context_vectors':
+            return self._get_context_vectors(ind)
+        elif key == 'average_confidence':
+            return float(self._cui_average_confidence[ind])
+        value = self._cui_extras.get(self._cuis[ind], {}).get(key, None)
+        if isinstance(value, set):
+            return frozenset(value)
+        return value
+
+    def _get_name_field(self, ind: int, key: str) -> Any:
+        if key == 'name':
+            return self._names[ind]
+        elif key == 'per_cui_status':
+            start = self._name_cuis_indptr[ind]
+            end = self._name_cuis_indptr[ind + 1]
+            return MappingProxyType({
+                self._cuis[cui_ind]: self._statuses[status]
+                for cui_ind, status in zip(self._name_cuis[start:end],
+                                           self._name_statuses[start:end])})
+        elif key == 'is_upper':
+            return bool(self._name_is_upper[ind])
+        return int(self._name_count_train[ind])  # count_train
+
+    def get_context_vectors_size(self) -> int:
+        """Get the memory used by the context vectors.
+
+        Returns:
+            int: The size (in bytes) of the context vectors.
+        """
+        return sum(arr.nbytes for arrays in (self._cv_matrices,
+                                             self._cv_scales)
+                   for arr in arrays.values())
+
+    @classmethod
+    def from_cdb(cls, cdb: CDB,
+                 context_vector_dtype: Union[str, Type, None] = None
+                 ) -> 'FrozenCDB':
+        """Create a frozen CDB from a regular one.
+
+        Args:
+            cdb (CDB): The CDB to freeze.
+            context_vector_dtype (Union[str, Type, None]): The data type to
+                keep the context vectors in (e.g `float16`). If `int8`,
+                the vectors are quantised with a per-vector scale. Defaults
+                to None (i.e the type of the vectors in the CDB).
+
+        Raises:
+            ValueError: If the data type is not a float type or int8.
+
+        Returns:
+            FrozenCDB: The frozen CDB.
+        """
+        dtype = (np.dtype(context_vector_dtype)
+                 if context_vector_dtype is not None else None)
+        if dtype is not None and dtype != np.int8 and dtype.kind != 'f':
+            raise ValueError("The context vectors can only be kept as "
+                             f"floats or quantised to int8. Got: {dtype}")
+        if isinstance(cdb, FrozenCDB):
+            # NOTE: restore the (potentially quantised) vectors first
+            cdb = cdb.to_cdb()
+        frozen = cls(cdb.config)
+        frozen.type_id2info = cdb.type_id2info
+        frozen.token_counts = cdb.token_counts
+        frozen.addl_info = cdb.addl_info
+        cdb._ensure_subnames()
+        frozen._subnames = set(cdb._subnames)
+        # NOTE: the names are interned for all the CUIs first so that the
+        #       names of the CUIs and the names in name2info share IDs
+        frozen._names = list(cdb.name2info)
+        frozen._name2ind = {name: ind
+                            for ind, name in enumerate(frozen._names)}
+        frozen._cuis = list(cdb.cui2info)
+        frozen._cui2ind = {cui: ind for ind, cui in enumerate(frozen._cuis)}
+        subname2ind: dict[str, int] = {}
+        type_id2ind: dict[str, int] = {}
+        cui_names: list[list[int]] = []
+        cui_subnames: list[list[int]] = []
+        cui_type_ids: list[list[int]] = []
+        cv_rows = np.full(len(frozen._cuis), -1, dtype=np.int32)
+        cv_lists: dict[str, list[tuple[int, np.ndarray]]] = {}
+        num_cv_rows = 0
+        for ind, (cui, info) in enumerate(cdb.cui2info.items()):
+            frozen._preferred_names.append(info['preferred_name'])
+            cui_names.append(_intern(sorted(info['names']),
+                                     frozen._name2ind, frozen._names))
+            cui_subnames.append(_intern(sorted(info['subnames']),
+                                        subname2ind, frozen._subname_list))
+            cui_type_ids.append(_intern(sorted(info['type_ids']),
+                                        type_id2ind, frozen._type_id_list))
+            extras = {key: info[key] for key in _CUI_EXTRA_KEYS  # type: ignore
+                      if info.get(key, None) is not None}
+            if extras:
+                frozen._cui_extras[cui] = extras
+            if info['context_vectors']:
+                cv_rows[ind] = num_cv_rows
+                for ct, vec in info['context_vectors'].items():
+                    cv_lists.setdefault(ct, []).append((num_cv_rows, vec))
+                num_cv_rows += 1
+        frozen._cui_count_train = np.array(
+            [info['count_train'] for info in cdb.cui2info.values()],
+            dtype=np.int64)
+        frozen._cui_average_confidence = np.array(
+            [info['average_confidence'] for info in cdb.cui2info.values()],
+            dtype=np.float64)
+        frozen._cui_names_indptr, frozen._cui_names = _to_csr(cui_names)
+        frozen._cui_subnames_indptr, frozen._cui_subnames = _to_csr(
+            cui_subnames)
+        frozen._cui_type_ids_indptr, frozen._cui_type_ids = _to_csr(
+            cui_type_ids)
+        frozen._cv_rows = cv_rows
+        for ct, rows_vecs in cv_lists.items():
+            mat = np.zeros((num_cv_rows, len(rows_vecs[0][1])),
+                           dtype=np.result_type(*[vec for _, vec in rows_vecs]))
+            has = np.zeros(num_cv_rows, dtype=bool)
+            for row, vec in rows_vecs:
+                mat[row] = vec
+                has[row] = True
+            if dtype == np.int8:
+                mat, frozen._cv_scales[ct] = quantise_int8(mat)
+            elif dtype is not None:
+                mat = mat.astype(dtype)
+            frozen._cv_matrices[ct] = mat
+            frozen._cv_has[ct] = has
+        # names
+        status2code: dict[str, int] = {}
+        name_cuis: list[list[int]] = []
+        statuses: list[int] = []
+        is_upper = np.zeros(len(frozen._names), dtype=bool)
+        name_count_train = np.zeros(len(frozen._names), dtype=np.int64)
+        for ind, name in enumerate(frozen._names):
+            name_info = cdb.name2info.get(name, None)
+            if name_info is None:
+                # NOTE: a name of a CUI that has since been removed from
+                #       name2info (i.e it no longer links to any CUI)
+                name_cuis.append([])
+                continue
+            per_cui_status = name_info['per_cui_status']
+            name_cuis.append([frozen._cui2ind[cui] for cui in per_cui_status])
+            statuses.extend(_intern(per_cui_status.values(), status2code,
+                                    frozen._statuses))
+            is_upper[ind] = name_info['is_upper']
+            name_count_train[ind] = name_info['count_train']
+        frozen._name_cuis_indptr, frozen._name_cuis = _to_csr(name_cuis)
+        frozen._name_statuses = np.array(statuses, dtype=np.uint8)
+        frozen._name_is_upper = is_upper
+        frozen._name_count_train = name_count_train
+        # NOTE: only the names that link to CUIs are in name2info
+        frozen._name2ind = {name: ind for name, ind
+                            in frozen._name2ind.items()
+                            if name in cdb.name2info}
+        frozen._init_views()
+        return frozen
+
+    def to_cdb(self) -> CDB:
+        """Convert to a regular (modifiable) CDB.
+
+        If the context vectors were quantised, they are restored (as
+        float32) to within the precision of the quantisation.
+
+        Returns:
+            CDB: The regular CDB.
+        """
+        cdb = CDB(self.config)
+        cdb.type_id2info = self.type_id2info
+        cdb.token_counts = self.token_counts
+        cdb.addl_info = self.addl_info
+        cdb._subnames = set(self._subnames)
+        for cui, cui_info in self.cui2info.items():
+            info: dict[str, Any] = dict(cui_info)
+            # NOTE: the (immutable) views need to be modifiable in the CDB
+            for key, value in cui_info.items():
+                if isinstance(value, frozenset):
+                    info[key] = set(value)
+            vectors = cui_info['context_vectors']
+            if vectors is not None:
+                row = self._cv_rows[self._cui2ind[cui]]
+                info['context_vectors'] = {
+                    ct: (dequantise_int8(vec, self._cv_scales[ct][row])
+                         if ct in self._cv_scales else vec.copy())
+                    for ct, vec in vectors.items()}
+            cdb.cui2info[cui] = cast(CUIInfo, info)
+        for name, name_info in self.name2info.items():
+            info = dict(name_info)
+            info['per_cui_status'] = dict(name_info['per_cui_status'])
+            cdb.name2info[name] = cast(NameInfo, info)
+        return cdb
+
+    def _reset_subnames(self) -> None:
+        self._subnames = set(self._subname_list)
+        self._subnames_version += 1
+        self.has_changed_names = False
+
+    def _ensure_subnames(self) -> None:
+        # NOTE: the subnames never change
+        pass
+
+    def get_cui2count_train(self) -> dict[str, int]:
+        return {self._cuis[ind]: int(self._cui_count_train[ind])
+                for ind in np.flatnonzero(self._cui_count_train)}
+
+    def get_name2count_train(self) -> dict[str, int]:
+        return {self._names[ind]: int(self._name_count_train[ind])
+                for ind in np.flatnonzero(self._name_count_train)
+                if self._names[ind] in self._name2ind}
+
+    # NOTE: the methods that would modify the CDB
+
+    def add_types(self, types: Iterable[tuple[str, str]]) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def add_names(self, cui: str, names: dict[str, NameDescriptor],
+                  name_status: str = ST.AUTOMATIC, full_build: bool = False
+                  ) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def _add_concept(self, *args, **kwargs) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def reset_training(self) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def filter_by_cui(self, cuis_to_keep: Collection[str]) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def remove_cui(self, cui: str) -> None:
+        raise TypeError(_READ_ONLY_MSG)
+
+    def _remove_names(self, cui: str, names: Iterable[str]) -> None:
+        raise TypeError(_READ_ONLY_MSG)
@@ -122,6 +122,9 @@ class MetaCATAddon(AddonComponent):
     def __call__(self, doc: MutableDocument) -> MutableDocument:
         return self.mc(doc)
 
+    def pipe(self, docs: list[MutableDocument]) -> list[MutableDocument]:
+        return self.mc.pipe(docs)
+
     def load(self, folder_path: str) -> 'MetaCAT':
         mc_path, tokenizer_folder = self._get_meta_cat_and_tokenizer_paths(
             folder_path)
@@ -812,7 +815,15 @@ class MetaCAT(AbstractSerialisable):
             data.extend(doc.get_addon_data(_SHARE_TOKENS_PATH)[0])
         predictions, confidences = predict(
             self.model, data, config)
+        self._set_ent_meta_anns(doc, ent_id2ind, predictions, confidences,
+                                id2category_value)
+        return doc
 
+    def _set_ent_meta_anns(self, doc: MutableDocument,
+                           ent_id2ind: dict[int, int],
+                           predictions: list[int], confidences: list[float],
+                           id2category_value: dict) -> None:
+        config = self.config
         ents = self.get_ents(doc)
 
         for ent in ents:
@@ -835,7 +846,50 @@ class MetaCAT(AbstractSerialisable):
                     'confidence': float(confidence),
                     'name': config.general.category_name
                 }
-        return doc
+
+    def pipe(self, docs: list[MutableDocument]) -> list[MutableDocument]:
+        """Process a batch of documents.
+
+        The texts of the documents are tokenized together and the
+        predictions for all the entities within the batch are done at once.
+
+        Args:
+            docs (list[MutableDocument]): The documents.
+
+        Returns:
+            list[MutableDocument]: The same documents.
+        """
+        config = self.config
+        if not docs or config.general.save_and_reuse_tokens:
+            # NOTE: reused tokens are kept on a per document basis
+            return [self(doc) for doc in docs]
+        id2category_value = {
+            v: k for k, v in config.general.category_value2id.items()}
+        if config.general.lowercase:
+            all_texts = [doc.base.text.lower() for doc in docs]
+        else:
+            all_texts = [doc.base.text for doc in docs]
+        assert self.tokenizer is not None
+        all_texts_processed = self.tokenizer(all_texts)
+        all_data: list = []
+        # the index of the first sample and the ent ID to index mapping
+        per_doc_info: list[tuple[int, dict[int, int]]] = []
+        for doc, text_processed in zip(docs, all_texts_processed):
+            ent_id2ind, data = self.prepare_document(
+                doc, input_ids=text_processed['input_ids'],
+                offset_mapping=text_processed['offset_mapping'],
+                lowercase=config.general.lowercase)
+            per_doc_info.append((len(all_data), ent_id2ind))
+            all_data.extend(data)
+        if not all_data:
+            return docs
+        predictions, confidences = predict(self.model, all_data, config)
+        for doc, (offset, ent_id2ind) in zip(docs, per_doc_info):
+            self._set_ent_meta_anns(
+                doc, {ent_id: ind + offset
+                      for ent_id, ind in ent_id2ind.items()},
+                predictions, confidences, id2category_value)
+        return docs
 
     # Override
     def __call__(self, doc: MutableDocument) -> MutableDocument:
@@ -107,9 +107,10 @@ class Linker(AbstractCoreComponent):
 
     def _train_on_doc(self, doc: MutableDocument) -> Iterator[MutableEntity]:
         # Run training
+        per_doc_valid_token_cache = PerDocumentTokenCache()
         for entity in doc.ner_ents:
             yield from self._process_entity_train(
-                doc, entity, PerDocumentTokenCache())
+                doc, entity, per_doc_valid_token_cache)
 
     def _process_entity_nt_w_name(
             self, doc: MutableDocument,
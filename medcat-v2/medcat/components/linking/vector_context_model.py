@@ -12,7 +12,7 @@ from medcat.config.config import Linking
 from medcat.tokenizing.tokens import (MutableToken, MutableEntity,
                                        MutableDocument)
 from medcat.utils.defaults import StatusTypes as ST
-from medcat.utils.matutils import unitvec
+from medcat.utils.matutils import unitvec, quantise_int8
 from medcat.storage.serialisables import AbstractSerialisable
 
 
@@ -26,6 +26,244 @@ class DisambPreprocessor(Protocol):
         pass
 
 
+class CUIContextMatrix:
+    """The unit-normalised context vectors of CUIs in contiguous matrices.
+
+    There is one float32 matrix per context type with a row per CUI. This
+    allows the similarities of all the candidate CUIs to be calculated
+    with a single gather and dot product per context type. The rows of
+    CUIs that have no vector for a context type are all zeros, so they
+    contribute nothing to the similarity.
+
+    The rows are added lazily (i.e upon first use of a CUI). The context
+    vectors of a CUI are replaced (rather than modified in place) when
+    trained. So each row keeps track of the vectors it was created from
+    and is updated if the CUI's vectors have since been replaced.
+
+    If the context vectors are quantised (i.e int8, see
+    `FrozenCDB.from_cdb`), the matrices are int8 as well. The rows are then
+    kept as is along with their inverse norms rather than unit-normalised.
+
+    Args:
+        context_types (list[str]): The context types.
+    """
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, context_types: list[str]) -> None:
+        self.context_types = context_types
+        self._cui2row: dict[str, int] = {}
+        # NOTE: the IDs of the source vectors for each row along with the
+        #       vectors themselves (so that the IDs can't get reused)
+        self._row_sources: list[tuple[tuple[int, ...], tuple]] = []
+        self._matrices: dict[str, np.ndarray] = {}
+        self._quantised = False
+        self._inv_norms: dict[str, np.ndarray] = {}
+
+    def _ensure_capacity(self, example: np.ndarray) -> None:
+        num_rows = len(self._row_sources)
+        if not self._matrices:
+            self._quantised = np.issubdtype(example.dtype, np.integer)
+            dtype = np.int8 if self._quantised else np.float32
+            self._matrices = {
+                ct: np.zeros((self._INITIAL_CAPACITY, len(example)),
+                             dtype=dtype)
+                for ct in self.context_types}
+            if self._quantised:
+                self._inv_norms = {
+                    ct: np.zeros(self._INITIAL_CAPACITY, dtype=np.float32)
+                    for ct in self.context_types}
+            return
+        capacity = next(iter(self._matrices.values())).shape[0]
+        if num_rows < capacity:
+            return
+        for ct, mat in self._matrices.items():
+            new_mat = np.zeros((2 * capacity, mat.shape[1]), dtype=mat.dtype)
+            new_mat[:capacity] = mat
+            self._matrices[ct] = new_mat
+        for ct, inv_norms in self._inv_norms.items():
+            self._inv_norms[ct] = np.concatenate(
+                (inv_norms, np.zeros_like(inv_norms)))
+
+    def _set_row(self, row: int, vectors: tuple) -> None:
+        for ct, vec in zip(self.context_types, vectors):
+            if vec is None:
+                self._matrices[ct][row] = 0
+                if self._quantised:
+                    self._inv_norms[ct][row] = 0
+            elif self._quantised:
+                if not np.issubdtype(vec.dtype, np.integer):
+                    # NOTE: e.g vectors that have since been trained
+                    vec = quantise_int8(vec)[0]
+                self._matrices[ct][row] = vec
+                norm = np.linalg.norm(vec)
+                self._inv_norms[ct][row] = 1 / norm if norm else 0
+            else:
+                self._matrices[ct][row] = unitvec(vec)
+
+    def _reset(self) -> None:
+        self._cui2row.clear()
+        self._row_sources.clear()
+        self._matrices = {}
+        self._inv_norms = {}
+
+    def _fits(self, vectors: tuple) -> bool:
+        if not self._matrices:
+            return True
+        width = next(iter(self._matrices.values())).shape[1]
+        return all(vec is None or len(vec) == width for vec in vectors)
+
+    def get_rows(self, cuis: list[str], cui2info: dict[str, CUIInfo]
+                 ) -> list[int]:
+        """Get the (up to date) rows of the CUIs.
+
+        If the size of the context vectors has changed (e.g they were
+        converted), the matrices are rebuilt.
+
+        Args:
+            cuis (list[str]): The CUIs. They need to have context vectors.
+            cui2info (dict[str, CUIInfo]): The CUI to info mapping.
+
+        Raises:
+            ValueError: If a CUI has no context vectors or if the context
+                vectors are of different sizes.
+
+        Returns:
+            list[int]: The rows in the matrices.
+        """
+        rows = self._get_rows(cuis, cui2info)
+        if rows is None:
+            logger.info("The size of the context vectors has changed, "
+                        "rebuilding the context matrices")
+            self._reset()
+            rows = self._get_rows(cuis, cui2info)
+            if rows is None:
+                raise ValueError("The context vectors are of different sizes")
+        return rows
+
+    def _get_rows(self, cuis: list[str], cui2info: dict[str, CUIInfo]
+                  ) -> Optional[list[int]]:
+        rows = []
+        for cui in cuis:
+            cui_vectors = cui2info[cui]['context_vectors']
+            if not cui_vectors:
+                raise ValueError(f"The CUI {cui} has no context vectors")
+            vectors = tuple(cui_vectors.get(ct) for ct in self.context_types)
+            source_ids = tuple(map(id, vectors))
+            row = self._cui2row.get(cui)
+            if row is not None and self._row_sources[row][0] == source_ids:
+                rows.append(row)
+                continue
+            if not self._fits(vectors):
+                return None
+            if row is None:
+                # NOTE: the CUI may not have all (or any) of the context
+                #       types, but it does have some context vectors
+                self._ensure_capacity(next(iter(cui_vectors.values())))
+                row = self._cui2row[cui] = len(self._row_sources)
+                self._row_sources.append((source_ids, vectors))
+            else:
+                self._row_sources[row] = (source_ids, vectors)
+            self._set_row(row, vectors)
+            rows.append(row)
+        return rows
+
+    def get_similarities(self, rows: list[int],
+                         vectors: dict[str, np.ndarray],
+                         weights: dict[str, float]) -> np.ndarray:
+        """Get the weighted similarities of the rows to the vectors.
+
+        Args:
+            rows (list[int]): The rows (from `get_rows`).
+            vectors (dict[str, np.ndarray]): The context vectors (per
+                context type) to compare against.
+            weights (dict[str, float]): The weights of each context type.
+
+        Returns:
+            np.ndarray: The similarity for each row.
+        """
+        sims = np.zeros(len(rows), dtype=np.float32)
+        for ct, weight in weights.items():
+            if ct not in vectors or ct not in self._matrices:
+                continue
+            doc_vec = unitvec(vectors[ct]).astype(np.float32, copy=False)
+            cur_sims = self._matrices[ct][rows] @ doc_vec
+            if self._quantised:
+                cur_sims *= self._inv_norms[ct][rows]
+            sims += weight * cur_sims
+        return sims
+
+
+class DocumentTokenVectors:
+    """The (lazily gathered) vectors and validity of the tokens of a document.
+
+    Each token is only looked up once it's needed (i.e once it's within
+    the window of some entity) and only once per document. The vectors
+    of the tokens that have one are kept in a contiguous matrix so that
+    the vectors for a window can be gathered at once.
+
+    Args:
+        doc (MutableDocument): The document.
+        vocab (Vocab): The vocab to get the vectors from.
+        is_valid (Callable[[MutableToken], bool]): Whether a token is
+            a valid context token.
+    """
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, doc: MutableDocument, vocab: Vocab,
+                 is_valid: Callable[[MutableToken], bool]) -> None:
+        self.doc = doc
+        self.vocab = vocab
+        self._is_valid = is_valid
+        self._known = np.zeros(len(doc), dtype=bool)
+        self.valid = np.zeros(len(doc), dtype=bool)
+        # NOTE: the row of the vector of each token (-1 if none)
+        self.rows = np.full(len(doc), -1, dtype=np.int64)
+        self.vectors: Optional[np.ndarray] = None
+        self._num_vectors = 0
+
+    def _add_vector(self, vec: np.ndarray) -> int:
+        if self.vectors is None:
+            self.vectors = np.zeros((self._INITIAL_CAPACITY, len(vec)),
+                                    dtype=vec.dtype)
+        elif self._num_vectors == len(self.vectors):
+            self.vectors = np.concatenate(
+                (self.vectors, np.zeros_like(self.vectors)))
+        self.vectors[self._num_vectors] = vec
+        self._num_vectors += 1
+        return self._num_vectors - 1
+
+    def ensure(self, start: int, end: int) -> None:
+        """Make sure the tokens in the range have been looked up.
+
+        Args:
+            start (int): The start index.
+            end (int): The end index (exclusive).
+        """
+        start, end = max(0, start), min(len(self.doc), end)
+        for ind in np.flatnonzero(~self._known[start:end]) + start:
+            tkn = self.doc[int(ind)]
+            self.valid[ind] = self._is_valid(tkn)
+            lower = tkn.base.lower
+            vec = self.vocab.vec(lower) if lower in self.vocab else None
+            if vec is not None:
+                self.rows[ind] = self._add_vector(vec)
+        self._known[start:end] = True
+
+    def valid_indices(self, start: int, end: int) -> np.ndarray:
+        """Get the indices of the valid tokens in the range.
+
+        Args:
+            start (int): The start index.
+            end (int): The end index (exclusive).
+
+        Returns:
+            np.ndarray: The indices (in increasing order).
+        """
+        self.ensure(start, end)
+        start, end = max(0, start), min(len(self.doc), end)
+        return np.flatnonzero(self.valid[start:end]) + start
+
+
 class ContextModel(AbstractSerialisable):
     """Used to learn embeddings for concepts and calculate similarities
     in new documents.
@@ -54,6 +292,20 @@ class ContextModel(AbstractSerialisable):
         self.name_separator = name_separator
         self._disamb_preprocessors = (  # copy if default/empty
             disamb_preprocessors or disamb_preprocessors.copy())
+        self._cui_matrix: Optional[CUIContextMatrix] = None
+        self._step_weights: Optional[
+            tuple[Callable[[int], float], np.ndarray]] = None
+
+    @classmethod
+    def ignore_attrs(cls) -> list[str]:
+        return ['_cui_matrix', '_step_weights']
+
+    def _get_cui_matrix(self) -> CUIContextMatrix:
+        context_types = list(self.config.context_vector_weights)
+        if (self._cui_matrix is None or
+                self._cui_matrix.context_types != context_types):
+            self._cui_matrix = CUIContextMatrix(context_types)
+        return self._cui_matrix
 
     def get_context_tokens(self, entity: MutableEntity, doc: MutableDocument,
                            size: int,
@@ -136,29 +388,78 @@ class ContextModel(AbstractSerialisable):
             dict[str, np.ndarray]: The context vector.
         """
         vectors: dict[str, np.ndarray] = {}
-
         context_vector_sizes = self.config.context_vector_sizes
-        for context_type, window_size in context_vector_sizes.items():
-            tokens_left, tokens_center, tokens_right = self.get_context_tokens(
-                entity, doc, window_size, per_doc_valid_token_cache)
-
-            values: list[np.ndarray] = []
-            # Add left
-            values.extend(self._tokens2vecs(tokens_left))
-
-            if not self.config.context_ignore_center_tokens:
-                # Add center
-                values.extend(
+        if not context_vector_sizes:
+            return vectors
+        token_vecs = per_doc_valid_token_cache.get_token_vectors(
+            doc, self.vocab)
+        start_ind = entity.base.start_index
+        end_ind = entity.base.end_index
+        # NOTE: the windows of all the context types are (when ordered by
+        #       distance from the entity) prefixes of the largest one. So
+        #       the tokens only need to be gathered once and the sums for
+        #       all context types are then a single (masked) product
+        max_size = max(context_vector_sizes.values())
+        token_vecs.ensure(start_ind - max_size, end_ind + 1 + max_size)
+        # Reverse because the first token should be the one closest to center
+        left_inds = token_vecs.valid_indices(
+            start_ind - max_size, start_ind)[::-1]
+        right_inds = token_vecs.valid_indices(
+            end_ind + 1, end_ind + 1 + max_size)
+        tokens_center: list[MutableToken] = list(
+            cast(Iterable[MutableToken], entity))
+        use_center = not self.config.context_ignore_center_tokens
+        # NOTE: the (random) name replacement upon training is done
+        #       separately for each context type
+        center_from_doc = use_center and cui is None
+        center_inds = np.array(
+            [tkn.base.index for tkn in tokens_center] if center_from_doc
+            else [], dtype=np.int64)
+        inds = np.concatenate((left_inds, center_inds, right_inds))
+        steps = np.concatenate((np.arange(len(left_inds)),
+                                np.arange(len(center_inds)),
+                                np.arange(len(right_inds))))
+        sizes = np.array(list(context_vector_sizes.values()))[:, None]
+        in_window = np.concatenate((
+            left_inds >= start_ind - sizes,
+            np.ones((len(sizes), len(center_inds)), dtype=bool),
+            right_inds <= end_ind + sizes), axis=1)
+        rows = token_vecs.rows[inds]
+        mask = in_window & (rows >= 0)
+        counts = mask.sum(axis=1)
+        sums: Optional[np.ndarray] = None
+        if token_vecs.vectors is not None and counts.any():
+            weights = np.where(
+                mask, self._get_step_weights(len(inds))[steps], 0.0)
+            # NOTE: the tokens without vectors (row -1) have 0 weight
+            sums = weights @ token_vecs.vectors[rows]
+
+        for num, context_type in enumerate(context_vector_sizes):
+            parts: list[np.ndarray] = []
+            if use_center and not center_from_doc:
+                parts.extend(
                     self._preprocess_center_tokens(cui, tokens_center))
-
-            # Add right
-            values.extend(self._tokens2vecs(tokens_right))
-
-            if values:
-                value = np.average(values, axis=0)
-                vectors[context_type] = value
+            count = counts[num] + len(parts)
+            if not count:
+                continue
+            if sums is not None:
+                parts.append(sums[num])
+            dtype = (parts[0].dtype if token_vecs.vectors is None
+                     else token_vecs.vectors.dtype)
+            vectors[context_type] = (
+                np.sum(parts, axis=0) / count).astype(dtype)
         return vectors
 
+    def _get_step_weights(self, num: int) -> np.ndarray:
+        cached = self._step_weights
+        if (cached is None or cached[0] is not self.weighted_average_function
+                or len(cached[1]) < num):
+            self._step_weights = cached = (
+                self.weighted_average_function,
+                np.array([self.weighted_average_function(step)
+                          for step in range(num)]))
+        return cached[1][:num]
+
     def similarity(self, cui: str, entity: MutableEntity, doc: MutableDocument,
                    per_doc_valid_token_cache: 'PerDocumentTokenCache'
                    ) -> float:
@@ -203,6 +504,37 @@ class ContextModel(AbstractSerialisable):
         else:
             return -1
 
+    def _similarities(self, cuis: list[str], vectors: dict[str, np.ndarray]
+                      ) -> list[float]:
+        """Calculate the similarities for a number of CUIs at once.
+
+        This is equivalent to calling `_similarity` for each CUI, but
+        uses the unit-normalised vectors in the CUI context matrix.
+
+        Args:
+            cuis (list[str]): The CUIs.
+            vectors (dict[str, np.ndarray]): The context vectors.
+
+        Returns:
+            list[float]: The similarities.
+        """
+        train_threshold = self.config.train_count_threshold
+        similarities = [-1.0] * len(cuis)
+        trained_inds = [
+            ind for ind, cui in enumerate(cuis)
+            if (self.cui2info[cui]['context_vectors'] and
+                self.cui2info[cui]['count_train'] >= train_threshold)]
+        if not trained_inds:
+            return similarities
+        cui_matrix = self._get_cui_matrix()
+        rows = cui_matrix.get_rows([cuis[ind] for ind in trained_inds],
+                                   self.cui2info)
+        sims = cui_matrix.get_similarities(
+            rows, vectors, self.config.context_vector_weights)
+        for ind, sim in zip(trained_inds, sims.tolist()):
+            similarities[ind] = sim
+        return similarities
+
     def _preprocess_disamb_similarities(self, entity: MutableEntity,
                                         name: str, cuis: list[str],
                                         similarities: list[float]) -> None:
@@ -257,9 +589,8 @@ class ContextModel(AbstractSerialisable):
             logger.debug("CUIs after: %s", cuis)
 
         if cuis:    # Maybe none are left after filtering
-            # Calculate similarity for each cui
-            similarities = [float(self._similarity(cui, vectors))
-                            for cui in cuis]
+            # Calculate similarity for all the cuis at once
+            similarities = self._similarities(cuis, vectors)
             # DEBUG
             logger.debug("Similarities: %s", list(zip(cuis, similarities)))
 
@@ -409,6 +740,28 @@ class ContextModel(AbstractSerialisable):
 
 class PerDocumentTokenCache(dict[MutableToken, bool]):
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._token_vecs: Optional[DocumentTokenVectors] = None
+
+    def get_token_vectors(self, doc: MutableDocument, vocab: Vocab
+                          ) -> DocumentTokenVectors:
+        """Get the token vectors of the document this cache is for.
+
+        Args:
+            doc (MutableDocument): The document.
+            vocab (Vocab): The vocab.
+
+        Returns:
+            DocumentTokenVectors: The token vectors.
+        """
+        token_vecs = self._token_vecs
+        if (token_vecs is None or token_vecs.doc is not doc or
+                token_vecs.vocab is not vocab):
+            token_vecs = DocumentTokenVectors(doc, vocab, self.__getitem__)
+            self._token_vecs = token_vecs
+        return token_vecs
+
     def __getitem__(self, key: MutableToken):
         index = key.base.index
         if index not in self:
@@ -1,5 +1,8 @@
 from typing import Optional
 
+import os
+import json
+import pickle
 import logging
 from medcat.tokenizing.tokens import MutableDocument
 from medcat.components.types import CoreComponentType, AbstractCoreComponent
@@ -9,6 +12,8 @@ from medcat.tokenizing.tokenizers import BaseTokenizer
 from medcat.vocab import Vocab
 from medcat.cdb import CDB
 from medcat.config.config import ComponentConfig
+from medcat.storage.serialisables import AbstractManualSerialisable
+from medcat.utils.hasher import Hasher
 
 from ahocorasick import Automaton
 import medcat
@@ -24,16 +29,75 @@ ensure_optional_extras_installed(medcat.__name__, _EXTRA_NAME)
 logger = logging.getLogger(__name__)
 
 
-class NER(AbstractCoreComponent):
+class NER(AbstractCoreComponent, AbstractManualSerialisable):
+    """The dictionary based NER.
+
+    This uses an Aho-Corasick automaton of all the names in the CDB.
+
+    The (compiled) automaton is saved along with the model and reused
+    upon load as long as the names in the CDB have not changed since.
+
+    When the names in the CDB change (e.g during training), the automaton
+    is rebuilt upon the next document. Alternatively, it can be rebuilt
+    after a number of documents
+    (`config.components.ner.automaton_rebuild_interval`) so that multiple
+    changes can be batched into one rebuild. Until then, newly added
+    names are not detected and removed names are ignored.
+
+    Args:
+        tokenizer (BaseTokenizer): The tokenizer.
+        cdb (CDB): The CDB.
+        automaton_folder (Optional[str]): The folder with the saved
+            automaton (if any). Defaults to None.
+    """
     name = 'cat_dict_ner'
+    AUTOMATON_FILE = 'automaton.pickle'
+    AUTOMATON_INFO_FILE = 'automaton_info.json'
 
     def __init__(self, tokenizer: BaseTokenizer,
-                 cdb: CDB) -> None:
+                 cdb: CDB, automaton_folder: Optional[str] = None) -> None:
         self.tokenizer = tokenizer
         self.cdb = cdb
         self.config = self.cdb.config
         self.automaton = Automaton()
-        self._rebuild_automaton()
+        self._automaton_key = ''
+        # NOTE: the number of documents processed since the names changed
+        #       (None if the automaton is up to date)
+        self._docs_since_change: Optional[int] = None
+        if (automaton_folder is None or
+                not self._load_automaton(automaton_folder)):
+            self._rebuild_automaton()
+
+    def _get_automaton_key(self) -> str:
+        # NOTE: the CDB hash does not account for the names themselves
+        #       so the automaton is keyed on the names it was built from
+        hasher = Hasher()
+        hasher.update(self.config.general.separator)
+        hasher.update(self.config.components.ner.min_name_len)
+        hasher.update_bytes("\n".join(self.cdb.name2info).encode())
+        return hasher.hexdigest()
+
+    def _load_automaton(self, folder_path: str) -> bool:
+        info_path = os.path.join(folder_path, self.AUTOMATON_INFO_FILE)
+        automaton_path = os.path.join(folder_path, self.AUTOMATON_FILE)
+        if not os.path.exists(info_path) or not os.path.exists(
+                automaton_path):
+            logger.warning("No saved NER automaton found at %s",
+                           folder_path)
+            return False
+        with open(info_path) as f:
+            saved_key = json.load(f)['key']
+        cur_key = self._get_automaton_key()
+        if saved_key != cur_key:
+            logger.info("The names in the CDB have changed since the NER "
+                        "automaton was saved (%s vs %s)", saved_key, cur_key)
+            return False
+        logger.info("Loading saved NER automaton (Aho-Corasick)")
+        with open(automaton_path, 'rb') as f:
+            self.automaton = pickle.load(f)
+        self._automaton_key = cur_key
+        self.cdb.has_changed_names = False
+        return True
 
     def _rebuild_automaton(self):
         # NOTE: every time the CDB changes (is dirtied)
@@ -56,6 +120,23 @@ class NER(AbstractCoreComponent):
                      "allowed length (%d)", ignored_min_len,
                      self.config.components.ner.min_name_len)
         self.automaton.make_automaton()
+        self._automaton_key = self._get_automaton_key()
+        self._docs_since_change = None
+        self.cdb.has_changed_names = False
+
+    def _maybe_rebuild_automaton(self) -> None:
+        if self.cdb.has_changed_names:
+            # NOTE: the subnames are kept up to date by the CDB itself
+            self.cdb.has_changed_names = False
+            if self._docs_since_change is None:
+                self._docs_since_change = 0
+        if self._docs_since_change is None:
+            return
+        if (self._docs_since_change >=
+                self.config.components.ner.automaton_rebuild_interval):
+            self._rebuild_automaton()
+        else:
+            self._docs_since_change += 1
 
     def get_type(self) -> CoreComponentType:
         return CoreComponentType.ner
@@ -74,11 +155,14 @@ class NER(AbstractCoreComponent):
             doc (MutableDocument):
                 Spacy document with detected entities.
         """
-        if self.cdb.has_changed_names:
-            self.cdb._reset_subnames()
-            self._rebuild_automaton()
+        self._maybe_rebuild_automaton()
         text = doc.base.text.lower()
         for end_idx, raw_name in self.automaton.iter(text):
+            preprocessed_name = raw_name.replace(
+                ' ', self.config.general.separator)
+            if preprocessed_name not in self.cdb.name2info:
+                # NOTE: removed from the CDB since the automaton was built
+                continue
             start_idx = end_idx - len(raw_name) + 1
             cur_tokens = doc.get_tokens(start_idx, end_idx)
             if not isinstance(cur_tokens, list):
@@ -94,8 +178,6 @@ class NER(AbstractCoreComponent):
                 #       don't really want to catch `mi` (for myocardial
                 #       infarction) in "family".
                 continue
-            preprocessed_name = raw_name.replace(
-                ' ', self.config.general.separator)
             maybe_annotate_name(self.tokenizer, preprocessed_name, cur_tokens,
                                 doc, self.cdb, self.config)
         return doc
@@ -105,3 +187,21 @@ class NER(AbstractCoreComponent):
             cls, cnf: ComponentConfig, tokenizer: BaseTokenizer,
             cdb: CDB, vocab: Vocab, model_load_path: Optional[str]) -> 'NER':
         return cls(tokenizer, cdb)
+
+    # for manual serialisability
+
+    def serialise_to(self, folder_path: str) -> None:
+        if self._get_automaton_key() != self._automaton_key:
+            # NOTE: save the automaton for the current names
+            self._rebuild_automaton()
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, self.AUTOMATON_FILE), 'wb') as f:
+            pickle.dump(self.automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(folder_path, self.AUTOMATON_INFO_FILE),
+                  'w') as f:
+            json.dump({'key': self._automaton_key}, f)
+
+    @classmethod
+    def deserialise_from(cls, folder_path: str, **init_kwargs) -> 'NER':
+        return cls(init_kwargs['tokenizer'], init_kwargs['cdb'],
+                   automaton_folder=folder_path)
@@ -109,6 +109,9 @@ class TransformersNER(AbstractCoreComponent):
     def __call__(self, doc: MutableDocument) -> MutableDocument:
         return self._component(doc)
 
+    def pipe(self, docs: list[MutableDocument]) -> list[MutableDocument]:
+        return list(self._component.pipe(docs))
+
     # for manual serialisability
 
     def get_folder_name(self) -> str:
@@ -710,10 +713,7 @@ class TransformersNERComponent:
         batch_size_chars = self.config.general.pipe_batch_size_in_chars
         yield from self._process(stream, batch_size_chars)  # type: ignore
 
-    def _process_doc(self, doc: MutableDocument):
-        aggr_strat = self.config.general.ner_aggregation_strategy
-        res = self.ner_pipe(doc.base.text,
-                            aggregation_strategy=aggr_strat)
+    def _add_ents(self, doc: MutableDocument, res: list[dict]):
         doc.ner_ents = []  # type: ignore
         for r in res:
             inds = []
@@ -745,10 +745,17 @@ class TransformersNERComponent:
             self.create_eval_pipeline()
         for docs in self.batch_generator(
                 stream, batch_size_chars):  # type: ignore
-            # For now we will process the documents one by one, should be
-            # improved in the future to use batching
-            for doc in docs:
-                self._process_doc(doc)
+            # NOTE: the HF pipeline is given all the texts of the batch
+            #       at once rather than being called for each of them.
+            #       Without a batch size it would still run them through
+            #       the model one at a time.
+            aggr_strat = self.config.general.ner_aggregation_strategy
+            batch_size = self.config.general.pipe_batch_size
+            all_res = self.ner_pipe([doc.base.text for doc in docs],
+                                    aggregation_strategy=aggr_strat,
+                                    batch_size=batch_size)
+            for doc, res in zip(docs, all_res):
+                self._add_ents(doc, res)
             yield from docs
 
     # Override
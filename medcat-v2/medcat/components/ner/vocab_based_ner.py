@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Iterable, Any
 
 import logging
 from medcat.tokenizing.tokens import MutableDocument
@@ -13,6 +13,65 @@ from medcat.config.config import ComponentConfig
 logger = logging.getLogger(__name__)
 
 
+# NOTE: each trie node is a dict of the next token to the child node.
+#       A node that is itself a subname also has its full (subname) string
+#       under the `None` key.
+_TrieNode = dict[Optional[str], Any]
+
+
+class SubnameTrie:
+    """A token level prefix trie of the CDB subnames.
+
+    The subnames are split into tokens at the separator. Looking up the
+    token(s) following a node is then equivalent to checking for the
+    concatenated (subname) string, but doesn't require building it.
+
+    Args:
+        subnames (Iterable[str]): The subnames.
+        separator (str): The separator between the tokens of a subname.
+    """
+
+    def __init__(self, subnames: Iterable[str], separator: str) -> None:
+        self.separator = separator
+        self.root: _TrieNode = {}
+        for subname in subnames:
+            self.add(subname)
+
+    def add(self, subname: str) -> None:
+        """Add a subname to the trie.
+
+        Args:
+            subname (str): The subname.
+        """
+        node = self.root
+        for part in subname.split(self.separator):
+            node = node.setdefault(part, {})
+        node[None] = subname
+
+    def get_child(self, node: _TrieNode, text: str) -> Optional[_TrieNode]:
+        """Get the node of the subname that continues with the text.
+
+        Args:
+            node (_TrieNode): The current node (or the root).
+            text (str): The text (token version) to continue with.
+
+        Returns:
+            Optional[_TrieNode]: The child node if the continued name is a
+                subname, otherwise None.
+        """
+        child = node.get(text)
+        if child is None and self.separator in text:
+            # NOTE: the text spans multiple parts of the trie
+            child = node
+            for part in text.split(self.separator):
+                child = child.get(part)
+                if child is None:
+                    return None
+        if child is None or None not in child:
+            return None
+        return child
+
+
 class NER(AbstractCoreComponent):
     name = 'cat_ner'
 
@@ -21,6 +80,23 @@ class NER(AbstractCoreComponent):
         self.tokenizer = tokenizer
         self.cdb = cdb
         self.config = self.cdb.config
+        self._trie: Optional[SubnameTrie] = None
+        self._trie_state: Optional[tuple[int, int, str]] = None
+
+    def _get_trie(self) -> SubnameTrie:
+        self.cdb._ensure_subnames()
+        # NOTE: the CDB bumps the version of its subnames upon every change
+        #       to them, but the set can also be replaced as a whole
+        #       (e.g when restoring a CDB state)
+        subnames = self.cdb._subnames
+        sep = self.config.general.separator
+        state = (id(subnames), self.cdb._subnames_version, sep)
+        if self._trie is None or self._trie_state != state:
+            logger.debug("Building subname trie for %d subnames",
+                         len(subnames))
+            self._trie = SubnameTrie(subnames, sep)
+            self._trie_state = state
+        return self._trie
 
     def get_type(self) -> CoreComponentType:
         return CoreComponentType.ner
@@ -40,7 +116,9 @@ class NER(AbstractCoreComponent):
                 Spacy document with detected entities.
         """
         max_skip_tokens = self.config.components.ner.max_skip_tokens
+        try_reverse = self.config.components.ner.try_reverse_word_order
         _sep = self.config.general.separator
+        trie = self._get_trie()
         # Just take the tokens we need
         _doc = [tkn for tkn in doc if not tkn.to_skip]
         for i, tkn in enumerate(_doc):
@@ -50,13 +128,14 @@ class NER(AbstractCoreComponent):
             # name_versions = [tkn.norm, tkn.base.lower]
             name_versions = tkn.base.text_versions
             name = ""
+            # NOTE: the trie node of the current name - so continuing the
+            #       name doesn't require building and probing new strings
+            node = None
 
             for name_version in name_versions:
-                if self.cdb.has_subname(name_version):
-                    if name:
-                        name = name + _sep + name_version
-                    else:
-                        name = name_version
+                node = trie.get_child(trie.root, name_version)
+                if node is not None:
+                    name = node[None]
                     break
             # if name is in CDB
             if name in self.cdb.name2info and not tkn.base.is_stop:
@@ -82,14 +161,15 @@ class NER(AbstractCoreComponent):
                 name_changed = False
                 name_reverse = None
                 for name_version in name_versions:
-                    _name = name + _sep + name_version
-                    if self.cdb.has_subname(_name):
+                    child = trie.get_child(node, name_version)  # type: ignore
+                    if child is not None:
                         # Append the name and break
-                        name = _name
+                        node = child
+                        name = child[None]
                         name_changed = True
                         break
 
-                    if self.config.components.ner.try_reverse_word_order:
+                    if try_reverse:
                         _name_reverse = name_version + _sep + name
                         if self.cdb.has_subname(_name_reverse):
                             # Append the name and break
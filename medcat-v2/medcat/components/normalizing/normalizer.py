@@ -1,24 +1,70 @@
 from typing import Optional, Iterable, Iterator, Union, overload, Literal
+from itertools import islice
+import os
 import re
+import json
+import pickle
+import logging
 
-from medcat.tokenizing.tokens import MutableDocument
+from medcat.tokenizing.tokens import MutableDocument, MutableToken
 from medcat.tokenizing.tokenizers import BaseTokenizer
 from medcat.config.config import Config, ComponentConfig
 from medcat.vocab import Vocab
 from medcat.cdb import CDB
 from medcat.components.types import CoreComponentType, AbstractCoreComponent
+from medcat.storage.serialisables import AbstractManualSerialisable
+from medcat.utils.hasher import Hasher
+from medcat.utils.caching import LRUCache
 
 
 CONTAINS_NUMBER = re.compile('[0-9]+')
 
 
+logger = logging.getLogger(__name__)
+
+
 class BasicSpellChecker:
+    """A basic (edit distance based) spell checker.
+
+    The candidates for a word are the known words one edit (a deletion,
+    a transposition, a replacement or an insertion) away from it. Or (with
+    `config.general.spell_check_deep`) two edits away if there are none
+    one edit away.
+
+    Rather than generating all the edits of a word, the candidates are
+    looked up from an index of the (single character) deletions of the
+    known words. Any known word one edit away from a word shares a
+    deletion with it (or is one itself). So the candidates are the same
+    as those of the generated edits. The most probable (i.e frequent)
+    candidate is used for the fix. Ties are broken alphabetically.
+
+    The index is built upon first use and updated when words are added to
+    the vocab. It can be saved along with the model (see
+    `config.general.save_spell_check_index`), in which case it is loaded
+    upon first use instead (see `set_index_folder`).
+
+    Args:
+        cdb_vocab (dict[str, int]): The known words and their counts.
+        config (Config): The config.
+        data_vocab (Optional[Vocab]): The data vocab. Defaults to None.
+    """
+    LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+    DIACRITICS = 'àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿ'
+    INDEX_FILE = 'spell_check_index.pickle'
+    INDEX_INFO_FILE = 'spell_check_index_info.json'
 
     def __init__(self, cdb_vocab: dict[str, int], config: Config,
                  data_vocab: Optional[Vocab] = None):
         self.vocab = cdb_vocab
         self.config = config
         self.data_vocab = data_vocab
+        # NOTE: maps each deletion to the known words it came from
+        self._deletes: dict[str, list[str]] = {}
+        # NOTE: the number of (the first) words in the vocab that have been
+        #       indexed - new words only ever get added to the vocab
+        self._num_indexed = 0
+        # NOTE: the folder of the saved index to load upon first use
+        self._index_folder: Optional[str] = None
 
     def P(self, word: str) -> float:
         """Probability of `word`.
@@ -54,7 +100,8 @@ class BasicSpellChecker:
         Returns:
             Optional[str]: Fixed word, or None if no fixes were applied.
         """
-        fix = max(self.candidates(word), key=self.P)
+        # NOTE: sorted so that ties are broken consistently
+        fix = max(sorted(self.candidates(word)), key=self.P)
         if fix != word:
             return fix
         else:
@@ -69,17 +116,137 @@ class BasicSpellChecker:
         Returns:
             Iterable[str]: The list of candidate words.
         """
-        if self.config.general.spell_check_deep:
+        if word in self.vocab:
+            return {word}
+        self.update_index()
+        letters = self._get_letters(self.config.general.diacritics)
+        found = self._known_edits1(word, letters)
+        if not found and self.config.general.spell_check_deep:
             # This will check a two letter edit distance
-            return (self.known([word]) or
-                    self.known(self.edits1(word)) or
-                    self.known(self.edits2(word)) or
-                    [word])
-        else:
-            # Will check only one letter edit distance
-            return (self.known([word]) or
-                    self.known(self.edits1(word)) or
-                    [word])
+            found = {known for edit in self.edits1(word)
+                     for known in self._known_edits1(edit, letters)}
+        return found or [word]
+
+    def _known_edits1(self, word: str, letters: str) -> set[str]:
+        deletes = self._get_deletes(word)
+        # NOTE: a known word is one edit away from the word if it is
+        #       a deletion of the word (a deletion), has the word as a
+        #       deletion (an insertion) or shares a deletion with it
+        #       (a replacement or a transposition)
+        found = {deleted for deleted in deletes if deleted in self.vocab}
+        for probe in (word, *deletes):
+            found.update(self._deletes.get(probe, ()))
+        return {known for known in found
+                if self._is_edit1(word, known, letters)}
+
+    @classmethod
+    def _get_letters(cls, use_diacritics: bool) -> str:
+        if use_diacritics:
+            return cls.LETTERS + cls.DIACRITICS
+        return cls.LETTERS
+
+    @classmethod
+    def _get_deletes(cls, word: str) -> set[str]:
+        return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+    @classmethod
+    def _is_edit1(cls, word: str, other: str, letters: str) -> bool:
+        # NOTE: equivalent to `other in cls.raw_edits1(word)`
+        if word == other:
+            # replaced by the same letter, or swapped identical letters
+            return (any(char in letters for char in word) or
+                    any(a == b for a, b in zip(word, word[1:])))
+        diff_at = next((i for i, (a, b) in enumerate(zip(word, other))
+                        if a != b), min(len(word), len(other)))
+        len_diff = len(other) - len(word)
+        if len_diff == -1:
+            return word[diff_at + 1:] == other[diff_at:]
+        elif len_diff == 1:
+            return (other[diff_at] in letters and
+                    other[diff_at + 1:] == word[diff_at:])
+        elif len_diff != 0:
+            return False
+        if word[diff_at + 1:] == other[diff_at + 1:]:
+            return other[diff_at] in letters
+        return (word[diff_at:diff_at + 2] == other[diff_at + 1::-1][:2] and
+                word[diff_at + 2:] == other[diff_at + 2:])
+
+    def update_index(self) -> None:
+        """Update the deletion index with the new words in the vocab.
+
+        The index is rebuilt if the vocab has fewer words than have been
+        indexed (i.e it has been replaced).
+        """
+        if self._index_folder is not None:
+            folder_path, self._index_folder = self._index_folder, None
+            if not self._num_indexed:
+                self.load_index(folder_path)
+        num_words = len(self.vocab)
+        if num_words == self._num_indexed:
+            return
+        if num_words < self._num_indexed:
+            self._deletes.clear()
+            self._num_indexed = 0
+        logger.info("Indexing %d words for spell checking",
+                    num_words - self._num_indexed)
+        for word in islice(self.vocab, self._num_indexed, None):
+            for deleted in self._get_deletes(word):
+                self._deletes.setdefault(deleted, []).append(word)
+        self._num_indexed = num_words
+
+    def _get_index_key(self) -> str:
+        hasher = Hasher()
+        hasher.update_bytes("\n".join(self.vocab).encode())
+        return hasher.hexdigest()
+
+    def save_index(self, folder_path: str) -> None:
+        """Save the (up to date) deletion index.
+
+        Args:
+            folder_path (str): The folder to save the index in.
+        """
+        self.update_index()
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, self.INDEX_FILE), 'wb') as f:
+            pickle.dump(self._deletes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(folder_path, self.INDEX_INFO_FILE), 'w') as f:
+            json.dump({'key': self._get_index_key(),
+                       'num_indexed': self._num_indexed}, f)
+
+    def set_index_folder(self, folder_path: str) -> None:
+        """Set the folder to load the saved deletion index from.
+
+        The index is only loaded upon first use (if it still matches the
+        vocab by then).
+
+        Args:
+            folder_path (str): The folder the index was saved in.
+        """
+        self._index_folder = folder_path
+
+    def load_index(self, folder_path: str) -> bool:
+        """Load the deletion index if it matches the vocab.
+
+        Args:
+            folder_path (str): The folder the index was saved in.
+
+        Returns:
+            bool: Whether the index was loaded.
+        """
+        info_path = os.path.join(folder_path, self.INDEX_INFO_FILE)
+        index_path = os.path.join(folder_path, self.INDEX_FILE)
+        if not os.path.exists(info_path) or not os.path.exists(index_path):
+            return False
+        with open(info_path) as f:
+            info = json.load(f)
+        if info['key'] != self._get_index_key():
+            logger.info("The vocab has changed since the spell checking "
+                        "index was saved - it will be rebuilt upon use")
+            return False
+        with open(index_path, 'rb') as f:
+            self._deletes = pickle.load(f)
+        self._num_indexed = info['num_indexed']
+        return True
 
     def known(self, words: Iterable[str]) -> set[str]:
         """The subset of `words` that appear in the dictionary of WORDS.
@@ -124,10 +291,7 @@ class BasicSpellChecker:
     @classmethod
     def raw_edits1(cls, word: str, use_diacritics: bool = False,
                    return_ordered: bool = False) -> Union[set[str], list[str]]:
-        letters = 'abcdefghijklmnopqrstuvwxyz'
-
-        if use_diacritics:
-            letters += 'àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿ'
+        letters = cls._get_letters(use_diacritics)
 
         splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
         deletes: list[str] = []
@@ -171,8 +335,19 @@ class BasicSpellChecker:
         raise ValueError("No implementation")
 
 
-class TokenNormalizer(AbstractCoreComponent):
-    """Will normalize all tokens in a spacy document.    """
+class TokenNormalizer(AbstractCoreComponent, AbstractManualSerialisable):
+    """Will normalize all tokens in a spacy document.
+
+    The normalized forms are cached across documents (see
+    `config.preprocessing.normalizing_cache_size`), as are the normalized
+    forms of the spelling fixes. The caches are cleared when the relevant
+    config or the known words (token counts) change. Their stats can be
+    seen with `get_cache_stats`.
+
+    The index of the spell checker is saved along with the model if
+    spell checking is enabled and `config.general.save_spell_check_index`
+    is set. It is then loaded upon the first spelling fix.
+    """
     name = 'token_normalizer'
 
     # Override
@@ -182,48 +357,125 @@ class TokenNormalizer(AbstractCoreComponent):
         self.config = config
         self.spell_checker = BasicSpellChecker(cdb_vocab, config, data_vocab)
         self.nlp = nlp
+        cache_size = self.config.preprocessing.normalizing_cache_size
+        # NOTE: (lower, tag, lemma, is_punct) -> (norm, to_skip)
+        self._norm_cache: LRUCache[
+            tuple[str, Optional[str], str, bool], tuple[str, bool]
+        ] = LRUCache(cache_size)
+        # NOTE: fix -> (lower, lemma)
+        self._fix_cache: LRUCache[str, tuple[str, str]] = LRUCache(
+            cache_size)
+        self._cache_state: Optional[tuple] = None
 
     def get_type(self) -> CoreComponentType:
         return CoreComponentType.token_normalizing
 
+    def get_cache_stats(self) -> dict[str, dict]:
+        """Get the stats of the normalizing and spelling fix caches.
+
+        Returns:
+            dict[str, dict]: The stats (size, hits, misses, hit rate) of
+                the normalized token cache ('norm') and the spelling fix
+                cache ('fix').
+        """
+        return {
+            'norm': self._norm_cache.get_stats(),
+            'fix': self._fix_cache.get_stats(),
+        }
+
+    def _check_cache_state(self) -> None:
+        cnf = self.config
+        # NOTE: the known words only ever get added to
+        state = (len(self.spell_checker.vocab), cnf.general.spell_check,
+                 cnf.general.spell_check_deep, cnf.general.diacritics,
+                 cnf.general.spell_check_len_limit,
+                 cnf.preprocessing.min_len_normalize,
+                 frozenset(cnf.preprocessing.do_not_normalize))
+        if state != self._cache_state:
+            self._norm_cache.clear()
+            self._cache_state = state
+
     # Override
     def __call__(self, doc: MutableDocument):
+        self._check_cache_state()
         # avoid accessing all these in loop
         spell_check_limit = self.config.general.spell_check_len_limit
         min_len_normalizer = self.config.preprocessing.min_len_normalize
         do_not_normalize = self.config.preprocessing.do_not_normalize
         perform_spell_check = self.config.general.spell_check
+        norm_cache = self._norm_cache
         for token in doc:
-            if len(token.base.lower) < min_len_normalizer:
-                token.norm = token.base.lower
-            elif (do_not_normalize and
-                    token.tag is not None and
-                    token.tag in do_not_normalize):
-                token.norm = token.base.lower
-            elif token.lemma == '-PRON-':
-                token.norm = token.lemma
+            key = (token.base.lower, token.tag, token.lemma,
+                   token.is_punctuation)
+            cached = norm_cache.get(key)
+            if cached is None:
+                cached = self._normalize(
+                    token, spell_check_limit, min_len_normalizer,
+                    do_not_normalize, perform_spell_check)
+                norm_cache.set(key, cached)
+            token.norm, to_skip = cached
+            if to_skip:
                 token.to_skip = True
-            else:
-                token.norm = token.lemma.lower()
-
-            if perform_spell_check:
-                # Fix the token if necessary
-                if (len(token.base.text) >= spell_check_limit and
-                        not token.is_punctuation and self.spell_checker and
-                        token.base.lower not in self.spell_checker and
-                        not CONTAINS_NUMBER.search(token.base.lower)):
-                    fix = self.spell_checker.fix(token.base.lower)
-                    if fix is not None:
-                        tmp = self.nlp(fix)[0]
-                        if len(token.base.lower) < min_len_normalizer:
-                            token.norm = tmp.base.lower
-                        else:
-                            token.norm = tmp.lemma.lower()
         return doc
 
+    def _normalize(self, token: MutableToken, spell_check_limit: int,
+                   min_len_normalizer: int, do_not_normalize: set[str],
+                   perform_spell_check: bool) -> tuple[str, bool]:
+        to_skip = False
+        if len(token.base.lower) < min_len_normalizer:
+            norm = token.base.lower
+        elif (do_not_normalize and
+                token.tag is not None and
+                token.tag in do_not_normalize):
+            norm = token.base.lower
+        elif token.lemma == '-PRON-':
+            norm = token.lemma
+            to_skip = True
+        else:
+            norm = token.lemma.lower()
+
+        if perform_spell_check:
+            # Fix the token if necessary
+            if (len(token.base.text) >= spell_check_limit and
+                    not token.is_punctuation and self.spell_checker and
+                    token.base.lower not in self.spell_checker and
+                    not CONTAINS_NUMBER.search(token.base.lower)):
+                fix = self.spell_checker.fix(token.base.lower)
+                if fix is not None:
+                    fixed_lower, fixed_lemma = self._normalize_fix(fix)
+                    if len(token.base.lower) < min_len_normalizer:
+                        norm = fixed_lower
+                    else:
+                        norm = fixed_lemma
+        return norm, to_skip
+
+    def _normalize_fix(self, fix: str) -> tuple[str, str]:
+        cached = self._fix_cache.get(fix)
+        if cached is None:
+            tmp = self.nlp(fix)[0]
+            cached = (tmp.base.lower, tmp.lemma.lower())
+            self._fix_cache.set(fix, cached)
+        return cached
+
     @classmethod
     def create_new_component(
             cls, cnf: ComponentConfig, tokenizer: BaseTokenizer,
             cdb: CDB, vocab: Vocab, model_load_path: Optional[str]
             ) -> 'TokenNormalizer':
         return cls(tokenizer, cdb.config, cdb.token_counts, vocab)
+
+    # for manual serialisability
+
+    def serialise_to(self, folder_path: str) -> None:
+        os.makedirs(folder_path, exist_ok=True)
+        cnf = self.config.general
+        if cnf.spell_check and cnf.save_spell_check_index:
+            self.spell_checker.save_index(folder_path)
+
+    @classmethod
+    def deserialise_from(cls, folder_path: str, **init_kwargs
+                         ) -> 'TokenNormalizer':
+        normalizer = cls.create_new_component(**init_kwargs)
+        # NOTE: the (potentially large) index is only loaded upon first use
+        normalizer.spell_checker.set_index_folder(folder_path)
+        return normalizer
@@ -3,42 +3,86 @@ import re
 
 from medcat.config.config import Preprocessing
 from medcat.components.types import CoreComponentType, AbstractCoreComponent
-from medcat.tokenizing.tokens import MutableDocument
+from medcat.tokenizing.tokens import MutableDocument, MutableToken
 from medcat.tokenizing.tokenizers import BaseTokenizer
 from medcat.cdb import CDB
 from medcat.vocab import Vocab
 from medcat.config.config import ComponentConfig
 
 
+# NOTE: the words to skip without any of these are matched literally
+_REGEX_SPECIAL_CHARS = set('.^$*+?{}[]\\|()')
+
+
 class TagAndSkipTagger(AbstractCoreComponent):
+    """Tags the punctuation and marks the tokens to skip.
+
+    The results only depend on the text of the token, so they are memoised
+    across documents (see `config.preprocessing.tagging_cache_size`).
+    The memo is cleared when the relevant config changes.
+    """
     name = 'tag-and-skip-tagger'
 
     def __init__(self, preprocessing: Preprocessing) -> None:
-        self.word_skipper = re.compile('^({})$'.format(
-            '|'.join(preprocessing.words_to_skip)))
+        self.skip_words = {word for word in preprocessing.words_to_skip
+                           if not _REGEX_SPECIAL_CHARS.intersection(word)}
+        skip_patterns = set(preprocessing.words_to_skip) - self.skip_words
+        self.word_skipper = (re.compile('^({})$'.format(
+            '|'.join(skip_patterns))) if skip_patterns else None)
         # Very aggressive punct checker, input will be lowercased
         self.punct_checker = re.compile(r'[^a-z0-9]+')
         self.cnf_p = preprocessing
+        # NOTE: text -> (is_punctuation, to_skip)
+        #       a plain dict (rather than an LRU cache) since this is looked
+        #       up for every token and it is just cleared once full
+        self._memo: dict[str, tuple[bool, bool]] = {}
+        self._memo_state: Optional[tuple] = None
 
     def get_type(self) -> CoreComponentType:
         return CoreComponentType.tagging
 
+    def _check_memo_state(self) -> None:
+        state = (frozenset(self.cnf_p.keep_punct), self.cnf_p.skip_stopwords)
+        if state != self._memo_state:
+            self._memo.clear()
+            self._memo_state = state
+
+    def _tag(self, token: MutableToken) -> tuple[bool, bool]:
+        lower = token.base.lower
+        if (self.punct_checker.match(lower) and
+                token.base.text not in self.cnf_p.keep_punct):
+            # There can't be punct in a token if it also has text
+            return True, True
+        elif lower in self.skip_words or (
+                self.word_skipper is not None and
+                self.word_skipper.match(lower)):
+            # Skip if specific strings
+            return False, True
+        elif self.cnf_p.skip_stopwords and token.base.is_stop:
+            return False, True
+        return False, False
+
     def __call__(self, doc: MutableDocument) -> MutableDocument:
+        self._check_memo_state()
+        memo = self._memo
+        max_size = self.cnf_p.tagging_cache_size
         for token in doc:
-            if (self.punct_checker.match(token.base.lower) and
-                    token.base.text not in self.cnf_p.keep_punct):
-                # There can't be punct in a token if it also has text
+            text = token.base.text
+            tags = memo.get(text)
+            if tags is None:
+                tags = self._tag(token)
+                if max_size > 0:
+                    if len(memo) >= max_size:
+                        memo.clear()
+                    memo[text] = tags
+            is_punct, to_skip = tags
+            if is_punct:
                 token.is_punctuation = True
-                token.to_skip = True
-            elif self.word_skipper.match(token.base.lower):
-                # Skip if specific strings
-                token.to_skip = True
-            elif self.cnf_p.skip_stopwords and token.base.is_stop:
+            if to_skip:
                 token.to_skip = True
 
         return doc
 
-
     @classmethod
     def create_new_component(
             cls, cnf: ComponentConfig, tokenizer: BaseTokenizer,
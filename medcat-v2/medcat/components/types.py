@@ -62,6 +62,29 @@ class BaseComponent(Protocol):
         pass
 
 
+@runtime_checkable
+class BatchableComponent(Protocol):
+    """A component that can process a batch of documents at once.
+
+    This is optional for components. Components that do not implement
+    this are simply run over each document in turn.
+    """
+
+    def pipe(self, docs: list[MutableDocument]) -> list[MutableDocument]:
+        """Process a batch of documents.
+
+        The result should be the same as running the component over each
+        of the documents separately.
+
+        Args:
+            docs (list[MutableDocument]): The documents to process.
+
+        Returns:
+            list[MutableDocument]: The processed documents (in order).
+        """
+        pass
+
+
 @runtime_checkable
 class CoreComponent(BaseComponent, Protocol):
 
@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field, ValidationError
 from medcat import __version__ as medcat_version
 from medcat.utils.defaults import workers
 from medcat.utils.envsnapshot import Environment, get_environment_info
+from medcat.utils.envsnapshot import get_current_environment
 from medcat.utils.iterutils import callback_iterator
 from medcat.utils.defaults import (
     avoid_legacy_conversion, doing_legacy_conversion_message,
@@ -235,6 +236,11 @@ class General(SerialisableBaseModel):
     this can slow down things drastically."""
     spell_check_len_limit: int = 7
     """Spelling will not be checked for words with length less than this"""
+    save_spell_check_index: bool = False
+    """Should the (deletion) index of the spell checker be saved along with
+    the model. This saves building it upon first use after the model is
+    loaded, but it is (much) larger than the token counts themselves.
+    If saved, it is only loaded upon first use."""
     show_nested_entities: bool = False
     """If set to True functions like get_entities and get_json will return
     nested_entities and overlaps"""
@@ -243,6 +249,11 @@ class General(SerialisableBaseModel):
     (means unlink a name from all concepts, not just the one in question)"""
     workers: int = workers()
     """Number of workers used by a parallelizable pipeline component"""
+    component_load_workers: int = 1
+    """Number of threads used to load (or create) the pipeline components
+    and addons. If more than 1, they are loaded concurrently. This can
+    speed up loading model packs with multiple (e.g MetaCAT) addons since
+    the time is mostly spent on file IO and torch deserialisation."""
     make_pretty_labels: Optional[str] = None
     """Should the labels of entities (shown in displacy) be pretty
     or just 'concept'. Slows down the annotation pipeline
@@ -257,6 +268,12 @@ class General(SerialisableBaseModel):
 
     NOTE: While using a simple hash is faster at save time, it is less
     reliable due to not taking into account all the details of the changes."""
+    frozen_cdb_cache_size: int = 10_000
+    """The maximum number of CUI infos (and, separately, name infos) of a
+    frozen CDB to keep put together in memory. Use 0 to disable the caches.
+
+    NB! For these changes to take effect, the CDB would need to be reloaded.
+    """
 
     class Config:
         extra = 'allow'
@@ -406,6 +423,15 @@ class Preprocessing(SerialisableBaseModel):
 
     NB! For these changes to take effect, the pipe would need to be recreated.
     """
+    tagging_cache_size: int = 100_000
+    """The maximum number of token texts to memoise the tagging (punctuation
+    and skipping) of across documents. Use 0 to disable the memo."""
+    normalizing_cache_size: int = 100_000
+    """The maximum number of normalized tokens (and, separately, spelling
+    fixes) to cache across documents. Use 0 to disable the caches.
+
+    NB! For these changes to take effect, the pipe would need to be recreated.
+    """
 
 
 class CDBMaker(SerialisableBaseModel):
@@ -442,6 +468,12 @@ class Ner(ComponentConfig):
     try_reverse_word_order: bool = False
     """Try reverse word order for short concepts (2 words max),
     e.g. heart disease -> disease heart"""
+    automaton_rebuild_interval: int = 0
+    """The number of documents after which the automaton of the dictionary
+    based NER is rebuilt once the names in the CDB have changed. The default
+    (0) rebuilds it upon the next document. A larger interval allows
+    multiple changes (e.g during training or bulk edits) to be batched into
+    one rebuild, but newly added names are missed until then."""
     custom_cnf: Optional[Any] = None
     """The custom config for the component."""
 
@@ -491,7 +523,7 @@ class ModelMeta(SerialisableBaseModel):
     unsup_trained: list[TrainingDescriptor] = []  # TODO - implement
     sup_trained: list[TrainingDescriptor] = []  # TODO - implement
     medcat_version: str = ''
-    saved_environ: Environment = Field(default_factory=get_environment_info)
+    saved_environ: Environment = Field(default_factory=get_current_environment)
 
     def mark_saved_now(self):
         self.last_saved = datetime.now()
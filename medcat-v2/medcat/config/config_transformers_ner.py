@@ -14,6 +14,8 @@ class General(SerialisableBaseModel):
     """Should provide a basic description of this MetaCAT model"""
     pipe_batch_size_in_chars: int = 20000000
     """How many characters are piped at once into the meta_cat class"""
+    pipe_batch_size: int = 8
+    """How many texts the HF pipeline runs through the model at once"""
     ner_aggregation_strategy: str = 'simple'
     """Agg strategy for HF pipeline for NER"""
     chunking_overlap_window: Optional[int] = 5
@@ -1,12 +1,18 @@
-from typing import Optional, Iterable, Union
+from typing import Optional, Iterable, Iterator, Union, Callable, TypeVar
+from typing import Any, cast
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import itertools
 import logging
+import time
 import os
 
 from medcat.utils.defaults import COMPONENTS_FOLDER
-from medcat.tokenizing.tokenizers import BaseTokenizer, create_tokenizer
+from medcat.tokenizing.tokenizers import (
+    BaseTokenizer, BatchableTokenizer, create_tokenizer)
 from medcat.components.types import (
     CoreComponentType, create_core_component, CoreComponent, BaseComponent,
-    AbstractCoreComponent)
+    AbstractCoreComponent, BatchableComponent)
 from medcat.components.addons.addons import AddonComponent, create_addon
 from medcat.tokenizing.tokens import (MutableDocument, MutableEntity,
                                       MutableToken)
@@ -17,13 +23,15 @@ from medcat.vocab import Vocab
 from medcat.cdb import CDB
 from medcat.config import Config
 from medcat.config.config import ComponentConfig
-from medcat.config.config_meta_cat import ConfigMetaCAT
-from medcat.config.config_rel_cat import ConfigRelCAT
+from medcat.pipeline.profiling import PipelineProfile, TOKENIZER_NAME
 
 
 logger = logging.getLogger(__name__)
 
 
+T = TypeVar("T")
+
+
 class DelegatingTokenizer(BaseTokenizer):
     """A delegating tokenizer.
 
@@ -79,10 +87,17 @@ class Pipeline:
         #       but it should be non-None otherwise
         self.vocab: Vocab = vocab  # type: ignore
         self.config = self.cdb.config
+        # NOTE: the wall clock time (in seconds) it took to load or create
+        #       the tokenizer and each component / addon
+        self.load_times: dict[str, float] = {}
+        start = time.perf_counter()
         self._tokenizer = self._init_tokenizer()
+        self.load_times[TOKENIZER_NAME] = time.perf_counter() - start
         self._components: list[CoreComponent] = []
         self._addons: list[AddonComponent] = []
         self._init_components(model_load_path, old_pipe, addon_config_dict)
+        # NOTE: None unless profiling is enabled
+        self.profile: Optional[PipelineProfile] = None
 
     @property
     def tokenizer(self) -> BaseTokenizer:
@@ -177,6 +192,9 @@ class Pipeline:
     def _attempt_merge(
             cls, addon_cnf: ComponentConfig,
             addon_config_dict: dict[str, dict]) -> None:
+        # NOTE: imported here to avoid importing the addon configs
+        #       upon `import medcat` when they are not used
+        from medcat.config.config_meta_cat import ConfigMetaCAT
         for name, config_dict in addon_config_dict.items():
             if not name.startswith(addon_cnf.comp_name):
                 continue
@@ -215,27 +233,55 @@ class Pipeline:
         (loaded_core_component_paths,
          loaded_addon_component_paths) = self._get_loaded_components_paths(
              model_load_path)
+        # NOTE: the (potentially slow) loading itself is deferred so that
+        #       the components and addons can be loaded concurrently
+        core_loaders: list[Callable[[], CoreComponent]] = []
         for cct_name in self.config.components.comp_order:
             if cct_name in loaded_core_component_paths:
-                comp = self._load_saved_core_component(
-                    cct_name, loaded_core_component_paths.pop(cct_name))
+                core_loaders.append(partial(
+                    self._load_saved_core_component,
+                    cct_name, loaded_core_component_paths.pop(cct_name)))
             else:
-                comp = self._init_component(
-                    CoreComponentType[cct_name], model_load_path)
-            self._components.append(comp)
+                core_loaders.append(partial(
+                    self._init_component, CoreComponentType[cct_name],
+                    model_load_path))
+        addon_loaders: list[Callable[[], AddonComponent]] = []
         for addon_cnf in self.config.components.addons:
             if addon_config_dict:
                 self._attempt_merge(addon_cnf, addon_config_dict)
-            addon = self._init_addon(
-                addon_cnf, loaded_addon_component_paths, old_pipe)
+            addon_loaders.append(self._get_addon_loader(
+                addon_cnf, loaded_addon_component_paths, old_pipe))
+        comps = self._load_all([*core_loaders, *addon_loaders])
+        self._components.extend(
+            cast(list[CoreComponent], comps[:len(core_loaders)]))
+        for addon in cast(list[AddonComponent], comps[len(core_loaders):]):
             # mark as not dirty at loat / init time
             addon.config.mark_clean()
             self._addons.append(addon)
 
+    def _load_all(self, loaders: list[Callable[[], BaseComponent]]
+                  ) -> list[BaseComponent]:
+        num_workers = self.config.general.component_load_workers
+        start = time.perf_counter()
+        if num_workers > 1 and len(loaders) > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                results = list(executor.map(_timed, loaders))
+        else:
+            results = [_timed(loader) for loader in loaders]
+        for comp, load_time in results:
+            logger.info("Loaded component %s in %.3f s",
+                        comp.full_name, load_time)
+            self.load_times[str(comp.full_name)] = load_time
+        logger.info("Loaded %d components in %.3f s (with %d worker(s))",
+                    len(loaders), time.perf_counter() - start, num_workers)
+        return [comp for comp, _ in results]
+
     def _get_loaded_addon_path(
             self, cnf: ComponentConfig,
             loaded_addon_component_paths: dict[tuple[str, str], str]
             ) -> Optional[str]:
+        from medcat.config.config_meta_cat import ConfigMetaCAT
+        from medcat.config.config_rel_cat import ConfigRelCAT
         for key, folder in list(loaded_addon_component_paths.items()):
             comp_name, subname = key
             if comp_name != cnf.comp_name:
@@ -270,11 +316,11 @@ class Pipeline:
                 f"{type(addon).__name__}")
         return addon
 
-    def _init_addon(
+    def _get_addon_loader(
             self, cnf: ComponentConfig,
             loaded_addon_component_paths: dict[tuple[str, str], str],
             old_pipe: Optional['Pipeline'],
-            ) -> AddonComponent:
+            ) -> Callable[[], AddonComponent]:
         if old_pipe:
             # If we are recreating a pipe and the addon configs haven't
             # changed then we can reuse existing addon instances.
@@ -283,7 +329,7 @@ class Pipeline:
             # are or they may have changed after loading
             for old_addon in old_pipe._addons:
                 if old_addon.config is cnf and not cnf.is_dirty:
-                    return old_addon
+                    return partial(_identity, old_addon)
                 elif old_addon.config is cnf and cnf.is_dirty:
                     logger.warning(
                         "Not reusing existing addon '%s' because its config "
@@ -291,10 +337,10 @@ class Pipeline:
         loaded_path = self._get_loaded_addon_path(
             cnf, loaded_addon_component_paths)
         if loaded_path:
-            return self._load_addon(cnf, loaded_path)
-        return create_addon(
-            cnf.comp_name, cnf=cnf, tokenizer=self.tokenizer, cdb=self.cdb,
-            vocab=self.vocab, model_load_path=None)
+            return partial(self._load_addon, cnf, loaded_path)
+        return partial(
+            create_addon, cnf.comp_name, cnf=cnf, tokenizer=self.tokenizer,
+            cdb=self.cdb, vocab=self.vocab, model_load_path=None)
 
     def get_doc(self, text: str) -> MutableDocument:
         """Get the document for this text.
@@ -307,15 +353,94 @@ class Pipeline:
         Returns:
             MutableDocument: The resulting document.
         """
-        doc = self._tokenizer(text)
+        doc = self._run(TOKENIZER_NAME, self._tokenizer, text)
         for comp in self._components:
             logger.info("Running component %s for %d of text (%s)",
                         comp.full_name, len(text), id(text))
-            doc = comp(doc)
+            doc = self._run(str(comp.full_name), comp, doc)
         for addon in self._addons:
-            doc = addon(doc)
+            doc = self._run(addon.full_name, addon, doc)
         return doc
 
+    def _run(self, name: str, func: Callable[[Any], T], arg: Any) -> T:
+        # NOTE: this is a no-op wrapper unless profiling is enabled
+        profile = self.profile
+        if profile is None:
+            return func(arg)
+        start = profile.start()
+        out = func(arg)
+        profile.record(name, start,
+                       out if isinstance(out, list) else [out])  # type: ignore
+        return out
+
+    def enable_profiling(self, reset: bool = True) -> PipelineProfile:
+        """Enable profiling of the tokenizer and components.
+
+        While enabled, the (cumulative) wall clock and CPU time, the number
+        of calls, and the number of documents, tokens and entities are
+        recorded for each component.
+
+        Args:
+            reset (bool): Whether to start with a new profile rather than
+                carry on with the existing one (if any). Defaults to True.
+
+        Returns:
+            PipelineProfile: The profile that will be recorded into.
+        """
+        if reset or self.profile is None:
+            self.profile = PipelineProfile()
+        return self.profile
+
+    def disable_profiling(self) -> Optional[PipelineProfile]:
+        """Disable profiling.
+
+        Returns:
+            Optional[PipelineProfile]: The profile recorded (if any).
+        """
+        profile, self.profile = self.profile, None
+        return profile
+
+    def pipe(self, texts: Iterable[str], batch_size: int = 32
+             ) -> Iterator[MutableDocument]:
+        """Get the documents for a number of texts.
+
+        The texts are processed in batches. Each batch is run through the
+        tokenizer and then each of the components and addons in turn.
+        Tokenizers and components that are able to process a batch of
+        documents at once (i.e implement `pipe`) are given the entire
+        batch, others are run over each document separately.
+
+        Args:
+            texts (Iterable[str]): The input texts.
+            batch_size (int): The number of texts in a batch.
+                Defaults to 32.
+
+        Raises:
+            ValueError: If the batch size is not positive.
+
+        Yields:
+            Iterator[MutableDocument]: The resulting documents (in order).
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size needs to be positive: {batch_size}")
+        text_iter = iter(texts)
+        while batch := list(itertools.islice(text_iter, batch_size)):
+            yield from self._get_docs(batch)
+
+    def _get_docs(self, texts: list[str]) -> list[MutableDocument]:
+        if isinstance(self._tokenizer, BatchableTokenizer):
+            docs = self._run(TOKENIZER_NAME, self._tokenizer.pipe, texts)
+        else:
+            docs = self._run(TOKENIZER_NAME, _per_doc(self._tokenizer), texts)
+        for comp in self.iter_all_components():
+            logger.info("Running component %s for a batch of %d texts",
+                        comp.full_name, len(texts))
+            if isinstance(comp, BatchableComponent):
+                docs = self._run(str(comp.full_name), comp.pipe, docs)
+            else:
+                docs = self._run(str(comp.full_name), _per_doc(comp), docs)
+        return docs
+
     def entity_from_tokens(self, tokens: list[MutableToken]) -> MutableEntity:
         """Get the entity from the list of tokens.
 
@@ -388,6 +513,20 @@ class Pipeline:
         yield from self._addons
 
 
+def _identity(obj: T) -> T:
+    return obj
+
+
+def _timed(loader: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    out = loader()
+    return out, time.perf_counter() - start
+
+
+def _per_doc(func: Callable) -> Callable[[list], list[MutableDocument]]:
+    return lambda items: [func(item) for item in items]
+
+
 class IncorrectArgumentsForTokenizer(TypeError):
 
     def __init__(self, provider: str):
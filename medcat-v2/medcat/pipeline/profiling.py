@@ -0,0 +1,126 @@
+from typing import Union, Iterator
+from dataclasses import dataclass, asdict
+import time
+
+from medcat.tokenizing.tokens import MutableDocument
+
+
+TOKENIZER_NAME = "tokenizer"
+
+
+@dataclass
+class ComponentProfile:
+    """The cumulative profile of a single pipeline component.
+
+    A call is a single invocation of the component. That is either
+    one document or (for components that support it) a batch of them.
+    """
+    calls: int = 0
+    """The number of times the component was called."""
+    docs: int = 0
+    """The number of documents processed."""
+    wall_time: float = 0.0
+    """The total wall clock time (in seconds) spent in the component."""
+    cpu_time: float = 0.0
+    """The total CPU time (in seconds) of the process spent in the
+    component. This includes the time of any (e.g torch) threads."""
+    tokens: int = 0
+    """The number of tokens in the documents processed."""
+    entities: int = 0
+    """The number of entities in the documents after the component was
+    run. These are the linked entities if there are any and the NER
+    entities otherwise."""
+
+    def merge(self, other: 'ComponentProfile') -> None:
+        """Add the numbers from another profile to this one.
+
+        Args:
+            other (ComponentProfile): The other profile.
+        """
+        self.calls += other.calls
+        self.docs += other.docs
+        self.wall_time += other.wall_time
+        self.cpu_time += other.cpu_time
+        self.tokens += other.tokens
+        self.entities += other.entities
+
+
+class PipelineProfile:
+    """The cumulative profile of the pipeline components.
+
+    The profile is keyed by the full name of each component (and
+    `tokenizer` for the tokenizer). Profiles collected separately (e.g
+    in different worker processes) can be combined with `merge`.
+    """
+
+    def __init__(self) -> None:
+        self.components: dict[str, ComponentProfile] = {}
+
+    @staticmethod
+    def start() -> tuple[float, float]:
+        """Get the start times for `record`.
+
+        Returns:
+            tuple[float, float]: The wall clock and CPU times.
+        """
+        return time.perf_counter(), time.process_time()
+
+    def record(self, name: str, start: tuple[float, float],
+               docs: list[MutableDocument]) -> None:
+        """Record a call of a component.
+
+        Args:
+            name (str): The name of the component.
+            start (tuple[float, float]): The times from `start`.
+            docs (list[MutableDocument]): The documents output by the
+                component.
+        """
+        wall_time = time.perf_counter() - start[0]
+        cpu_time = time.process_time() - start[1]
+        if name not in self.components:
+            self.components[name] = ComponentProfile()
+        comp_profile = self.components[name]
+        comp_profile.calls += 1
+        comp_profile.docs += len(docs)
+        comp_profile.wall_time += wall_time
+        comp_profile.cpu_time += cpu_time
+        for doc in docs:
+            comp_profile.tokens += len(doc)
+            comp_profile.entities += len(doc.linked_ents or doc.ner_ents)
+
+    def merge(self, other: 'PipelineProfile') -> None:
+        """Add the numbers from another profile to this one.
+
+        Args:
+            other (PipelineProfile): The other profile.
+        """
+        for name, comp_profile in other.components.items():
+            if name not in self.components:
+                self.components[name] = ComponentProfile()
+            self.components[name].merge(comp_profile)
+
+    def __iter__(self) -> Iterator[tuple[str, ComponentProfile]]:
+        return iter(self.components.items())
+
+    def to_dict(self) -> dict[str, dict[str, Union[int, float]]]:
+        """Get the profile as a (JSON serialisable) dict.
+
+        Returns:
+            dict[str, dict[str, Union[int, float]]]: The numbers for each
+                component.
+        """
+        return {name: asdict(comp_profile)
+                for name, comp_profile in self.components.items()}
+
+    def __str__(self) -> str:
+        total_wall = sum(cp.wall_time for cp in self.components.values())
+        lines = [f"{'component':40s} {'calls':>8s} {'docs':>8s} "
+                 f"{'wall (s)':>10s} {'cpu (s)':>10s} {'wall %':>7s} "
+                 f"{'tokens':>10s} {'entities':>10s}"]
+        for name, cp in self.components.items():
+            perc = 100 * cp.wall_time / total_wall if total_wall else 0.0
+            lines.append(
+                f"{name:40s} {cp.calls:8d} {cp.docs:8d} "
+                f"{cp.wall_time:10.3f} {cp.cpu_time:10.3f} {perc:7.1f} "
+                f"{cp.tokens:10d} {cp.entities:10d}")
+        return "\n".join(lines)
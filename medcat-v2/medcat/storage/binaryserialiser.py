@@ -0,0 +1,153 @@
+"""The binary serialiser.
+
+The raw attributes are pickled, but the (numeric) numpy arrays are kept
+out of the pickle and written into `.npy` files next to it instead. The
+arrays of the same dtype and shape (e.g the context vectors of the
+concepts) are stacked into a single file.
+
+Upon load, the `.npy` files are memory mapped (copy-on-write). So the
+arrays are only read from disk when (and if) they are accessed, but they
+can still be modified in memory (e.g during training) without changing
+the files on disk. Furthermore, the independent parts (e.g the CDB and
+the Vocab of a model pack) are loaded in parallel.
+"""
+from typing import Any, Optional, IO
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+
+import numpy as np
+
+from medcat.storage.serialisables import Serialisable
+from medcat.storage.serialisers import Serialiser, AvailableSerialisers
+from medcat.utils.legacy.v2_beta import RemappingUnpickler
+
+
+class NpyArrays:
+    """The numpy arrays that are kept in `.npy` files.
+
+    When saving, the arrays are grouped by their dtype and shape and each
+    array is identified by its file (number) and the row within it. When
+    loading, the files are memory mapped upon first use.
+
+    Args:
+        raw_file (str): The raw file the arrays belong to.
+    """
+
+    def __init__(self, raw_file: str) -> None:
+        self.raw_file = raw_file
+        self._group_inds: dict[tuple[str, tuple[int, ...]], int] = {}
+        self._groups: list[list[np.ndarray]] = []
+        self._loaded: dict[int, np.ndarray] = {}
+
+    def get_array_file(self, file_num: int) -> str:
+        return f"{self.raw_file}.{file_num}.npy"
+
+    def add(self, arr: np.ndarray) -> tuple[int, int]:
+        """Add an array to be written.
+
+        Args:
+            arr (np.ndarray): The array.
+
+        Returns:
+            tuple[int, int]: The file number and the row of the array.
+        """
+        key = (arr.dtype.str, arr.shape)
+        if key not in self._group_inds:
+            self._group_inds[key] = len(self._groups)
+            self._groups.append([])
+        file_num = self._group_inds[key]
+        self._groups[file_num].append(arr)
+        return file_num, len(self._groups[file_num]) - 1
+
+    def write(self) -> None:
+        """Write the added arrays into their files."""
+        for file_num, arrays in enumerate(self._groups):
+            # NOTE: writing row by row to avoid a (stacked) copy in memory
+            out = np.lib.format.open_memmap(
+                self.get_array_file(file_num), mode='w+',
+                dtype=arrays[0].dtype, shape=(len(arrays), *arrays[0].shape))
+            for row, arr in enumerate(arrays):
+                out[row] = arr
+            out.flush()
+            del out
+
+    def get(self, file_num: int, row: int) -> np.ndarray:
+        """Get a (lazily loaded) array.
+
+        Args:
+            file_num (int): The file number.
+            row (int): The row within the file.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        if file_num not in self._loaded:
+            # NOTE: a regular ndarray (rather than np.memmap) view since
+            #       indexing the latter is considerably slower
+            self._loaded[file_num] = np.asarray(np.load(
+                self.get_array_file(file_num), mmap_mode='c'))
+        return self._loaded[file_num][row, ...]
+
+
+class _NpyArrayPickler(pickle.Pickler):
+
+    def __init__(self, file: IO[bytes], arrays: NpyArrays) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._arrays = arrays
+
+    def persistent_id(self, obj: Any) -> Optional[tuple[int, int]]:
+        # NOTE: object arrays can't be memory mapped
+        if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+            return self._arrays.add(obj)
+        return None
+
+
+class _NpyArrayUnpickler(RemappingUnpickler):
+
+    def __init__(self, file: IO[bytes], arrays: NpyArrays) -> None:
+        super().__init__(file)
+        self._arrays = arrays
+
+    def persistent_load(self, pid: tuple[int, int]) -> np.ndarray:
+        return self._arrays.get(*pid)
+
+
+class BinarySerialiser(Serialiser):
+    """The binary (pickle and `.npy` based) serialiser.
+
+    Args:
+        max_workers (Optional[int]): The maximum number of threads used
+            to load the parts in parallel. Defaults to None (i.e the
+            default of `ThreadPoolExecutor`).
+    """
+    ser_type = AvailableSerialisers.binary
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+
+    def serialise(self, raw_parts: dict[str, Any], target_file: str) -> None:
+        arrays = NpyArrays(target_file)
+        with open(target_file, 'wb') as f:
+            _NpyArrayPickler(f, arrays).dump(raw_parts)
+        arrays.write()
+
+    def deserialise(self, target_file: str) -> dict[str, Any]:
+        with open(target_file, 'rb') as f:
+            return _NpyArrayUnpickler(f, NpyArrays(target_file)).load()
+
+    def deserialise_parts(self, part_paths: dict[str, str],
+                          ignore_folders_prefix: set[str],
+                          ignore_folders_suffix: set[str],
+                          ) -> dict[str, Serialisable]:
+        if len(part_paths) < 2:
+            return super().deserialise_parts(
+                part_paths, ignore_folders_prefix, ignore_folders_suffix)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                part_name: executor.submit(
+                    self.deserialise_all, part_path,
+                    ignore_folders_prefix=ignore_folders_prefix,
+                    ignore_folders_suffix=ignore_folders_suffix)
+                for part_name, part_path in part_paths.items()}
+            return {part_name: future.result()
+                    for part_name, future in futures.items()}
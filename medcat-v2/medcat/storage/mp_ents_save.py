@@ -1,5 +1,10 @@
-from typing import Union
+from typing import Union, Iterable, Optional, Any
+from abc import ABC, abstractmethod
+from enum import Enum, auto
+from concurrent.futures import ThreadPoolExecutor, Future
 import os
+import re
+import json
 import logging
 
 import pickle
@@ -10,51 +15,317 @@ from medcat.data.entities import Entities, OnlyCUIEntities
 logger = logging.getLogger(__name__)
 
 
-class BatchAnnotationSaver:
-    def __init__(self, save_dir: str, batches_per_save: int):
+AnnotationResult = tuple[str, Union[dict, Entities, OnlyCUIEntities]]
+
+
+class AvailableSinks(Enum):
+    """Describes the available formats for saving annotation results."""
+    pickle = auto()
+    """The `part_<num>.pickle` files along with `annotated_ids.pickle`
+    (written upon completion) and `annotated_ids.jsonl`."""
+    jsonl = auto()
+    """A single append-only `annotations.jsonl` file."""
+    parquet = auto()
+    """The `part_<num>.parquet` files. Requires the `parquet` extra."""
+
+
+class AnnotationSink(ABC):
+    """Writes annotation results to disk.
+
+    The sink also keeps track of the IDs of the documents it has written
+    so that an interrupted run can be resumed.
+
+    Args:
+        save_dir (str): The directory to save the results in.
+    """
+
+    def __init__(self, save_dir: str):
         self.save_dir = save_dir
-        self.batches_per_save = batches_per_save
-        self._batch_cache: list[list[
-            tuple[str, Union[dict, Entities, OnlyCUIEntities]]]] = []
         os.makedirs(save_dir, exist_ok=True)
-        self.part_number = 0
+
+    @abstractmethod
+    def get_annotated_ids(self) -> set[str]:
+        """Get the IDs of the documents that have already been saved.
+
+        Returns:
+            set[str]: The IDs of the saved documents.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, results: list[AnnotationResult]) -> None:
+        """Write the results.
+
+        Args:
+            results (list[AnnotationResult]): The results in the format of
+                `(text_index, entities)`.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
+
+
+class AnnotatedIDIndex:
+    """Append-only on-disk index of the IDs of annotated documents.
+
+    The IDs are written as one JSON string per line, so recording new IDs
+    is proportional to the number of new IDs rather than all of them.
+
+    Args:
+        save_dir (str): The directory the index is kept in.
+    """
+    FILE_NAME = "annotated_ids.jsonl"
+
+    def __init__(self, save_dir: str):
+        self.path = os.path.join(save_dir, self.FILE_NAME)
+
+    def load(self) -> set[str]:
+        """Load all the IDs in the index.
+
+        Returns:
+            set[str]: The set of IDs.
+        """
+        if not os.path.exists(self.path):
+            return set()
+        doc_ids: set[str] = set()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    doc_ids.add(json.loads(line))
+                except json.JSONDecodeError:
+                    # NOTE: a partially written line from an interrupted
+                    #       run - the document will just be redone
+                    logger.warning("Ignoring malformed ID index line: %r",
+                                   line)
+        return doc_ids
+
+    def add(self, doc_ids: Iterable[str]) -> None:
+        """Add IDs to the index.
+
+        Args:
+            doc_ids (Iterable[str]): The IDs to add.
+        """
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(doc_id) + "\n" for doc_id in doc_ids)
+
+
+def _to_json_default(obj: Any) -> Any:
+    # NOTE: numpy scalars / arrays (e.g similarities) aren't JSON
+    #       serialisable as is
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serialisable")
+
+
+def result_to_json(result: Union[dict, Entities, OnlyCUIEntities]) -> str:
+    """Convert the annotation result of a document to JSON.
+
+    NOTE: The (integer) entity IDs become strings in JSON.
+
+    Args:
+        result (Union[dict, Entities, OnlyCUIEntities]): The result.
+
+    Returns:
+        str: The JSON string.
+    """
+    return json.dumps(result, default=_to_json_default)
+
+
+class PickleSink(AnnotationSink):
+    """Saves results in `part_<num>.pickle` files.
+
+    The IDs of the annotated documents are appended to an
+    `AnnotatedIDIndex` as the parts are written. Upon closing, they
+    (along with the last part number) are also written to
+    `annotated_ids.pickle` as `tuple[list[str], int]`.
+
+    Args:
+        save_dir (str): The directory to save the results in.
+    """
+    PART_FILE_PATTERN = re.compile(r"part_(\d+)\.pickle")
+
+    def __init__(self, save_dir: str):
+        super().__init__(save_dir)
         self.annotated_ids_path = os.path.join(
             save_dir, "annotated_ids.pickle")
+        self._index = AnnotatedIDIndex(save_dir)
+        self._annotated_ids = self._load_existing_ids()
+        # NOTE: continue after any parts already on disk
+        self.part_number = self._get_last_part_number() + 1
 
-    def _load_existing_ids(self) -> tuple[list[str], int]:
-        if not os.path.exists(self.annotated_ids_path):
-            return [], -1
-        with open(self.annotated_ids_path, 'rb') as f:
-            return pickle.load(f)
+    def _load_existing_ids(self) -> list[str]:
+        doc_ids: list[str] = []
+        if os.path.exists(self.annotated_ids_path):
+            with open(self.annotated_ids_path, 'rb') as f:
+                doc_ids, _ = pickle.load(f)
+        # NOTE: the index has the IDs of the parts written after the
+        #       ID file was last written (e.g if a run was interrupted)
+        known = set(doc_ids)
+        doc_ids.extend(doc_id for doc_id in self._index.load()
+                       if doc_id not in known)
+        return doc_ids
 
-    def _save_cache(self):
-        annotated_ids, prev_part_num = self._load_existing_ids()
-        if (prev_part_num + 1) != self.part_number:
-            logger.info(
-                "Found part number %d off disk. Previously %d was kept track "
-                "of in code. Updating to %d off disk.",
-                prev_part_num, self.part_number, prev_part_num)
-            self.part_number = prev_part_num
-        for batch in self._batch_cache:
-            for doc_id, _ in batch:
-                annotated_ids.append(doc_id)
-        logger.debug("Saving part %d with %d batches",
-                     self.part_number, len(self._batch_cache))
-        with open(self.annotated_ids_path, 'wb') as f:
-            pickle.dump((annotated_ids, self.part_number), f)
-        # Save batch as part_<num>.pickle
+    def _get_last_part_number(self) -> int:
+        part_nums = [int(matched.group(1))
+                     for file_name in os.listdir(self.save_dir)
+                     if (matched := self.PART_FILE_PATTERN.fullmatch(
+                         file_name))]
+        return max(part_nums, default=-1)
+
+    def get_annotated_ids(self) -> set[str]:
+        return set(self._annotated_ids)
+
+    def write(self, results: list[AnnotationResult]) -> None:
+        logger.debug("Saving part %d with %d documents",
+                     self.part_number, len(results))
+        # NOTE: the part is written before the IDs so that if the process
+        #       is interrupted, no ID is recorded without its output
         part_path = os.path.join(self.save_dir,
                                  f"part_{self.part_number}.pickle")
-        part_dict = {id: val for
-                     batch in self._batch_cache for
-                     id, val in batch}
+        part_dict = {doc_id: val for doc_id, val in results}
         with open(part_path, 'wb') as f:
             pickle.dump(part_dict, f)
-        self._batch_cache.clear()
+        new_ids = [doc_id for doc_id, _ in results]
+        self._index.add(new_ids)
+        self._annotated_ids.extend(new_ids)
         self.part_number += 1
 
-    def __call__(self, batch: list[
-            tuple[str, Union[dict, Entities, OnlyCUIEntities]]]):
+    def close(self) -> None:
+        with open(self.annotated_ids_path, 'wb') as f:
+            pickle.dump((self._annotated_ids, self.part_number - 1), f)
+
+
+class JsonlSink(AnnotationSink):
+    """Appends results to a single `annotations.jsonl` file.
+
+    Each line has a JSON object in the format of
+    `{"id": <text_index>, "result": <entities>}`. The IDs are tracked in
+    an `AnnotatedIDIndex`.
+
+    NOTE: If a run is interrupted, the last document(s) may be written
+          into the file without making it into the ID index. These would
+          then be written again upon resuming. So if duplicates are found
+          in the file, the last one should be used.
+    """
+    FILE_NAME = "annotations.jsonl"
+
+    def __init__(self, save_dir: str):
+        super().__init__(save_dir)
+        self.path = os.path.join(save_dir, self.FILE_NAME)
+        self._index = AnnotatedIDIndex(save_dir)
+
+    def get_annotated_ids(self) -> set[str]:
+        return self._index.load()
+
+    def write(self, results: list[AnnotationResult]) -> None:
+        if not results:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(
+                f'{{"id": {json.dumps(doc_id)}, '
+                f'"result": {result_to_json(result)}}}\n'
+                for doc_id, result in results)
+        self._index.add(doc_id for doc_id, _ in results)
+
+
+def get_sink(sink_type: Union[str, AvailableSinks],
+             save_dir: str) -> AnnotationSink:
+    """Get the annotation sink based on the type specified.
+
+    Args:
+        sink_type (Union[str, AvailableSinks]): The required type.
+        save_dir (str): The directory to save the results in.
+
+    Raises:
+        ValueError: If no sink is found.
+
+    Returns:
+        AnnotationSink: The appropriate sink.
+    """
+    if isinstance(sink_type, str):
+        sink_type = AvailableSinks[sink_type.lower()]
+    if sink_type is AvailableSinks.pickle:
+        return PickleSink(save_dir)
+    elif sink_type is AvailableSinks.jsonl:
+        return JsonlSink(save_dir)
+    elif sink_type is AvailableSinks.parquet:
+        from medcat.storage.parquet_sink import ParquetSink
+        return ParquetSink(save_dir)
+    raise ValueError(f"Unknown or unimplemented sink type: {sink_type}")
+
+
+class BatchAnnotationSaver:
+    """Saves batches of annotation results as they come in.
+
+    The batches are gathered and written to the sink once there's
+    `batches_per_save` of them.
+
+    Args:
+        save_dir (str): The directory to save the results in.
+        batches_per_save (int): The number of batches to write at once.
+        sink (Union[str, AvailableSinks]): The format to save in.
+            Defaults to `pickle`.
+        background (bool): Whether to write on a background thread. If so,
+            annotation can carry on while the previous results are written.
+            Defaults to False.
+    """
+
+    def __init__(self, save_dir: str, batches_per_save: int,
+                 sink: Union[str, AvailableSinks] = AvailableSinks.pickle,
+                 background: bool = False):
+        self.save_dir = save_dir
+        self.batches_per_save = batches_per_save
+        self._batch_cache: list[list[AnnotationResult]] = []
+        self.sink = get_sink(sink, save_dir)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if background:
+            # NOTE: a single thread so the writes happen in order
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="medcat-ann-saver")
+        self._pending_write: Optional[Future] = None
+
+    def get_annotated_ids(self) -> set[str]:
+        """Get the IDs of the documents that have already been saved.
+
+        Returns:
+            set[str]: The IDs of the saved documents.
+        """
+        self._wait_for_pending_write()
+        return self.sink.get_annotated_ids()
+
+    def _wait_for_pending_write(self) -> None:
+        if self._pending_write is not None:
+            # NOTE: raises if the write failed
+            self._pending_write.result()
+            self._pending_write = None
+
+    def _save_cache(self):
+        results = [res for batch in self._batch_cache for res in batch]
+        self._batch_cache = []
+        if self._executor is None:
+            self.sink.write(results)
+            return
+        # NOTE: only one write in flight at a time so that the results
+        #       waiting to be written don't pile up in memory
+        self._wait_for_pending_write()
+        self._pending_write = self._executor.submit(self.sink.write, results)
+
+    def close(self) -> None:
+        """Save the remaining results and wait for all writes to finish."""
+        try:
+            self._save_cache()
+            self._wait_for_pending_write()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self.sink.close()
+
+    def __call__(self, batch: list[AnnotationResult]):
         self._batch_cache.append(batch)
         if len(self._batch_cache) >= self.batches_per_save:
             self._save_cache()
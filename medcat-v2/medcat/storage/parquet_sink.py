@@ -0,0 +1,61 @@
+import os
+import re
+import logging
+
+from medcat.storage.mp_ents_save import (
+    AnnotationSink, AnnotatedIDIndex, AnnotationResult, result_to_json)
+from medcat.utils.import_utils import ensure_optional_extras_installed
+import medcat
+
+
+_EXTRA_NAME = "parquet"
+
+
+ensure_optional_extras_installed(medcat.__name__, _EXTRA_NAME)
+
+
+import pyarrow as pa  # noqa
+import pyarrow.parquet as pq  # noqa
+
+
+logger = logging.getLogger(__name__)
+
+
+class ParquetSink(AnnotationSink):
+    """Saves results in `part_<num>.parquet` files.
+
+    Each file has a string `id` column for the text index and a string
+    `result` column with the (JSON) entities. The IDs are tracked in an
+    `AnnotatedIDIndex`.
+    """
+    _PART_PATTERN = re.compile(r"^part_(\d+)\.parquet$")
+    _SCHEMA = pa.schema([("id", pa.string()), ("result", pa.string())])
+
+    def __init__(self, save_dir: str):
+        super().__init__(save_dir)
+        self._index = AnnotatedIDIndex(save_dir)
+        # NOTE: continue after any parts already on disk
+        part_nums = [
+            int(m.group(1)) for fn in os.listdir(save_dir)
+            if (m := self._PART_PATTERN.match(fn))]
+        self.part_number = max(part_nums, default=-1) + 1
+
+    def get_annotated_ids(self) -> set[str]:
+        return self._index.load()
+
+    def write(self, results: list[AnnotationResult]) -> None:
+        if not results:
+            return
+        table = pa.Table.from_pydict({
+            "id": [doc_id for doc_id, _ in results],
+            "result": [result_to_json(result) for _, result in results],
+        }, schema=self._SCHEMA)
+        part_path = os.path.join(self.save_dir,
+                                 f"part_{self.part_number}.parquet")
+        # NOTE: written under a temporary name first so that an interrupted
+        #       write doesn't leave behind a broken part
+        tmp_path = part_path + ".tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, part_path)
+        self._index.add(doc_id for doc_id, _ in results)
+        self.part_number += 1
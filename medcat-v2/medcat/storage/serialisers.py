@@ -158,6 +158,28 @@ class Serialiser(ABC):
                 f"({man_cls_path}) does not implement ManualSerialisable")
         return man_cls.deserialise_from(folder_path, **init_kwargs)
 
+    def deserialise_parts(self, part_paths: dict[str, str],
+                          ignore_folders_prefix: set[str],
+                          ignore_folders_suffix: set[str],
+                          ) -> dict[str, Serialisable]:
+        """Deserialise the (independent) serialisable parts of an object.
+
+        Args:
+            part_paths (dict[str, str]): The folder of each part.
+            ignore_folders_prefix (set[str]): The prefixes of folders
+                to ignore.
+            ignore_folders_suffix (set[str]): The suffixes of folders
+                to ignore.
+
+        Returns:
+            dict[str, Serialisable]: The deserialised parts.
+        """
+        return {
+            part_name: self.deserialise_all(
+                part_path, ignore_folders_prefix=ignore_folders_prefix,
+                ignore_folders_suffix=ignore_folders_suffix)
+            for part_name, part_path in part_paths.items()}
+
     def deserialise_all(self, folder_path: str,
                         ignore_folders_prefix: set[str] = set(),
                         ignore_folders_suffix: set[str] = set(),
@@ -190,6 +212,7 @@ class Serialiser(ABC):
         cls: Type = getattr(module, cls_name)
         init_kwargs: dict[str, Serialisable] = kwargs
         non_init_sers: dict[str, Serialisable] = {}
+        part_paths: dict[str, str] = {}
         for part_name in os.listdir(folder_path):
             if part_name == DEFAULT_SCHEMA_FILE or part_name == self.RAW_FILE:
                 continue
@@ -207,9 +230,10 @@ class Serialiser(ABC):
             part_path = os.path.join(folder_path, part_name)
             if not os.path.isdir(part_path):
                 continue
-            part = self.deserialise_all(
-                part_path, ignore_folders_prefix=ignore_folders_prefix,
-                ignore_folders_suffix=ignore_folders_suffix)
+            part_paths[part_name] = part_path
+        parts = self.deserialise_parts(
+            part_paths, ignore_folders_prefix, ignore_folders_suffix)
+        for part_name, part in parts.items():
             if part_name in init_attrs:
                 init_kwargs[part_name] = part
             else:
@@ -235,6 +259,7 @@ class AvailableSerialisers(Enum):
     """Describes the available serialisers."""
     dill = auto()
     json = auto()
+    binary = auto()
 
     def write_to(self, file_path: str) -> None:
         with open(file_path, 'w') as f:
@@ -284,6 +309,9 @@ def get_serialiser(
     elif serialiser_type is AvailableSerialisers.json:
         from medcat.storage.jsonserialiser import JsonSerialiser
         return JsonSerialiser()
+    elif serialiser_type is AvailableSerialisers.binary:
+        from medcat.storage.binaryserialiser import BinarySerialiser
+        return BinarySerialiser()
     raise ValueError("Unknown or unimplemented serialsier type: "
                      f"{serialiser_type}")
 
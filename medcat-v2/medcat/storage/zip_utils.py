@@ -1,13 +1,20 @@
 import os
 import shutil
 import tempfile
+import zipfile
+import logging
 from typing import Union, Literal
 
+import xxhash
+
 from medcat.storage.serialisables import Serialisable
 from medcat.storage.serialisers import (
     serialise, deserialise, AvailableSerialisers)
 
 
+logger = logging.getLogger(__name__)
+
+
 def should_serialise_as_zip(path: str,
                             as_zip: Union[bool, Literal['auto']]
                             ) -> bool:
@@ -67,3 +74,64 @@ def deserialise_from_zip(path: str) -> Serialisable:
     with tempfile.TemporaryDirectory() as tmpdir:
         shutil.unpack_archive(path, tmpdir, format='zip')
         return deserialise(tmpdir)
+
+
+def get_zip_content_hash(path: str) -> str:
+    """Get the hash of the contents of a zip file.
+
+    The hash is based on the names, sizes, and CRC-32 checksums of the
+    members. These are read from the central directory of the archive,
+    so the (potentially large) zip does not need to be read in full.
+
+    Args:
+        path (str): The path to the zip file.
+
+    Returns:
+        str: The hex digest of the hash.
+    """
+    hasher = xxhash.xxh3_128()
+    with zipfile.ZipFile(path) as zf:
+        for info in sorted(zf.infolist(), key=lambda info: info.filename):
+            hasher.update(
+                f"{info.filename}\0{info.file_size}\0{info.CRC}\n".encode())
+    return hasher.hexdigest()
+
+
+def unpack_to_cache(path: str, cache_dir: str) -> str:
+    """Unpack a zip file into a content addressed cache.
+
+    The contents are unpacked into a sub folder of the cache folder that
+    is named after the hash of the contents (see `get_zip_content_hash`).
+    If that already exists, nothing is unpacked. So the same contents are
+    only unpacked once, regardless of where the zip file is located.
+
+    It is safe for multiple processes (e.g. web server workers) to do
+    this at the same time. The contents are unpacked into a temporary
+    folder which is then atomically renamed. So a cached folder is never
+    seen in a partially unpacked state.
+
+    Args:
+        path (str): The path to the zip file.
+        cache_dir (str): The cache folder.
+
+    Returns:
+        str: The path to the unpacked contents.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    target = os.path.join(cache_dir, get_zip_content_hash(path))
+    if os.path.isdir(target):
+        logger.info("Found %s unpacked in cache at %s", path, target)
+        return target
+    logger.info("Unpacking %s into cache at %s", path, target)
+    temp_dir = tempfile.mkdtemp(prefix=".unpacking-", dir=cache_dir)
+    try:
+        shutil.unpack_archive(path, extract_dir=temp_dir, format='zip')
+        os.rename(temp_dir, target)
+    except OSError:
+        if not os.path.isdir(target):
+            raise
+        # NOTE: another process was faster in unpacking the same contents
+        logger.info("Concurrently unpacked into %s", target)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return target
@@ -1,4 +1,5 @@
 import re
+from bisect import bisect_left, bisect_right
 from typing import cast, Optional, Iterator, overload, Union, Any, Type
 from collections import defaultdict
 
@@ -223,6 +224,9 @@ class Document:
                  ) -> None:
         self.text = text
         self._tokens = tokens or []
+        # NOTE: the start character of each token (in order) for looking up
+        #       the tokens by character indices. Built upon first use.
+        self._token_starts: list[int] = []
         self.ner_ents: list[MutableEntity] = []
         self.linked_ents: list[MutableEntity] = []
 
@@ -255,12 +259,12 @@ class Document:
 
     def get_tokens(self, start_index: int, end_index: int
                    ) -> list[MutableToken]:
-        tkns = []
-        for tkn in self:
-            if (tkn.base.char_index >= start_index and
-                    tkn.base.char_index <= end_index):
-                tkns.append(tkn)
-        return tkns
+        if len(self._token_starts) != len(self._tokens):
+            # NOTE: (re)built if tokens have been added since
+            self._token_starts = [tkn.base.char_index for tkn in self._tokens]
+        first = bisect_left(self._token_starts, start_index)
+        last = bisect_right(self._token_starts, end_index)
+        return self._tokens[first:last]
 
     def __iter__(self) -> Iterator[MutableToken]:
         yield from self._tokens
@@ -343,8 +347,8 @@ class RegexTokenizer(BaseTokenizer):
         if not tokens:
             raise ValueError("Need at least one token for an entity")
         doc = cast(Token, tokens[0])._doc
-        start_index = doc._tokens.index(tokens[0])
-        end_index = doc._tokens.index(tokens[-1])
+        start_index = tokens[0].base.index
+        end_index = tokens[-1].base.index
         return _entity_from_tokens(doc, tokens, start_index, end_index)
 
     def __call__(self, text: str) -> MutableDocument:
@@ -84,6 +84,10 @@ class SpacyTokenizer(BaseTokenizer):
     def __call__(self, text: str) -> MutableDocument:
         return Document(self._nlp(text))
 
+    def pipe(self, texts: list[str]) -> list[MutableDocument]:
+        return [Document(doc) for doc in self._nlp.pipe(
+            texts, batch_size=max(len(texts), 1))]
+
     @classmethod
     def create_new_tokenizer(cls, config: Config) -> 'SpacyTokenizer':
         nlp_cnf = config.general.nlp
@@ -1,4 +1,5 @@
 from typing import Iterator, Union, Optional, overload, cast, Any
+from bisect import bisect_left, bisect_right
 import logging
 
 from spacy.tokens import Token as SpacyToken
@@ -196,6 +197,9 @@ class Document:
 
     def __init__(self, delegate: SpacyDoc) -> None:
         self._delegate = delegate
+        # NOTE: the start character of each token (in order) for looking up
+        #       the tokens by character indices. Built upon first use.
+        self._token_starts: list[int] = []
         self.ner_ents: list[MutableEntity] = []
         self.linked_ents: list[MutableEntity] = []
 
@@ -227,12 +231,12 @@ class Document:
 
     def get_tokens(self, start_index: int, end_index: int
                    ) -> list[MutableToken]:
-        tkns = []
-        for tkn in self:
-            if (tkn.base.char_index >= start_index and
-                    tkn.base.char_index <= end_index):
-                tkns.append(tkn)
-        return tkns
+        if len(self._token_starts) != len(self._delegate):
+            # NOTE: (re)built if the document has been retokenized since
+            self._token_starts = [tkn.idx for tkn in self._delegate]
+        first = bisect_left(self._token_starts, start_index)
+        last = bisect_right(self._token_starts, end_index)
+        return [Token(self._delegate[ind]) for ind in range(first, last)]
 
     def set_addon_data(self, path: str, val: Any) -> None:
         if not self._delegate.has_extension(path):
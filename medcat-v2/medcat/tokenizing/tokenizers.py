@@ -70,6 +70,26 @@ class BaseTokenizer(Protocol):
         pass
 
 
+@runtime_checkable
+class BatchableTokenizer(Protocol):
+    """A tokenizer that can tokenize a batch of texts at once.
+
+    This is optional for tokenizers. Tokenizers that do not implement
+    this are simply called for each text in turn.
+    """
+
+    def pipe(self, texts: list[str]) -> list[MutableDocument]:
+        """Tokenize a batch of texts.
+
+        Args:
+            texts (list[str]): The texts to tokenize.
+
+        Returns:
+            list[MutableDocument]: The documents (in order).
+        """
+        pass
+
+
 @runtime_checkable
 class SaveableTokenizer(Protocol):
 
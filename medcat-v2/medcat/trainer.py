@@ -1,7 +1,6 @@
 from typing import Iterable, Callable, Optional, Union, cast
 import logging
 from itertools import chain, repeat, islice
-from tqdm import trange
 
 from medcat.tokenizing.tokens import (MutableDocument, MutableEntity,
                                       MutableToken)
@@ -290,6 +289,9 @@ class Trainer:
         current_project = 0
         current_document = 0
 
+        # NOTE: imported upon use to keep `import medcat` fast
+        from tqdm import trange
+
         for epoch in trange(current_epoch, nepochs, initial=current_epoch,
                             total=nepochs, desc='Epoch', leave=False,
                             disable=disable_progress):
@@ -355,6 +357,7 @@ class Trainer:
                        terminate_last: bool,
                        never_terminate: bool,
                        ) -> None:
+        from tqdm import trange
         # Print acc before training
         for idx_project in trange(current_project,
                                   len(train_set['projects']),
@@ -401,6 +404,7 @@ class Trainer:
                                        current_document: int,
                                        train_from_false_positives: bool,
                                        devalue_others: bool):
+        from tqdm import trange
         cnf_linking = self.config.components.linking
         for idx_doc in trange(current_document,
                               len(docs),
@@ -0,0 +1,90 @@
+from typing import Generic, Hashable, Optional, TypeVar
+from collections import OrderedDict
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A bounded least recently used (LRU) cache.
+
+    The cache keeps track of its hits and misses so that its effectiveness
+    can be monitored (see `get_stats`).
+
+    The cache can be shared across threads without a lock. A value that
+    gets evicted by another thread while it is being looked up is treated
+    as a miss.
+
+    Args:
+        max_size (int): The maximum number of items to keep.
+            Use 0 to disable the cache.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Get the cached value (if any).
+
+        Args:
+            key (K): The key.
+
+        Returns:
+            Optional[V]: The value, or None if it was not cached.
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            # NOTE: evicted by another thread in the meantime
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Cache a value, evicting the least recently used one if full.
+
+        Args:
+            key (K): The key.
+            value (V): The value.
+        """
+        if self.max_size <= 0:
+            return
+        self._data[key] = value
+        try:
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        except KeyError:
+            # NOTE: evicted (or emptied) by another thread in the meantime
+            pass
+
+    def clear(self) -> None:
+        """Remove all the cached values (but keep the stats)."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> dict:
+        """Get the stats of the cache.
+
+        Returns:
+            dict: The size, the maximum size, the hits, the misses and the
+                hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
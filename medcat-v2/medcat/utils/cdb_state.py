@@ -20,6 +20,7 @@ CDBState = TypedDict(
         'cui2info': dict[str, CUIInfo],
         'token_counts': dict[str, int],
         '_subnames': set[str],
+        '_subname_counts': dict[str, int],
         'config.meta': ModelMeta,
     })
 """CDB State.
@@ -33,6 +34,7 @@ Currently, the following fields are saved:
  - cui2info
  - token_counts
  - _subnames
+ - _subname_counts
  - config.meta
 """
 
@@ -136,6 +138,10 @@ def _reapply_state(cdb, state: CDBState):
         elif isinstance(prev_ver, ModelMeta):
             # just set, shouldn't matter
             _set_attr(cdb, k, v)
+    # NOTE: the subnames were changed in place, so anything built
+    #       from them needs to know they've changed
+    if hasattr(cdb, '_subnames_version'):
+        cdb._subnames_version += 1
 
 
 def load_and_apply_cdb_state(cdb, file_path: str) -> None:
@@ -0,0 +1,231 @@
+"""Compact models for inference.
+
+A model pack carries some data that is only needed for training or for
+describing the concepts, and its vectors are generally kept in float64.
+Compacting a model strips the former and downcasts the vectors.
+The resulting model pack is smaller, so it loads faster and takes up
+less memory.
+
+The CUI training counts and average confidences are kept since they are
+used by the linker at inference time. So are the name statuses, the
+token counts (for spell checking) and the additional info.
+
+The compacted model can still be trained, but the stripped data is lost
+and the vectors are updated at the lower precision.
+
+Example:
+
+    python -m medcat.utils.compaction model_pack.zip out_folder \\
+        --texts texts.txt --output report.json
+
+The size of the model pack before and after is reported. If texts are
+specified (one per line), they are annotated before and after compaction
+and the annotations are compared.
+"""
+from typing import Type, Optional, Iterable, Union, cast
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+
+from medcat.cat import CAT
+from medcat.cdb import CDB, FrozenCDB
+from medcat.vocab import Vocab, VectorStore
+from medcat.data.entities import Entities, OnlyCUIEntities
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TOLERANCE = 1e-3
+
+
+def compact_cdb(cdb: CDB, dtype: Type = np.float32) -> None:
+    """Compact the CDB for inference (in place).
+
+    This removes the descriptions, the original names and the other
+    ontologies of the concepts and downcasts the context vectors.
+
+    Args:
+        cdb (CDB): The CDB.
+        dtype (Type): The data type for the context vectors.
+            Defaults to np.float32.
+
+    Raises:
+        ValueError: If the CDB is frozen (read only).
+    """
+    if isinstance(cdb, FrozenCDB):
+        raise ValueError("Unable to compact a frozen CDB. Compact the "
+                         "model before freezing the CDB instead.")
+    for info in cdb.cui2info.values():
+        info['description'] = None
+        info['original_names'] = None
+        info['in_other_ontology'] = None
+        if info['context_vectors']:
+            # NOTE: replaced rather than modified in place so that the
+            #       linker knows to update its cached vectors
+            info['context_vectors'] = {
+                ct: vec.astype(dtype)
+                for ct, vec in info['context_vectors'].items()}
+    cdb.is_dirty = True
+
+
+def compact_vocab(vocab: Vocab, dtype: Type = np.float32) -> None:
+    """Compact the vocab for inference (in place).
+
+    This moves the word vectors into a single contiguous matrix of the
+    specified type and removes the negative sampling probabilities
+    (which are recalculated if and when needed for training).
+
+    Args:
+        vocab (Vocab): The vocab.
+        dtype (Type): The data type for the word vectors.
+            Defaults to np.float32.
+    """
+    if vocab.vectors is None:
+        vocab.make_vectors_contiguous(dtype)
+    elif vocab.vectors.matrix.dtype != dtype:
+        vocab.vectors = VectorStore(vocab.vectors.matrix.astype(dtype))
+    vocab.cum_probs = np.array([])
+
+
+def get_path_size(path: str) -> int:
+    """Get the size of a file or (recursively) a folder.
+
+    Args:
+        path (str): The path.
+
+    Returns:
+        int: The size in bytes.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, file_name))
+               for root, _, file_names in os.walk(path)
+               for file_name in file_names)
+
+
+def compare_annotations(
+        expected: Iterable[Union[Entities, OnlyCUIEntities]],
+        got: Iterable[Union[Entities, OnlyCUIEntities]],
+        tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Compare the annotations of the same texts.
+
+    The annotations are the same if the same spans are linked to the same
+    concepts with context similarities within the tolerance.
+
+    Args:
+        expected (Iterable[Union[Entities, OnlyCUIEntities]]): The
+            expected annotations. They need to have the full entities.
+        got (Iterable[Union[Entities, OnlyCUIEntities]]): The annotations
+            to compare against. They need to have the full entities.
+        tolerance (float): The tolerance for the context similarity.
+            Defaults to DEFAULT_TOLERANCE.
+
+    Returns:
+        list[str]: The differences (if any).
+    """
+    differences: list[str] = []
+    for text_num, (exp_anns, cur_anns) in enumerate(zip(expected, got)):
+        # NOTE: the annotations are never CUI only here
+        exp, cur = cast(Entities, exp_anns), cast(Entities, cur_anns)
+        exp_ents = {(ent['start'], ent['end'], ent['cui']): ent
+                    for ent in exp['entities'].values()}
+        cur_ents = {(ent['start'], ent['end'], ent['cui']): ent
+                    for ent in cur['entities'].values()}
+        for key in exp_ents.keys() ^ cur_ents.keys():
+            differences.append(
+                f"Text {text_num}: {key} only found "
+                f"{'before' if key in exp_ents else 'after'}")
+        for key in exp_ents.keys() & cur_ents.keys():
+            exp_sim = exp_ents[key]['context_similarity']
+            cur_sim = cur_ents[key]['context_similarity']
+            if abs(exp_sim - cur_sim) > tolerance:
+                differences.append(
+                    f"Text {text_num}: {key} context similarity changed "
+                    f"from {exp_sim} to {cur_sim}")
+    return differences
+
+
+def compact_model_pack(model_pack_path: str, target_folder: str,
+                       dtype: Type = np.float32,
+                       texts: Optional[list[str]] = None,
+                       tolerance: float = DEFAULT_TOLERANCE,
+                       config_dict: Optional[dict] = None,
+                       **save_kwargs) -> dict:
+    """Compact a model pack for inference and save it.
+
+    Args:
+        model_pack_path (str): The model pack path.
+        target_folder (str): The folder to save the compacted pack in.
+        dtype (Type): The data type for the vectors.
+            Defaults to np.float32.
+        texts (Optional[list[str]]): The texts to compare the annotations
+            on before and after compaction. Defaults to None.
+        tolerance (float): The tolerance for the context similarity.
+            Defaults to DEFAULT_TOLERANCE.
+        config_dict (Optional[dict]): The config overrides to load the
+            model pack with. Defaults to None.
+        **save_kwargs: The keyword arguments for `CAT.save_model_pack`.
+
+    Returns:
+        dict: The report with the paths and sizes (in bytes) of the model
+            packs before and after, and the annotation differences (if
+            texts were specified).
+    """
+    cat = CAT.load_model_pack(model_pack_path, config_dict=config_dict)
+    expected = ([cat.get_entities(text) for text in texts]
+                if texts is not None else None)
+    cat.compact_for_inference(dtype)
+    save_kwargs.setdefault("change_description", "Compacted for inference")
+    compacted_path = cat.save_model_pack(target_folder, **save_kwargs)
+    report: dict = {
+        "original": model_pack_path,
+        "compacted": compacted_path,
+        "original_size": get_path_size(model_pack_path),
+        "compacted_size": get_path_size(compacted_path),
+    }
+    logger.info("Compacted model pack from %d to %d bytes",
+                report["original_size"], report["compacted_size"])
+    if texts is not None and expected is not None:
+        report["differences"] = compare_annotations(
+            expected, [cat.get_entities(text) for text in texts], tolerance)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('model_pack', help='The path to the model pack')
+    parser.add_argument('target_folder',
+                        help='The folder to save the compacted pack in')
+    parser.add_argument('--float16', action='store_true',
+                        help='Use float16 (rather than float32) vectors')
+    parser.add_argument('--texts', help='A file with texts (one per line) '
+                        'to compare the annotations on')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='The tolerance for the context similarity')
+    parser.add_argument('--output', help='The JSON file for the report')
+    args = parser.parse_args(args=argv)
+    texts: Optional[list[str]] = None
+    if args.texts:
+        with open(args.texts) as f:
+            texts = [line.strip() for line in f if line.strip()]
+    report = compact_model_pack(
+        args.model_pack, args.target_folder,
+        np.float16 if args.float16 else np.float32, texts, args.tolerance)
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(out)
+    else:
+        print(out)
+    if report.get("differences"):
+        raise SystemExit(
+            f"Found {len(report['differences'])} annotation differences")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ DEFAULT_SPACY_MODEL = 'en_core_web_md'
 DEFAULT_PACK_NAME = "medcat2_model_pack"
 COMPONENTS_FOLDER = "saved_components"
 AVOID_LEGACY_CONVERSION_ENVIRON = "MEDCAT_AVOID_LECACY_CONVERSION"
+UNPACK_CACHE_DIR_ENVIRON = "MEDCAT_UNPACK_CACHE_DIR"
 
 
 def avoid_legacy_conversion() -> bool:
@@ -16,6 +17,10 @@ def avoid_legacy_conversion() -> bool:
         AVOID_LEGACY_CONVERSION_ENVIRON, "False").lower() == "true"
 
 
+def get_unpack_cache_dir() -> Optional[str]:
+    return os.environ.get(UNPACK_CACHE_DIR_ENVIRON) or None
+
+
 class LegacyConversionDisabledError(Exception):
     """Raised when legacy conversion is disabled."""
 
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from typing import Optional
 import platform
 import logging
 import importlib.metadata
@@ -36,6 +38,11 @@ def get_direct_dependencies(include_extras: bool) -> list[str]:
     return reqs
 
 
+def _normalise_name(name: str) -> str:
+    # NOTE: the same normalisation that importlib.metadata uses
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
 def get_transitive_deps(direct_deps: list[str]) -> dict[str, str]:
     """Get the transitive dependencies of the direct dependencies.
 
@@ -48,10 +55,17 @@ def get_transitive_deps(direct_deps: list[str]) -> dict[str, str]:
     all_deps: dict[str, str] = {}
     to_process = set(direct_deps)
     processed = set()
+    # NOTE: parsing the metadata of a distribution is slow, so each
+    #       (installed) distribution is only looked up once
+    dists: dict[str, importlib.metadata.Distribution] = {}
     # list installed packages for ease of use
-    installed_packages = {
-        dist.metadata['name'].lower()
-        for dist in importlib.metadata.distributions()}
+    installed_packages = set()
+    for installed in importlib.metadata.distributions():
+        name = installed.metadata['name'].lower()
+        installed_packages.add(name)
+        # NOTE: the first one found takes precedence (as upon import)
+        dists.setdefault(_normalise_name(name), installed)
+    versions: dict[str, str] = {}
 
     while to_process:
         package = to_process.pop()
@@ -60,9 +74,9 @@ def get_transitive_deps(direct_deps: list[str]) -> dict[str, str]:
 
         processed.add(package)
 
-        try:
-            dist = importlib.metadata.distribution(package)
-        except importlib.metadata.PackageNotFoundError:
+        dist: Optional[importlib.metadata.Distribution] = dists.get(
+            _normalise_name(package))
+        if dist is None:
             # NOTE: if not installed, we won't bother
             #       after all, if we can save the model, clearly
             #       everything is working
@@ -76,8 +90,10 @@ def get_transitive_deps(direct_deps: list[str]) -> dict[str, str]:
             dep_name = match.group(0).lower()
             if (dep_name and dep_name not in processed and
                     dep_name in installed_packages):
-                all_deps[dep_name] = importlib.metadata.distribution(
-                    dep_name).version
+                if dep_name not in versions:
+                    versions[dep_name] = dists[
+                        _normalise_name(dep_name)].version
+                all_deps[dep_name] = versions[dep_name]
                 to_process.add(dep_name)
 
     for direct in direct_deps:
@@ -169,3 +185,23 @@ def get_environment_info(include_transitive_deps: bool = True,
         trans_deps = {}
     return Environment(dependencies=deps, transitive_deps=trans_deps, os=os,
                        cpu_arcitecture=cpu_arc, python_version=py_ver)
+
+
+@lru_cache(maxsize=1)
+def _get_environment_info_once() -> Environment:
+    return get_environment_info()
+
+
+def get_current_environment() -> Environment:
+    """Get the (cached) information of the current environment.
+
+    Getting the environment information means going through the metadata
+    of all the installed packages, which takes a while. Since this does not
+    (generally) change within a process, it is only done once. This is used
+    as the default for new configs. The environment is still looked up anew
+    when a model is saved.
+
+    Returns:
+        Environment: A copy of the environment.
+    """
+    return _get_environment_info_once().model_copy(deep=True)
@@ -15,6 +15,10 @@ def unitvec(vec: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: The new unit vector.
     """
+    if vec.dtype == np.float16 or np.issubdtype(vec.dtype, np.integer):
+        # NOTE: the squared norm can easily overflow in half precision
+        #       (and quantised vectors are integers)
+        vec = vec.astype(np.float32)
     return vec / np.linalg.norm(vec)
 
 
@@ -30,3 +34,40 @@ def sigmoid(x: NDArray[np.float64]) -> NDArray[np.float64]:
 
 def sigmoid(x: Union[np.ndarray, float]) -> Union[np.ndarray, float]:
     return 1 / (1 + np.exp(-x))
+
+
+def quantise_int8(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Quantise (the rows of) an array into int8 with a per-row scale.
+
+    Each row is scaled so that its largest absolute value maps to 127.
+    Since the scale doesn't change the direction, the (cosine) similarity
+    can be calculated from the quantised rows directly.
+
+    Args:
+        arr (np.ndarray): The vector or matrix.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The quantised array and the
+            (float32) scale of each row.
+    """
+    arr = np.asarray(arr, dtype=np.float32)
+    scales = np.abs(arr).max(axis=-1, keepdims=True) / 127
+    # NOTE: avoid dividing by zero for all zero rows
+    scales[scales == 0] = 1
+    quantised = np.rint(arr / scales).astype(np.int8)
+    return quantised, scales[..., 0]
+
+
+def dequantise_int8(quantised: np.ndarray,
+                    scales: Union[np.ndarray, float]) -> np.ndarray:
+    """Restore (the rows of) an array quantised with `quantise_int8`.
+
+    Args:
+        quantised (np.ndarray): The quantised vector or matrix.
+        scales (Union[np.ndarray, float]): The scale of each row.
+
+    Returns:
+        np.ndarray: The (float32) array.
+    """
+    return (quantised.astype(np.float32) *
+            np.asarray(scales, dtype=np.float32)[..., None])
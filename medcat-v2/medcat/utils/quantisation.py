@@ -0,0 +1,172 @@
+"""Quantise the context vectors of a model and evaluate the effect.
+
+The context vectors of the concepts are generally the largest part of a
+trained CDB. They can be kept in a frozen CDB at a lower precision
+(`float16`, or `int8` with a per-vector scale) to reduce the memory use
+(see `CAT.load_model_pack`). Since this changes the similarities slightly,
+some linking decisions may change as well.
+
+This loads the model pack both as is and with quantised context vectors,
+annotates the documents of a MedCATtrainer export with both and reports
+how the linking decisions changed (both overall and for the annotated
+spans). The quantised model pack can optionally be saved.
+
+Example:
+
+    python -m medcat.utils.quantisation model_pack.zip mct_export.json \\
+        --dtype int8 --save-to out_folder --output report.json
+"""
+from typing import Optional, Union, Type
+import argparse
+import json
+import logging
+
+import numpy as np
+
+from medcat.cat import CAT
+from medcat.cdb import CDB, FrozenCDB
+from medcat.data.mctexport import MedCATTrainerExport, iter_docs
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_context_vectors_size(cdb: CDB) -> int:
+    """Get the memory used by the context vectors of a CDB.
+
+    Args:
+        cdb (CDB): The CDB.
+
+    Returns:
+        int: The size (in bytes) of the context vectors.
+    """
+    if isinstance(cdb, FrozenCDB):
+        return cdb.get_context_vectors_size()
+    return sum(vec.nbytes for info in cdb.cui2info.values()
+               for vec in (info['context_vectors'] or {}).values())
+
+
+def compare_linking(before: CAT, after: CAT,
+                    export: MedCATTrainerExport,
+                    max_examples: int = 100) -> dict:
+    """Compare the linking decisions of two models on a trainer export.
+
+    The entities are compared for all the spans either model found. The
+    annotated spans are compared against the annotated CUIs as well. The
+    deleted and incorrect annotations are ignored.
+
+    Args:
+        before (CAT): The original model.
+        after (CAT): The changed (e.g quantised) model.
+        export (MedCATTrainerExport): The trainer export.
+        max_examples (int): The maximum number of changed decisions to
+            include in the report. Defaults to 100.
+
+    Returns:
+        dict: The report.
+    """
+    report: dict = {
+        "entities_before": 0,
+        "entities_after": 0,
+        "entities_changed": 0,
+        "annotations": 0,
+        "correct_before": 0,
+        "correct_after": 0,
+        "annotations_changed": 0,
+        "examples": [],
+    }
+    for _, doc in iter_docs(export):
+        span2cui_before = {
+            (ent['start'], ent['end']): ent['cui']
+            for ent in before.get_entities(doc['text'])['entities'].values()}
+        span2cui_after = {
+            (ent['start'], ent['end']): ent['cui']
+            for ent in after.get_entities(doc['text'])['entities'].values()}
+        report["entities_before"] += len(span2cui_before)
+        report["entities_after"] += len(span2cui_after)
+        report["entities_changed"] += sum(
+            span2cui_before.get(span) != span2cui_after.get(span)
+            for span in span2cui_before.keys() | span2cui_after.keys())
+        for ann in doc['annotations']:
+            if ann.get('deleted', False) or not ann.get('correct', True):
+                continue
+            span = (ann['start'], ann['end'])
+            cui_before = span2cui_before.get(span)
+            cui_after = span2cui_after.get(span)
+            report["annotations"] += 1
+            report["correct_before"] += cui_before == ann['cui']
+            report["correct_after"] += cui_after == ann['cui']
+            if cui_before == cui_after:
+                continue
+            report["annotations_changed"] += 1
+            if len(report["examples"]) < max_examples:
+                report["examples"].append({
+                    "document": doc['name'], "value": ann['value'],
+                    "start": ann['start'], "end": ann['end'],
+                    "cui": ann['cui'], "cui_before": cui_before,
+                    "cui_after": cui_after})
+    return report
+
+
+def evaluate_quantisation(model_pack_path: str,
+                          export: MedCATTrainerExport,
+                          dtype: Union[str, Type] = np.int8,
+                          config_dict: Optional[dict] = None,
+                          ) -> tuple[CAT, dict]:
+    """Quantise the context vectors of a model pack and evaluate it.
+
+    Args:
+        model_pack_path (str): The model pack path.
+        export (MedCATTrainerExport): The trainer export to evaluate on.
+        dtype (Union[str, Type]): The data type for the context vectors.
+            Defaults to np.int8.
+        config_dict (Optional[dict]): The config overrides to load the
+            model pack with. Defaults to None.
+
+    Returns:
+        tuple[CAT, dict]: The quantised model and the report.
+    """
+    before = CAT.load_model_pack(model_pack_path, config_dict=config_dict)
+    after = CAT.load_model_pack(model_pack_path, config_dict=config_dict,
+                                context_vector_dtype=dtype)
+    report = {
+        "dtype": str(np.dtype(dtype)),
+        "size_before": get_context_vectors_size(before.cdb),
+        "size_after": get_context_vectors_size(after.cdb),
+    }
+    logger.info("Quantised the context vectors from %d to %d bytes",
+                report["size_before"], report["size_after"])
+    report.update(compare_linking(before, after, export))
+    return after, report
+
+
+def main(argv: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('model_pack', help='The path to the model pack')
+    parser.add_argument('mct_export',
+                        help='The MedCATtrainer export to evaluate on')
+    parser.add_argument('--dtype', choices=['int8', 'float16'],
+                        default='int8',
+                        help='The data type for the context vectors')
+    parser.add_argument('--save-to',
+                        help='The folder to save the quantised pack in')
+    parser.add_argument('--output', help='The JSON file for the report')
+    args = parser.parse_args(args=argv)
+    with open(args.mct_export) as f:
+        export = json.load(f)
+    cat, report = evaluate_quantisation(args.model_pack, export, args.dtype)
+    if args.save_to:
+        report["saved_to"] = cat.save_model_pack(
+            args.save_to, change_description=(
+                f"Quantised the context vectors to {args.dtype}"))
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(out)
+    else:
+        print(out)
+    return report
+
+
+if __name__ == "__main__":
+    main()
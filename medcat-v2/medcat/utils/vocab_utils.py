@@ -3,7 +3,7 @@ import logging
 from typing import Type
 
 from medcat.cdb import CDB
-from medcat.vocab import Vocab
+from medcat.vocab import Vocab, VectorStore
 
 
 logger = logging.getLogger(__name__)
@@ -26,8 +26,8 @@ def calc_matrix(vocab: Vocab, target_size: int) -> np.ndarray:
         np.ndarray: The transformation matrix.
     """
     all_vecs = np.vstack(
-        [value['vector'] for value in vocab.vocab.values()
-         if value['vector'] is not None]
+        [vec for vec in map(vocab.vec, vocab.vec_index2word.values())
+         if vec is not None]
     )
     logger.debug("Vocab vectors have a total shape of %s", np.shape(all_vecs))
     all_vecs_meaned = all_vecs - np.mean(all_vecs, axis=0)
@@ -66,6 +66,10 @@ def convert_vocab(vocab: Vocab, matrix: np.ndarray) -> None:
         vocab (Vocab): The Vocab.
         matrix (np.ndarray): The transformation matrix.
     """
+    if vocab.vectors is not None:
+        # NOTE: the rows of words without vectors are zeros and stay so
+        vocab.vectors = VectorStore(
+            (vocab.vectors.matrix @ matrix.T).astype(np.float32))
     for d in vocab.vocab.values():
         cvec = d['vector']
         if cvec is None:
@@ -1,4 +1,4 @@
-from typing import Optional, Any, cast, Union, Literal
+from typing import Optional, Any, cast, Union, Literal, Type
 from typing_extensions import TypedDict
 import os
 import logging
@@ -7,6 +7,7 @@ import logging
 import numpy as np
 
 from medcat.storage.serialisables import AbstractSerialisable
+from medcat.storage.serialisables import AbstractManualSerialisable
 from medcat.storage.serialisers import (
     deserialise, AvailableSerialisers, serialise)
 from medcat.storage.zip_utils import (
@@ -24,6 +25,89 @@ WordDescriptor = TypedDict('WordDescriptor',
                             'count': int, 'index': int})
 
 
+class VectorStore(AbstractManualSerialisable):
+    """The word vectors of a vocab in a single contiguous matrix.
+
+    The row of each word is its index in the vocab. The rows of words
+    without a vector are all zeros.
+
+    The matrix is saved as a `.npy` file and memory mapped upon load.
+    So processes that load the same model share the page cache instead
+    of each having a private copy of the vectors. The (read only) mapped
+    matrix is only copied into memory if it is modified.
+
+    Args:
+        matrix (np.ndarray): The vector matrix.
+    """
+    VECTORS_FILE = 'vectors.npy'
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def get(self, row: int) -> np.ndarray:
+        return self.matrix[row]
+
+    def set(self, row: int, vec: np.ndarray) -> None:
+        """Set the vector for a row.
+
+        The matrix is copied into memory if it is (read only) memory
+        mapped, and grown if the row is beyond its current size.
+
+        Args:
+            row (int): The row.
+            vec (np.ndarray): The vector.
+        """
+        if not self.matrix.flags.writeable:
+            self.matrix = np.array(self.matrix)
+        if row >= len(self.matrix):
+            new_rows = max(row + 1, 2 * len(self.matrix)) - len(self.matrix)
+            self.matrix = np.concatenate((
+                self.matrix,
+                np.zeros((new_rows, self.matrix.shape[1]),
+                         dtype=self.matrix.dtype)))
+        self.matrix[row] = vec
+
+    def reorder(self, rows: list[int]) -> None:
+        """Reorder (and/or select) the rows.
+
+        Args:
+            rows (list[int]): The current rows in the new order.
+        """
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        matrix = np.zeros((len(rows_arr), self.matrix.shape[1]),
+                          dtype=self.matrix.dtype)
+        # NOTE: rows beyond the matrix are for words without vectors
+        in_range = rows_arr < len(self.matrix)
+        matrix[in_range] = self.matrix[rows_arr[in_range]]
+        self.matrix = matrix
+
+    def load_into_memory(self) -> None:
+        """Copy a memory mapped matrix into memory."""
+        if isinstance(self.matrix, np.memmap):
+            self.matrix = np.array(self.matrix)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, VectorStore):
+            return False
+        return np.array_equal(self.matrix, other.matrix)
+
+    # for ManualSerialisable:
+
+    def serialise_to(self, folder_path: str) -> None:
+        os.makedirs(folder_path, exist_ok=True)
+        np.save(os.path.join(folder_path, self.VECTORS_FILE), self.matrix)
+
+    @classmethod
+    def deserialise_from(cls, folder_path: str, **init_kwargs
+                         ) -> 'VectorStore':
+        matrix = np.load(os.path.join(folder_path, cls.VECTORS_FILE),
+                         mmap_mode='r')
+        return cls(matrix)
+
+
 class Vocab(AbstractSerialisable):
     """Vocabulary used to store word embeddings for context similarity
     calculation. Also used by the spell checker - but not for fixing the
@@ -37,6 +121,9 @@ class Vocab(AbstractSerialisable):
             From word to an index - used for negative sampling
         vec_index2word (dict):
             Same as index2word but only words that have vectors
+        vectors (Optional[VectorStore]):
+            The contiguous vector store (see `make_vectors_contiguous`).
+            If present, the vectors are kept there instead of in `vocab`.
     """
     def __init__(self) -> None:
         super().__init__()
@@ -44,6 +131,43 @@ class Vocab(AbstractSerialisable):
         self.index2word: dict[int, str] = {}
         self.vec_index2word: dict[int, str] = {}
         self.cum_probs: np.ndarray = np.array([])
+        self.vectors: Optional[VectorStore] = None
+
+    def make_vectors_contiguous(self, dtype: Type = np.float32) -> None:
+        """Move the word vectors into a single contiguous matrix.
+
+        This avoids the overhead of a separate array per word. And since
+        the matrix is saved as a `.npy` file that is memory mapped upon
+        load, the vectors can be shared between processes that load the
+        same model.
+
+        Args:
+            dtype (Type): The data type of the matrix.
+                Defaults to np.float32.
+
+        Raises:
+            ValueError: If the vectors are of different lengths.
+        """
+        if self.vectors is not None or not self.vec_index2word:
+            return
+        vec_lens = {len(self.vocab[word]['vector'])  # type: ignore
+                    for word in self.vec_index2word.values()}
+        if len(vec_lens) > 1:
+            raise ValueError("Unable to make vectors of different lengths "
+                             f"contiguous: {vec_lens}")
+        vectors = np.zeros((len(self.index2word), vec_lens.pop()),
+                           dtype=dtype)
+        for ind, word in self.vec_index2word.items():
+            vectors[ind] = self.vocab[word]['vector']
+            self.vocab[word]['vector'] = None
+        self.vectors = VectorStore(vectors)
+
+    def _set_vector(self, word_info: WordDescriptor, vec: np.ndarray
+                    ) -> None:
+        if self.vectors is None:
+            word_info['vector'] = vec
+        else:
+            self.vectors.set(word_info['index'], vec)
 
     def inc_or_add(self, word: str, cnt: int = 1,
                    vec: Optional[np.ndarray] = None) -> None:
@@ -66,6 +190,7 @@ class Vocab(AbstractSerialisable):
     def remove_all_vectors(self) -> None:
         """Remove all stored vector representations."""
         self.vec_index2word = {}
+        self.vectors = None
 
         for word in self.vocab:
             self.vocab[word]['vector'] = None
@@ -81,18 +206,26 @@ class Vocab(AbstractSerialisable):
             if self.vocab[word]['count'] < cnt:
                 del self.vocab[word]
 
+        if self.vectors is not None:
+            # NOTE: the rows of the remaining words in their (new) order
+            self.vectors.reorder(
+                [word_info['index'] for word_info in self.vocab.values()])
         # Rebuild index2word and vec_index2word
         self._rebuild_index()
 
     def _rebuild_index(self):
+        old_vec_index2word = self.vec_index2word
         self.index2word = {}
         self.vec_index2word = {}
         for word, word_info in self.vocab.items():
             ind = len(self.index2word)
             self.index2word[ind] = word
+            had_vec = (word_info['vector'] is not None or (
+                self.vectors is not None and
+                word_info['index'] in old_vec_index2word))
             word_info['index'] = ind
 
-            if word_info['vector'] is not None:
+            if had_vec:
                 self.vec_index2word[ind] = word
 
     def inc_wc(self, word: str, cnt: int = 1) -> None:
@@ -115,7 +248,7 @@ class Vocab(AbstractSerialisable):
             vec(np.ndarray):
                 The vector to add.
         """
-        self.vocab[word]['vector'] = vec
+        self._set_vector(self.vocab[word], vec)
 
         ind = self.vocab[word]['index']
         if ind not in self.vec_index2word:
@@ -163,14 +296,15 @@ class Vocab(AbstractSerialisable):
             #       stable, so shouldn't be an issue
             ind = len(self.index2word)
             self.index2word[ind] = word
-            item: WordDescriptor = {'vector': vec, 'count': cnt, 'index': ind}
+            item: WordDescriptor = {'vector': None, 'count': cnt, 'index': ind}
             self.vocab[word] = item
 
             if vec is not None:
+                self._set_vector(item, vec)
                 self.vec_index2word[ind] = word
         elif replace and vec is not None:
             word_info = self.vocab[word]
-            word_info['vector'] = vec
+            self._set_vector(word_info, vec)
             word_info['count'] = cnt
 
             # If this word didn't have a vector before
@@ -276,7 +410,13 @@ class Vocab(AbstractSerialisable):
         return self.count(word)
 
     def vec(self, word: str) -> Optional[np.ndarray]:
-        return self.vocab[word]['vector']
+        word_info = self.vocab[word]
+        if self.vectors is None:
+            return word_info['vector']
+        ind = word_info['index']
+        if ind not in self.vec_index2word:
+            return None
+        return self.vectors.get(ind)
 
     def count(self, word: str) -> int:
         return self.vocab[word]['count']
@@ -294,13 +434,12 @@ class Vocab(AbstractSerialisable):
         if not isinstance(other, Vocab):
             return False
         return (self.vocab.keys() == other.vocab.keys() and
-                all(v1.keys() == v2.keys()
-                    and all(
-                        np.all(sv1 == sv2) if isinstance(sv1, np.ndarray)
-                        else sv1 == sv2
-                        for sv1, sv2 in zip(v1.values(), v2.values()))
-                    for v1, v2
-                    in zip(self.vocab.values(), other.vocab.values())) and
+                all(v1['count'] == v2['count'] and
+                    v1['index'] == v2['index'] and
+                    _vecs_equal(self.vec(word), other.vec(word))
+                    for word, v1, v2
+                    in zip(self.vocab, self.vocab.values(),
+                           other.vocab.values())) and
                 self.index2word == other.index2word and
                 self.vec_index2word == other.vec_index2word)
 
@@ -331,6 +470,9 @@ class Vocab(AbstractSerialisable):
     def load(cls, path: str) -> 'Vocab':
         if should_serialise_as_zip(path, 'auto'):
             vocab = deserialise_from_zip(path)
+            if isinstance(vocab, Vocab) and vocab.vectors is not None:
+                # NOTE: the unzipped (temporary) files are removed
+                vocab.vectors.load_into_memory()
         elif os.path.isfile(path) and path.endswith('.dat'):
             if not avoid_legacy_conversion():
                 from medcat.utils.legacy.convert_vocab import (
@@ -344,3 +486,10 @@ class Vocab(AbstractSerialisable):
         if not isinstance(vocab, Vocab):
             raise ValueError(f"The path '{path}' is not a Vocab!")
         return vocab
+
+
+def _vecs_equal(vec1: Optional[np.ndarray], vec2: Optional[np.ndarray]
+                ) -> bool:
+    if vec1 is None or vec2 is None:
+        return vec1 is vec2
+    return np.array_equal(vec1, vec2)
@@ -7,6 +7,7 @@ from medcat.utils.cdb_state import captured_state_cdb
 from medcat.preprocessors.cleaners import NameDescriptor
 
 from unittest import TestCase
+from unittest.mock import patch
 import tempfile
 
 from .. import UNPACKED_EXAMPLE_MODEL_PACK_PATH, RESOURCES_PATH
@@ -143,3 +144,76 @@ class CDBTests(TestCase):
 
     def test_can_remove_cui_non_unique_names(self):
         self.assert_can_remove_cui(self.CUI_TO_REMOVE_NON_UNIQUE_NAMES, False)
+
+    # subname index
+    def assert_subnames_match_concepts(self):
+        exp_counts: dict[str, int] = {}
+        for ci in self.cdb.cui2info.values():
+            for sname in ci['subnames']:
+                exp_counts[sname] = exp_counts.get(sname, 0) + 1
+        self.assertEqual(self.cdb._subname_counts, exp_counts)
+        self.assertEqual(self.cdb._subnames, set(exp_counts))
+
+    def assert_no_rebuild(self):
+        with patch.object(self.cdb, '_reset_subnames') as reset:
+            self.cdb._ensure_subnames()
+        reset.assert_not_called()
+
+    def test_subnames_follow_adding_names(self):
+        self.cdb._ensure_subnames()
+        names = {"new~subnames": NameDescriptor(
+            tokens=['new', 'subnames'], snames={'new', 'new~subnames'},
+            raw_name='new subnames', is_upper=False)}
+        with captured_state_cdb(self.cdb):
+            self.cdb.add_names("C-NEW1", names)
+            self.cdb.add_names("C-NEW2", names)
+            self.assert_no_rebuild()
+            self.assert_subnames_match_concepts()
+            self.assertEqual(self.cdb._subname_counts['new'], 2)
+            self.cdb.remove_cui("C-NEW1")
+            self.assertTrue(self.cdb.has_subname('new'))
+            self.cdb.remove_cui("C-NEW2")
+            self.assertFalse(self.cdb.has_subname('new'))
+            self.assert_no_rebuild()
+            self.assert_subnames_match_concepts()
+
+    def test_subnames_version_follows_changes(self):
+        self.cdb._ensure_subnames()
+        names = {"new~subnames": NameDescriptor(
+            tokens=['new', 'subnames'], snames={'new', 'new~subnames'},
+            raw_name='new subnames', is_upper=False)}
+        with captured_state_cdb(self.cdb):
+            versions = [self.cdb._subnames_version]
+            self.cdb.add_names("C-NEW1", names)
+            versions.append(self.cdb._subnames_version)
+            self.cdb.remove_cui("C-NEW1")
+            versions.append(self.cdb._subnames_version)
+            self.cdb._reset_subnames()
+            versions.append(self.cdb._subnames_version)
+            self.assertEqual(versions, sorted(set(versions)))
+
+    def test_subnames_follow_removing_cui(self):
+        self.cdb._ensure_subnames()
+        with captured_state_cdb(self.cdb):
+            self.cdb.remove_cui(self.CUI_TO_REMOVE_UNIQUE_NAMES)
+            self.assert_no_rebuild()
+            self.assert_subnames_match_concepts()
+
+    def test_subnames_follow_filtering(self):
+        self.cdb._ensure_subnames()
+        with captured_state_cdb(self.cdb):
+            self.cdb.filter_by_cui(self.TO_FILTER)
+            self.assert_no_rebuild()
+            self.assert_subnames_match_concepts()
+
+    def test_removing_names_does_not_rebuild_subnames(self):
+        self.cdb._ensure_subnames()
+        with captured_state_cdb(self.cdb):
+            self.cdb._remove_names(self.CUI_TO_REMOVE, self.NAMES_TO_REMOVE)
+            self.assert_no_rebuild()
+
+    def test_rebuilds_subnames_when_out_of_sync(self):
+        with captured_state_cdb(self.cdb):
+            self.cdb._subname_counts.clear()
+            self.cdb._ensure_subnames()
+            self.assert_subnames_match_concepts()
@@ -0,0 +1,249 @@
+from typing import cast
+import os
+
+import numpy as np
+
+from medcat.storage.serialisers import deserialise
+from medcat.cdb import CDB, FrozenCDB
+from medcat.cdb.concepts import get_new_cui_info
+from medcat.cat import CAT
+
+from unittest import TestCase
+import tempfile
+
+from .. import UNPACKED_EXAMPLE_MODEL_PACK_PATH
+
+
+class FrozenCDBTests(TestCase):
+    CDB_PATH = os.path.join(UNPACKED_EXAMPLE_MODEL_PACK_PATH, "cdb")
+    UNTRAINED_CUI = "C06"
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cdb = cast(CDB, deserialise(cls.CDB_PATH))
+        # NOTE: a concept without context vectors and with the optional
+        #       parts of the info
+        cls.cdb.cui2info[cls.UNTRAINED_CUI] = get_new_cui_info(
+            cls.UNTRAINED_CUI, "Untrained", names={"fever"},
+            subnames={"fever"}, type_ids={"T1"}, description="Desc",
+            tags=["tag"])
+        cls.cdb.name2info["fever"]['per_cui_status'][
+            cls.UNTRAINED_CUI] = "P"
+        cls.frozen = FrozenCDB.from_cdb(cls.cdb)
+
+    def assert_same_cui_info(self, cdb1: CDB, cdb2: CDB):
+        self.assertEqual(set(cdb1.cui2info), set(cdb2.cui2info))
+        for cui, info in cdb1.cui2info.items():
+            other = cdb2.cui2info[cui]
+            self.assertEqual(set(info), set(other))
+            for key, value in info.items():
+                with self.subTest(f"{cui}: {key}"):
+                    if key != 'context_vectors':
+                        self.assertEqual(value, other[key])
+                        continue
+                    self.assertEqual(bool(value), bool(other[key]))
+                    if not value:
+                        continue
+                    self.assertEqual(value.keys(), other[key].keys())
+                    for ct, vec in value.items():
+                        self.assertEqual(vec.dtype, other[key][ct].dtype)
+                        self.assertTrue(np.array_equal(vec, other[key][ct]))
+
+    def assert_same_name_info(self, cdb1: CDB, cdb2: CDB):
+        self.assertEqual(set(cdb1.name2info), set(cdb2.name2info))
+        for name, info in cdb1.name2info.items():
+            with self.subTest(name):
+                self.assertEqual(dict(info), dict(cdb2.name2info[name]))
+
+    def test_has_same_cui_info(self):
+        self.assert_same_cui_info(self.cdb, self.frozen)
+
+    def test_has_same_name_info(self):
+        self.assert_same_name_info(self.cdb, self.frozen)
+
+    def test_untrained_has_no_context_vectors(self):
+        self.assertIsNone(
+            self.frozen.cui2info[self.UNTRAINED_CUI]['context_vectors'])
+
+    def test_context_vectors_are_stable(self):
+        cui = next(iter(self.cdb.cui2info))
+        self.assertIs(self.frozen.cui2info[cui]['context_vectors'],
+                      self.frozen.cui2info[cui]['context_vectors'])
+
+    def test_has_same_names_and_subnames(self):
+        for cui in self.cdb.cui2info:
+            with self.subTest(cui):
+                self.assertEqual(self.frozen.get_name(cui),
+                                 self.cdb.get_name(cui))
+        for subname in self.cdb._subnames:
+            with self.subTest(subname):
+                self.assertTrue(self.frozen.has_subname(subname))
+
+    def test_has_same_hash(self):
+        self.assertEqual(self.frozen.get_hash(), self.cdb.get_hash())
+
+    def test_is_read_only(self):
+        cui = next(iter(self.cdb.cui2info))
+        with self.assertRaises(TypeError):
+            self.frozen.cui2info[cui]['count_train'] = 10
+        with self.assertRaises(TypeError):
+            self.frozen.cui2info[cui] = self.cdb.cui2info[cui]
+        with self.assertRaises(TypeError):
+            self.frozen.remove_cui(cui)
+        with self.assertRaises(TypeError):
+            self.frozen.reset_training()
+
+    def test_infos_are_cached(self):
+        cui = next(iter(self.cdb.cui2info))
+        self.assertIs(self.frozen.cui2info[cui], self.frozen.cui2info[cui])
+        self.assertIs(self.frozen.cui2info[cui]['names'],
+                      self.frozen.cui2info[cui]['names'])
+        name = next(iter(self.cdb.name2info))
+        self.assertIs(self.frozen.name2info[name]['per_cui_status'],
+                      self.frozen.name2info[name]['per_cui_status'])
+
+    def test_infos_cache_is_bounded(self):
+        general = self.cdb.config.general
+        prev_size = general.frozen_cdb_cache_size
+        general.frozen_cdb_cache_size = 2
+        try:
+            frozen = FrozenCDB.from_cdb(self.cdb)
+        finally:
+            general.frozen_cdb_cache_size = prev_size
+        self.assert_same_cui_info(self.cdb, frozen)
+        self.assert_same_name_info(self.cdb, frozen)
+        self.assertEqual(len(frozen._cui2info_view._infos), 2)
+        self.assertEqual(len(frozen._name2info_view._infos), 2)
+
+    def test_info_values_are_read_only(self):
+        cui = next(iter(self.cdb.cui2info))
+        with self.assertRaises(AttributeError):
+            self.frozen.cui2info[cui]['names'].add("new name")
+        with self.assertRaises(AttributeError):
+            self.frozen.cui2info[self.UNTRAINED_CUI]['type_ids'].clear()
+        vectors = self.frozen.cui2info[cui]['context_vectors']
+        with self.assertRaises(TypeError):
+            vectors['new'] = np.zeros(3)
+        with self.assertRaises(ValueError):
+            next(iter(vectors.values()))[0] = 1
+        with self.assertRaises(TypeError):
+            self.frozen.name2info["fever"]['per_cui_status'][cui] = "A"
+
+    def test_converted_back_is_modifiable(self):
+        cdb = self.frozen.to_cdb()
+        cui = next(iter(cdb.cui2info))
+        cdb.cui2info[cui]['names'].add("new name")
+        cdb.name2info["fever"]['per_cui_status']["C-NEW"] = "A"
+        self.assertNotIn("new name", self.frozen.cui2info[cui]['names'])
+        self.assertNotIn("C-NEW",
+                         self.frozen.name2info["fever"]['per_cui_status'])
+
+    def test_can_convert_back(self):
+        cdb = self.frozen.to_cdb()
+        self.assertIs(type(cdb), CDB)
+        self.assert_same_cui_info(self.cdb, cdb)
+        self.assert_same_name_info(self.cdb, cdb)
+        self.assertEqual(cdb.get_hash(), self.cdb.get_hash())
+
+    def test_can_save_and_load(self):
+        for serialiser in ('dill', 'json'):
+            with self.subTest(serialiser):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    self.frozen.save(temp_dir, serialiser=serialiser)
+                    loaded = CDB.load(temp_dir)
+                self.assertIsInstance(loaded, FrozenCDB)
+                self.assert_same_cui_info(self.cdb, loaded)
+                self.assert_same_name_info(self.cdb, loaded)
+
+
+class FrozenCDBInferenceTests(TestCase):
+    CONFIG_DICT = {"general": {"nlp": {"provider": "regex"}}}
+    TEXT = ("The patient had kidney failure with fever and acute heart "
+            "attack. History of diabetes mellitus and hypertension.")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cat = CAT.load_model_pack(UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+                                      config_dict=cls.CONFIG_DICT)
+        cls.frozen_cat = CAT.load_model_pack(
+            UNPACKED_EXAMPLE_MODEL_PACK_PATH, config_dict=cls.CONFIG_DICT,
+            freeze_cdb=True)
+
+    def test_freezes_cdb(self):
+        self.assertIsInstance(self.frozen_cat.cdb, FrozenCDB)
+        self.assertNotIsInstance(self.cat.cdb, FrozenCDB)
+
+    def test_has_same_entities(self):
+        ents = self.cat.get_entities(self.TEXT)
+        self.assertTrue(ents['entities'])
+        self.assertEqual(self.frozen_cat.get_entities(self.TEXT), ents)
+
+    def test_saves_frozen_cdb_into_model_pack(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mpp = self.frozen_cat.save_model_pack(temp_dir)
+            loaded = CAT.load_model_pack(mpp, config_dict=self.CONFIG_DICT)
+        self.assertIsInstance(loaded.cdb, FrozenCDB)
+        self.assertEqual(loaded.get_entities(self.TEXT),
+                         self.cat.get_entities(self.TEXT))
+
+
+class QuantisedFrozenCDBTests(TestCase):
+    CDB_PATH = FrozenCDBTests.CDB_PATH
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cdb = cast(CDB, deserialise(cls.CDB_PATH))
+        cls.frozen = FrozenCDB.from_cdb(cls.cdb)
+        cls.quantised = FrozenCDB.from_cdb(cls.cdb, "int8")
+        cls.half = FrozenCDB.from_cdb(cls.cdb, np.float16)
+
+    def assert_close_vectors(self, cdb: CDB, atol: float):
+        for cui, info in self.cdb.cui2info.items():
+            vectors = info['context_vectors']
+            got = cdb.cui2info[cui]['context_vectors']
+            with self.subTest(cui):
+                self.assertEqual(bool(vectors), bool(got))
+                if not vectors:
+                    continue
+                self.assertEqual(vectors.keys(), got.keys())
+                for ct, vec in vectors.items():
+                    scale = np.abs(vec).max()
+                    self.assertTrue(np.allclose(got[ct], vec,
+                                                atol=atol * scale))
+
+    def test_has_quantised_vectors(self):
+        for info in self.quantised.cui2info.values():
+            for vec in (info['context_vectors'] or {}).values():
+                self.assertEqual(vec.dtype, np.int8)
+
+    def test_has_half_precision_vectors(self):
+        for info in self.half.cui2info.values():
+            for vec in (info['context_vectors'] or {}).values():
+                self.assertEqual(vec.dtype, np.float16)
+
+    def test_uses_less_memory(self):
+        full_size = self.frozen.get_context_vectors_size()
+        self.assertLess(self.half.get_context_vectors_size(), full_size)
+        self.assertLess(self.quantised.get_context_vectors_size(),
+                        self.half.get_context_vectors_size())
+
+    def test_restores_vectors(self):
+        self.assert_close_vectors(self.quantised.to_cdb(), atol=1 / 127)
+        self.assert_close_vectors(self.half.to_cdb(), atol=1e-3)
+
+    def test_can_requantise(self):
+        requantised = FrozenCDB.from_cdb(self.quantised, "int8")
+        self.assert_close_vectors(requantised.to_cdb(), atol=2 / 127)
+
+    def test_can_save_and_load(self):
+        for serialiser in ('dill', 'json'):
+            with self.subTest(serialiser):
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    self.quantised.save(temp_dir, serialiser=serialiser)
+                    loaded = CDB.load(temp_dir)
+                self.assertIsInstance(loaded, FrozenCDB)
+                self.assert_close_vectors(loaded.to_cdb(), atol=1 / 127)
+
+    def test_fails_for_other_types(self):
+        with self.assertRaises(ValueError):
+            FrozenCDB.from_cdb(self.cdb, np.int32)
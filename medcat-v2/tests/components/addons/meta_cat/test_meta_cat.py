@@ -127,3 +127,21 @@ class MetaCATWithCATTests(MetaCATBaseTests):
                 self.assertEqual(
                     meta_cat.get_meta_annotations(ent),
                     ents[num]["meta_anns"])
+
+    def test_batched_meta_anns_are_same(self):
+        texts = [
+            "This is a fit text for rich and chronic disease like fittest.",
+            "Nothing of interest here.",
+            "Chronic disease and fittest of rich texts.",
+        ]
+        docs = list(self.cat.pipe(texts, batch_size=2))
+        self.assertEqual(len(docs), len(texts))
+        for text, doc in zip(texts, docs):
+            exp_doc = self.cat(text)
+            self.assertEqual(len(doc.linked_ents), len(exp_doc.linked_ents))
+            for num, (ent, exp_ent) in enumerate(
+                    zip(doc.linked_ents, exp_doc.linked_ents)):
+                with self.subTest(f"{text} - entity {num}"):
+                    self.assertEqual(
+                        meta_cat.get_meta_annotations(ent),
+                        meta_cat.get_meta_annotations(exp_ent))
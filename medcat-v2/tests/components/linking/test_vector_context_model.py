@@ -0,0 +1,229 @@
+from medcat.components.linking import vector_context_model
+from medcat.cdb.concepts import get_new_cui_info
+from medcat.config.config import Linking
+from medcat.tokenizing.regex_impl.tokenizer import RegexTokenizer
+from medcat.utils.defaults import default_weighted_average
+from medcat.utils.matutils import quantise_int8
+from medcat.vocab import Vocab
+
+import numpy as np
+
+import random
+import unittest
+
+
+class VectorisedSimilarityTests(unittest.TestCase):
+    vec_size = 30
+    num_cuis = 100
+
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.config = Linking()
+        self.context_types = list(self.config.context_vector_sizes)
+        self.cui2info = {}
+        for num in range(self.num_cuis):
+            cui = f"C{num}"
+            # NOTE: some untrained and some with partial context vectors
+            if num % 10 == 0:
+                vectors = {}
+            elif num % 7 == 0:
+                vectors = {self.context_types[0]: self._rand_vec()}
+            else:
+                vectors = {ct: self._rand_vec() for ct in self.context_types}
+            self.cui2info[cui] = get_new_cui_info(
+                cui, cui, count_train=num % 4, context_vectors=vectors)
+        self.cm = vector_context_model.ContextModel(
+            self.cui2info, {}, lambda step: 1.0, None, self.config, "~")
+        self.cuis = list(self.cui2info)
+
+    def _rand_vec(self) -> np.ndarray:
+        return self.rng.standard_normal(self.vec_size)
+
+    def _doc_vectors(self) -> dict[str, np.ndarray]:
+        return {ct: self._rand_vec() for ct in self.context_types}
+
+    def assert_same_similarities(self, vectors: dict[str, np.ndarray]):
+        got = self.cm._similarities(self.cuis, vectors)
+        exp = [self.cm._similarity(cui, vectors) for cui in self.cuis]
+        self.assertEqual(len(got), len(exp))
+        for cui, g, e in zip(self.cuis, got, exp):
+            with self.subTest(cui):
+                self.assertAlmostEqual(g, e, places=5)
+
+    def test_same_as_per_cui_similarities(self):
+        for _ in range(3):
+            self.assert_same_similarities(self._doc_vectors())
+
+    def test_same_with_missing_doc_context_types(self):
+        vectors = self._doc_vectors()
+        del vectors[self.context_types[0]]
+        self.assert_same_similarities(vectors)
+
+    def test_untrained_is_negative(self):
+        sims = self.cm._similarities(["C0", "C10"], self._doc_vectors())
+        self.assertEqual(sims, [-1, -1])
+
+    def test_updates_upon_training(self):
+        vectors = self._doc_vectors()
+        self.assert_same_similarities(vectors)
+        cui = "C1"
+        vector_context_model.update_context_vectors(
+            self.cui2info[cui]['context_vectors'], cui, self._doc_vectors(),
+            lr=0.5, negative=False)
+        self.assert_same_similarities(vectors)
+
+    def test_follows_weight_changes(self):
+        vectors = self._doc_vectors()
+        self.assert_same_similarities(vectors)
+        self.config.context_vector_weights = {
+            self.context_types[0]: 0.5, self.context_types[1]: 0.5}
+        self.assert_same_similarities(vectors)
+
+    def test_grows_for_many_cuis(self):
+        capacity = vector_context_model.CUIContextMatrix._INITIAL_CAPACITY
+        self.assertGreater(self.num_cuis, capacity)
+        self.assert_same_similarities(self._doc_vectors())
+
+    def test_follows_vector_size_changes(self):
+        self.assert_same_similarities(self._doc_vectors())
+        # NOTE: e.g upon converting the vectors to a smaller size
+        self.vec_size = 5
+        for info in self.cui2info.values():
+            info['context_vectors'] = {
+                ct: self._rand_vec()
+                for ct in info['context_vectors']}
+        self.assert_same_similarities(self._doc_vectors())
+
+    def test_cannot_get_rows_without_vectors(self):
+        matrix = vector_context_model.CUIContextMatrix(self.context_types)
+        with self.assertRaises(ValueError):
+            matrix.get_rows(["C0"], self.cui2info)
+
+
+class QuantisedSimilarityTests(VectorisedSimilarityTests):
+
+    def setUp(self):
+        super().setUp()
+        for info in self.cui2info.values():
+            info['context_vectors'] = {
+                ct: quantise_int8(vec)[0]
+                for ct, vec in info['context_vectors'].items()}
+
+    def test_updates_upon_training(self):
+        vectors = self._doc_vectors()
+        self.assert_same_similarities(vectors)
+        cui = "C1"
+        cui_vectors = dict(self.cui2info[cui]['context_vectors'])
+        vector_context_model.update_context_vectors(
+            cui_vectors, cui, self._doc_vectors(), lr=0.5, negative=False)
+        self.cui2info[cui]['context_vectors'] = {
+            ct: quantise_int8(vec)[0] for ct, vec in cui_vectors.items()}
+        self.assert_same_similarities(vectors)
+
+    def test_uses_quantised_matrices(self):
+        self.assert_same_similarities(self._doc_vectors())
+        for mat in self.cm._get_cui_matrix()._matrices.values():
+            self.assertEqual(mat.dtype, np.int8)
+
+
+def _get_context_vectors_per_type(cm: vector_context_model.ContextModel,
+                                  entity, doc, cache, cui=None) -> dict:
+    # NOTE: the original implementation that gathers the tokens and
+    #       averages their vectors separately for each context type
+    vectors = {}
+    for context_type, window_size in cm.config.context_vector_sizes.items():
+        tokens_left, tokens_center, tokens_right = cm.get_context_tokens(
+            entity, doc, window_size, cache)
+        values = list(cm._tokens2vecs(tokens_left))
+        if not cm.config.context_ignore_center_tokens:
+            values.extend(cm._preprocess_center_tokens(cui, tokens_center))
+        values.extend(cm._tokens2vecs(tokens_right))
+        if values:
+            vectors[context_type] = np.average(values, axis=0)
+    return vectors
+
+
+class PrecomputedContextVectorsTests(unittest.TestCase):
+    vec_size = 30
+    text = ("The patient presented with severe chest pain , and a history "
+            "of diabetes . No signs of kidney failure were found upon the "
+            "examination , but chronic back pain was noted today . " * 5)
+    no_vec_words = {"the", "of", "pain"}
+    skipped_words = {"and", "no"}
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.vocab = Vocab()
+        for word in set(self.text.lower().split()):
+            vec = (None if word in self.no_vec_words else
+                   rng.standard_normal(self.vec_size).astype(np.float32))
+            self.vocab.add_word(word, cnt=10, vec=vec)
+        self.config = Linking()
+        self.cui2info = {"C1": get_new_cui_info(
+            "C1", "C1", names={"heart~attack", "cardiac~arrest~pain"})}
+        self.cm = vector_context_model.ContextModel(
+            self.cui2info, {}, default_weighted_average, self.vocab,
+            self.config, "~")
+        self.tokenizer = RegexTokenizer()
+        self.doc = self.tokenizer(self.text)
+        for tkn in self.doc:
+            if tkn.base.lower in self.skipped_words:
+                tkn.to_skip = True
+            if tkn.base.text in {",", "."}:
+                tkn.is_punctuation = True
+        self.entities = [
+            self.tokenizer.create_entity(self.doc, start, start + length, "")
+            for start, length in [(0, 1), (5, 2), (12, 1), (30, 3),
+                                  (len(self.doc) - 2, 1),
+                                  (len(self.doc) - 1, 1)]]
+
+    def assert_same_vectors(self, got: dict, exp: dict):
+        self.assertEqual(got.keys(), exp.keys())
+        for context_type, vec in exp.items():
+            with self.subTest(context_type):
+                self.assertEqual(got[context_type].dtype, vec.dtype)
+                self.assertTrue(np.allclose(got[context_type], vec,
+                                            atol=1e-6))
+
+    def assert_same_for_all_entities(self, cui=None):
+        cache = vector_context_model.PerDocumentTokenCache()
+        for ent in self.entities:
+            with self.subTest(ent.base.text):
+                random.seed(ent.base.start_index)
+                exp = _get_context_vectors_per_type(
+                    self.cm, ent, self.doc,
+                    vector_context_model.PerDocumentTokenCache(), cui)
+                random.seed(ent.base.start_index)
+                got = self.cm.get_context_vectors(ent, self.doc, cache, cui)
+                self.assert_same_vectors(got, exp)
+
+    def test_same_as_per_context_type(self):
+        self.assert_same_for_all_entities()
+
+    def test_same_when_ignoring_center(self):
+        self.config.context_ignore_center_tokens = True
+        self.assert_same_for_all_entities()
+
+    def test_same_with_name_replacement(self):
+        self.config.random_replacement_unsupervised = 0.5
+        self.assert_same_for_all_entities(cui="C1")
+
+    def test_same_with_other_window_sizes(self):
+        self.config.context_vector_sizes = {"wide": 40, "narrow": 1}
+        self.assert_same_for_all_entities()
+
+    def test_no_vectors_without_known_words(self):
+        doc = self.tokenizer("unknown words only here")
+        ent = self.tokenizer.create_entity(doc, 1, 2, "")
+        vectors = self.cm.get_context_vectors(
+            ent, doc, vector_context_model.PerDocumentTokenCache())
+        self.assertEqual(vectors, {})
+
+    def test_token_vectors_are_per_document(self):
+        cache = vector_context_model.PerDocumentTokenCache()
+        token_vecs = cache.get_token_vectors(self.doc, self.vocab)
+        self.assertIs(cache.get_token_vectors(self.doc, self.vocab),
+                      token_vecs)
+        other_doc = self.tokenizer(self.text)
+        self.assertIsNot(cache.get_token_vectors(other_doc, self.vocab),
+                         token_vecs)
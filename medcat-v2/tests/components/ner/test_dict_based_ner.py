@@ -0,0 +1,102 @@
+import os
+
+from medcat.components.ner import dict_based_ner
+from medcat.components import types
+from medcat.config import Config
+from medcat.preprocessors.cleaners import NameDescriptor
+from medcat.model_creation.cdb_maker import CDBMaker
+from medcat.pipeline.pipeline import Pipeline
+from medcat.storage.serialisers import serialise, deserialise
+from medcat.vocab import Vocab
+
+import unittest
+import unittest.mock
+import tempfile
+
+
+class DictNERTests(unittest.TestCase):
+    CDB_PREPROCESSED_PATH = os.path.join(
+        os.path.dirname(__file__), '..', '..', 'resources',
+        'preprocessed4cdb.txt'
+    )
+    TEXT = "Diabetes mellitus, mellitus diabetes and high temperature, fever"
+    NEW_NAME = NameDescriptor(
+        tokens=["mellitus", "diabetes"],
+        snames={"mellitus", "mellitus~diabetes"},
+        raw_name="mellitus diabetes", is_upper=False)
+
+    def setUp(self):
+        self.cnf = Config()
+        self.cnf.components.ner.comp_name = 'dict'
+        self.cdb = CDBMaker(self.cnf).prepare_csvs(
+            [self.CDB_PREPROCESSED_PATH])
+        self.pipe = Pipeline(self.cdb, Vocab(), None)
+        self.ner = self.pipe.get_component(types.CoreComponentType.ner)
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def get_cuis(self, ner: dict_based_ner.NER) -> set[str]:
+        doc = self.pipe.tokenizer_with_tag(self.TEXT)
+        doc = self.pipe.get_component(
+            types.CoreComponentType.token_normalizing)(doc)
+        return {cui for ent in ner(doc).ner_ents
+                for cui in ent.link_candidates}
+
+    def save_and_load(self) -> dict_based_ner.NER:
+        serialise('dill', self.ner, self.temp_dir)
+        ner = deserialise(self.temp_dir, cnf=self.cnf.components.ner,
+                          tokenizer=self.pipe.tokenizer, cdb=self.cdb,
+                          vocab=None, model_load_path=None)
+        self.assertIsInstance(ner, dict_based_ner.NER)
+        return ner
+
+    def test_is_dict_based(self):
+        self.assertIsInstance(self.ner, dict_based_ner.NER)
+
+    def test_finds_entities(self):
+        self.assertTrue(self.get_cuis(self.ner))
+
+    def test_reuses_saved_automaton(self):
+        with unittest.mock.patch.object(
+                dict_based_ner.NER, '_rebuild_automaton') as rebuild:
+            loaded = self.save_and_load()
+        rebuild.assert_not_called()
+        self.assertEqual(self.get_cuis(loaded), self.get_cuis(self.ner))
+
+    def test_rebuilds_saved_automaton_upon_changed_names(self):
+        serialise('dill', self.ner, self.temp_dir)
+        self.cdb.add_names("C99", {"mellitus~diabetes": self.NEW_NAME})
+        ner = deserialise(self.temp_dir, cnf=self.cnf.components.ner,
+                          tokenizer=self.pipe.tokenizer, cdb=self.cdb,
+                          vocab=None, model_load_path=None)
+        self.assertIn("C99", self.get_cuis(ner))
+
+    def test_saves_automaton_for_current_names(self):
+        self.cdb.add_names("C99", {"mellitus~diabetes": self.NEW_NAME})
+        self.assertIn("C99", self.get_cuis(self.save_and_load()))
+
+    def test_defers_rebuild_upon_added_names(self):
+        self.cnf.components.ner.automaton_rebuild_interval = 2
+        self.cdb.add_names("C99", {"mellitus~diabetes": self.NEW_NAME})
+        self.assertNotIn("C99", self.get_cuis(self.ner))
+        self.assertNotIn("C99", self.get_cuis(self.ner))
+        self.assertIn("C99", self.get_cuis(self.ner))
+
+    def test_rebuilds_immediately_without_interval(self):
+        self.cnf.components.ner.automaton_rebuild_interval = 0
+        self.cdb.add_names("C99", {"mellitus~diabetes": self.NEW_NAME})
+        self.assertIn("C99", self.get_cuis(self.ner))
+
+    def test_rebuilds_immediately_by_default(self):
+        self.cdb.add_names("C99", {"mellitus~diabetes": self.NEW_NAME})
+        self.assertIn("C99", self.get_cuis(self.ner))
+
+    def test_ignores_removed_names_before_rebuild(self):
+        self.cnf.components.ner.automaton_rebuild_interval = 2
+        cuis = self.get_cuis(self.ner)
+        removed = cuis.pop()
+        self.cdb.remove_cui(removed)
+        self.assertEqual(self.get_cuis(self.ner), cuis)
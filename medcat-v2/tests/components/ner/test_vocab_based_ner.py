@@ -1,6 +1,14 @@
+import os
+
 from medcat.components.ner import vocab_based_ner
+from medcat.components.ner.vocab_based_annotator import maybe_annotate_name
 from medcat.components import types
 from medcat.config import Config
+from medcat.preprocessors.cleaners import NameDescriptor
+from medcat.model_creation.cdb_maker import CDBMaker
+from medcat.pipeline.pipeline import Pipeline
+from medcat.utils.cdb_state import captured_state_cdb
+from medcat.vocab import Vocab
 
 import unittest
 
@@ -38,3 +46,140 @@ class NerInitTests(ComponentInitTests, unittest.TestCase):
         cls.cdb_vocab = dict()
         cls.cdb = FakeCDB(Config())
         return super().setUpClass()
+
+
+def _get_ents_with_string_probes(ner: vocab_based_ner.NER, doc) -> list:
+    # NOTE: the original implementation that builds the candidate names
+    #       as strings and probes the CDB for each
+    config, cdb, sep = ner.config, ner.cdb, ner.config.general.separator
+    _doc = [tkn for tkn in doc if not tkn.to_skip]
+    for i, tkn in enumerate(_doc):
+        tkns = [tkn]
+        name = ""
+        for name_version in tkn.base.text_versions:
+            if cdb.has_subname(name_version):
+                name = name_version
+                break
+        if name in cdb.name2info and not tkn.base.is_stop:
+            maybe_annotate_name(ner.tokenizer, name, tkns, doc, cdb, config)
+        if not name:
+            continue
+        for j in range(i + 1, len(_doc)):
+            if (_doc[j].base.index - _doc[j - 1].base.index - 1
+                    > config.components.ner.max_skip_tokens):
+                break
+            tkn = _doc[j]
+            tkns.append(tkn)
+            name_changed = False
+            name_reverse = None
+            for name_version in tkn.base.text_versions:
+                if cdb.has_subname(name + sep + name_version):
+                    name = name + sep + name_version
+                    name_changed = True
+                    break
+                if config.components.ner.try_reverse_word_order:
+                    if cdb.has_subname(name_version + sep + name):
+                        name_reverse = name_version + sep + name
+            if name_changed:
+                if name in cdb.name2info:
+                    maybe_annotate_name(ner.tokenizer, name, tkns, doc, cdb,
+                                        config)
+            elif name_reverse is not None:
+                if name_reverse in cdb.name2info:
+                    maybe_annotate_name(ner.tokenizer, name_reverse, tkns,
+                                        doc, cdb, config)
+            else:
+                break
+    return doc
+
+
+class NERTrieTests(unittest.TestCase):
+    CDB_PREPROCESSED_PATH = os.path.join(
+        os.path.dirname(__file__), '..', '..', 'resources',
+        'preprocessed4cdb.txt'
+    )
+    texts = [
+        "The fittest most fit of chronic kidney failure",
+        "Loss of kidney function and loss of function of the kidney.",
+        "Diabetes mellitus, mellitus diabetes and high temperature, fever",
+        "kidney, failure, kidney failure kidney",
+        "",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cnf = Config()
+        cls.cdb = CDBMaker(cls.cnf).prepare_csvs([cls.CDB_PREPROCESSED_PATH])
+        cls.pipe = Pipeline(cls.cdb, Vocab(), None)
+        cls.ner = cls.pipe.get_component(types.CoreComponentType.ner)
+
+    def get_ents(self, text: str, reference: bool) -> list:
+        doc = self.pipe.tokenizer_with_tag(text)
+        doc = self.pipe.get_component(
+            types.CoreComponentType.token_normalizing)(doc)
+        if reference:
+            doc = _get_ents_with_string_probes(self.ner, doc)
+        else:
+            doc = self.ner(doc)
+        return [(ent.base.start_index, ent.base.end_index,
+                 ent.detected_name, ent.link_candidates)
+                for ent in doc.ner_ents]
+
+    def assert_same_ents(self):
+        for text in self.texts:
+            with self.subTest(text):
+                got = self.get_ents(text, reference=False)
+                self.assertEqual(got, self.get_ents(text, reference=True))
+
+    def test_is_trie_based(self):
+        self.assertIsInstance(self.ner, vocab_based_ner.NER)
+
+    def test_finds_entities(self):
+        self.assertTrue(self.get_ents(self.texts[0], reference=False))
+
+    def test_same_ents_as_string_probes(self):
+        self.assert_same_ents()
+
+    def test_same_ents_with_reverse_word_order(self):
+        ner_cnf = self.cnf.components.ner
+        ner_cnf.try_reverse_word_order = True
+        try:
+            self.assert_same_ents()
+        finally:
+            ner_cnf.try_reverse_word_order = False
+
+    def test_follows_cdb_changes(self):
+        self.assert_same_ents()
+        prev_subnames = set(self.cdb._subnames)
+        self.cdb.add_names("C99", {"mellitus~diabetes": NameDescriptor(
+            tokens=["mellitus", "diabetes"],
+            snames={"mellitus", "mellitus~diabetes"},
+            raw_name="mellitus diabetes", is_upper=False)})
+        try:
+            self.assertIn("C99", [
+                cui for ent in self.get_ents(self.texts[2], reference=False)
+                for cui in ent[-1]])
+            self.assert_same_ents()
+        finally:
+            self.cdb.remove_cui("C99")
+        self.assertEqual(self.cdb._subnames, prev_subnames)
+        self.assert_same_ents()
+
+    def test_follows_cdb_changes_of_same_size(self):
+        self.assert_same_ents()
+        with captured_state_cdb(self.cdb):
+            num_subnames = len(self.cdb._subnames)
+            self.cdb.remove_cui("C03")
+            # NOTE: the new name has as many (new) subnames as were removed
+            tokens = ["plugh"] * (num_subnames - len(self.cdb._subnames))
+            self.cdb.add_names("C99", {"~".join(tokens): NameDescriptor(
+                tokens=tokens,
+                snames={"~".join(tokens[:i + 1]) for i in range(len(tokens))},
+                raw_name=" ".join(tokens), is_upper=False)})
+            self.assertEqual(len(self.cdb._subnames), num_subnames)
+            self.assertIn("C99", [
+                cui for ent in self.get_ents(" ".join(tokens),
+                                             reference=False)
+                for cui in ent[-1]])
+            self.assert_same_ents()
+        self.assert_same_ents()
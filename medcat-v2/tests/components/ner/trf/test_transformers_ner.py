@@ -12,6 +12,7 @@ from medcat.components.ner.trf.transformers_ner import (
     TransformersNER, TransformersNERComponent, _save_component)
 from medcat.config.config_transformers_ner import ConfigTransformersNER
 from medcat.model_creation.cdb_maker import CDBMaker
+from medcat.tokenizing.regex_impl.tokenizer import RegexTokenizer
 from transformers import TrainerCallback
 
 from unittest import TestCase
@@ -34,6 +35,34 @@ class TransformersNERTests(TestCase):
         self.assertIsInstance(self.tner, ManualSerialisable)
 
 
+class TransformersNERBatchingTests(TestCase):
+    TEXTS = ["Patient has diabetes.", "History of hypertension.",
+             "Diagnosed with asthma."]
+
+    def setUp(self):
+        self.cnf = ConfigTransformersNER()
+        self.cnf.general.pipe_batch_size = 2
+        with unittest.mock.patch.object(
+                transformers_ner, 'AutoModelForTokenClassification'):
+            with unittest.mock.patch.object(
+                    transformers_ner, 'AutoTokenizer'):
+                self.component = TransformersNERComponent(
+                    CDB(Config()), RegexTokenizer(), config=self.cnf,
+                    training_arguments=unittest.mock.Mock())
+        self.component.ner_pipe = unittest.mock.Mock(
+            return_value=[[] for _ in self.TEXTS])
+        self.tokenizer = RegexTokenizer()
+
+    def test_pipes_all_docs_at_once(self):
+        docs = [self.tokenizer(text) for text in self.TEXTS]
+        out = list(self.component.pipe(iter(docs)))
+        self.assertEqual(out, docs)
+        self.component.ner_pipe.assert_called_once()
+        args, kwargs = self.component.ner_pipe.call_args
+        self.assertEqual(args[0], self.TEXTS)
+        self.assertEqual(kwargs["batch_size"], 2)
+
+
 class TestTransformersNER(TestCase):
 
     @classmethod
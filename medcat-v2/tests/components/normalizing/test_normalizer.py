@@ -1,10 +1,17 @@
+import os
+
 from medcat.components.normalizing import normalizer
 from medcat.components import types
+from medcat.config import Config
+from medcat.model_creation.cdb_maker import CDBMaker
+from medcat.pipeline.pipeline import Pipeline
+from medcat.storage.serialisers import serialise, deserialise
 from medcat.vocab import Vocab
 
 import unittest
+import tempfile
 
-from ..helper import ComponentInitTests
+from ..helper import ComponentInitTests, FakeCDB
 
 
 class FakeDocument:
@@ -31,3 +38,180 @@ class NormaliserInitTests(ComponentInitTests, unittest.TestCase):
         cls.cdb_vocab = dict()
         cls.vocab = Vocab()
         return super().setUpClass()
+
+
+class SpellCheckerTests(unittest.TestCase):
+    VOCAB = {"kidney": 10, "kidneys": 3, "failure": 5, "fever": 7,
+             "fewer": 2, "diabetes": 4, "diabetic": 6, "mellitus": 1,
+             "café": 2, "ab": 1, "ba": 1}
+    WORDS = ["kidny", "kindey", "kidneyy", "fevr", "feber", "failrue",
+             "diabetus", "dibetes", "mellitsu", "cafe", "cafx", "ba", "xx",
+             "kdny", "melitsu", "a", ""]
+
+    def setUp(self):
+        self.cnf = Config()
+        self.vocab = dict(self.VOCAB)
+        self.checker = normalizer.BasicSpellChecker(self.vocab, self.cnf)
+
+    def get_reference(self, word: str) -> set[str]:
+        # NOTE: the original implementation that generates all the edits
+        checker = self.checker
+        if self.cnf.general.spell_check_deep:
+            return set(checker.known([word]) or
+                       checker.known(checker.edits1(word)) or
+                       checker.known(checker.edits2(word)) or
+                       [word])
+        return set(checker.known([word]) or
+                   checker.known(checker.edits1(word)) or [word])
+
+    def assert_same_candidates(self):
+        for word in self.WORDS:
+            with self.subTest(word):
+                self.assertEqual(set(self.checker.candidates(word)),
+                                 self.get_reference(word))
+
+    def test_same_candidates_as_edits(self):
+        self.assert_same_candidates()
+
+    def test_same_candidates_as_deep_edits(self):
+        self.cnf.general.spell_check_deep = True
+        self.assert_same_candidates()
+
+    def test_same_candidates_with_diacritics(self):
+        self.cnf.general.diacritics = True
+        self.cnf.general.spell_check_deep = True
+        self.assert_same_candidates()
+
+    def test_fixes_most_frequent(self):
+        self.assertEqual(self.checker.fix("kidnes"), "kidney")
+        self.assertEqual(self.checker.fix("fevr"), "fever")
+
+    def test_does_not_fix_known(self):
+        self.assertIsNone(self.checker.fix("kidney"))
+
+    def test_indexes_new_words(self):
+        self.assertIsNone(self.checker.fix("nephron"))
+        self.vocab["nephro"] = 1
+        self.assertEqual(self.checker.fix("nephron"), "nephro")
+
+    def test_saved_index_is_reused(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.checker.save_index(temp_dir)
+            checker = normalizer.BasicSpellChecker(self.vocab, self.cnf)
+            self.assertTrue(checker.load_index(temp_dir))
+        self.assertEqual(checker._deletes, self.checker._deletes)
+        self.assertEqual(checker.fix("kidny"), "kidney")
+
+    def test_saved_index_is_not_used_for_changed_vocab(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.checker.save_index(temp_dir)
+            self.vocab["nephro"] = 1
+            checker = normalizer.BasicSpellChecker(self.vocab, self.cnf)
+            self.assertFalse(checker.load_index(temp_dir))
+        self.assertEqual(checker.fix("nephron"), "nephro")
+
+    def test_loads_set_index_upon_first_use(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.checker.save_index(temp_dir)
+            checker = normalizer.BasicSpellChecker(self.vocab, self.cnf)
+            checker.set_index_folder(temp_dir)
+            self.assertEqual(checker._deletes, {})
+            self.assertEqual(checker.fix("kidny"), "kidney")
+        self.assertEqual(checker._deletes, self.checker._deletes)
+
+    def _serialise_normalizer(self, temp_dir: str
+                              ) -> normalizer.TokenNormalizer:
+        cdb = FakeCDB(self.cnf)
+        cdb.token_counts = self.vocab
+        norm = normalizer.TokenNormalizer.create_new_component(
+            self.cnf.components.token_normalizing, FakeTokenizer(), cdb,
+            Vocab(), None)
+        serialise('dill', norm, temp_dir)
+        loaded = deserialise(
+            temp_dir, cnf=self.cnf.components.token_normalizing,
+            tokenizer=FakeTokenizer(), cdb=cdb, vocab=Vocab(),
+            model_load_path=None)
+        self.assertIsInstance(loaded, normalizer.TokenNormalizer)
+        return loaded
+
+    def test_normalizer_does_not_save_index_by_default(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._serialise_normalizer(temp_dir)
+            self.assertFalse(os.path.exists(os.path.join(
+                temp_dir, normalizer.BasicSpellChecker.INDEX_FILE)))
+
+    def test_normalizer_saves_index(self):
+        self.cnf.general.save_spell_check_index = True
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loaded = self._serialise_normalizer(temp_dir)
+            self.assertTrue(os.path.exists(os.path.join(
+                temp_dir, normalizer.BasicSpellChecker.INDEX_FILE)))
+            # NOTE: only loaded upon first use
+            self.assertEqual(loaded.spell_checker._num_indexed, 0)
+            self.assertEqual(loaded.spell_checker.fix("kidny"), "kidney")
+        self.checker.update_index()
+        self.assertEqual(loaded.spell_checker._deletes,
+                         self.checker._deletes)
+        self.assertEqual(loaded.spell_checker._num_indexed, len(self.vocab))
+
+
+class NormalizerCacheTests(unittest.TestCase):
+    CDB_PREPROCESSED_PATH = os.path.join(
+        os.path.dirname(__file__), '..', '..', 'resources',
+        'preprocessed4cdb.txt'
+    )
+    TEXTS = [
+        "The kidny failure of the kidney and chronic kidny failure.",
+        "Diabetes mellitus, mellitus diabetes and fevr, fever.",
+        "The kidny failure of the kidney and chronic kidny failure.",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cnf = Config()
+        cls.cnf.general.spell_check_len_limit = 4
+        cls.cdb = CDBMaker(cls.cnf).prepare_csvs([cls.CDB_PREPROCESSED_PATH])
+
+    def setUp(self):
+        self.pipe = Pipeline(self.cdb, Vocab(), None)
+        self.norm = self.pipe.get_component(
+            types.CoreComponentType.token_normalizing)
+
+    def get_norms(self, norm: normalizer.TokenNormalizer,
+                  text: str) -> list[tuple[str, bool]]:
+        doc = norm(self.pipe.tokenizer_with_tag(text))
+        return [(tkn.norm, tkn.to_skip) for tkn in doc]
+
+    def test_same_norms_as_uncached(self):
+        uncached = normalizer.TokenNormalizer(
+            self.pipe.tokenizer, self.cnf, self.cdb.token_counts)
+        uncached._norm_cache.max_size = uncached._fix_cache.max_size = 0
+        for text in self.TEXTS:
+            with self.subTest(text):
+                self.assertEqual(self.get_norms(self.norm, text),
+                                 self.get_norms(uncached, text))
+
+    def test_fixes_spelling(self):
+        self.assertIn(("kidney", False),
+                      self.get_norms(self.norm, self.TEXTS[0]))
+
+    def test_caches_repeated_tokens(self):
+        for text in self.TEXTS:
+            self.get_norms(self.norm, text)
+        stats = self.norm.get_cache_stats()
+        self.assertGreater(stats['norm']['hits'], 0)
+        self.assertEqual(stats['norm']['hits'] + stats['norm']['misses'],
+                         sum(len(self.pipe.tokenizer_with_tag(text))
+                             for text in self.TEXTS))
+        # NOTE: "kidny" is only fixed upon the first miss
+        self.assertEqual(stats['fix']['misses'], 2)
+
+    def test_clears_cache_upon_new_words(self):
+        self.get_norms(self.norm, self.TEXTS[0])
+        self.assertTrue(self.norm.get_cache_stats()['norm']['size'])
+        self.cdb.token_counts["kidny"] = 1
+        try:
+            self.assertIn(("kidny", False),
+                          self.get_norms(self.norm, self.TEXTS[0]))
+        finally:
+            del self.cdb.token_counts["kidny"]
@@ -1,5 +1,9 @@
+import re
+
 from medcat.components.tagging import tagger
 from medcat.components import types
+from medcat.config import Config
+from medcat.tokenizing.tokenizers import create_tokenizer
 
 import unittest
 
@@ -11,3 +15,82 @@ class TaggerInitTests(ComponentInitTests, unittest.TestCase):
     default_cls = tagger.TagAndSkipTagger
     default_creator = tagger.TagAndSkipTagger.create_new_component
     module = tagger
+
+
+class TaggerTests(unittest.TestCase):
+    TEXT = ("The patient (nos) had NOS kidney failure, i.e. chronic "
+            "kidney failure: see nos-like 1.5 notes.")
+
+    def setUp(self):
+        self.cnf = Config()
+        self.cnf.general.nlp.provider = 'regex'
+        self.tokenizer = create_tokenizer('regex', self.cnf)
+        self.tagger = tagger.TagAndSkipTagger(self.cnf.preprocessing)
+
+    def get_tags(self, tagger: tagger.TagAndSkipTagger
+                 ) -> list[tuple[str, bool, bool]]:
+        doc = tagger(self.tokenizer(self.TEXT))
+        return [(tkn.base.text, tkn.is_punctuation, tkn.to_skip)
+                for tkn in doc]
+
+    def get_reference_tags(self) -> list[tuple[str, bool, bool]]:
+        # NOTE: the original implementation that matches every token
+        cnf_p = self.cnf.preprocessing
+        word_skipper = re.compile('^({})$'.format(
+            '|'.join(cnf_p.words_to_skip)))
+        punct_checker = re.compile(r'[^a-z0-9]+')
+        doc = self.tokenizer(self.TEXT)
+        for token in doc:
+            if (punct_checker.match(token.base.lower) and
+                    token.base.text not in cnf_p.keep_punct):
+                token.is_punctuation = True
+                token.to_skip = True
+            elif word_skipper.match(token.base.lower):
+                token.to_skip = True
+            elif cnf_p.skip_stopwords and token.base.is_stop:
+                token.to_skip = True
+        return [(tkn.base.text, tkn.is_punctuation, tkn.to_skip)
+                for tkn in doc]
+
+    def test_same_tags_as_reference(self):
+        expected = self.get_reference_tags()
+        self.assertIn(("nos", False, True), expected)
+        self.assertIn((",", True, True), expected)
+        # NOTE: twice so the second is from the memo
+        self.assertEqual(self.get_tags(self.tagger), expected)
+        self.assertEqual(self.get_tags(self.tagger), expected)
+
+    def test_same_tags_with_patterns(self):
+        self.cnf.preprocessing.words_to_skip = {'nos', 'ch.*c', 'i\\.e'}
+        tgr = tagger.TagAndSkipTagger(self.cnf.preprocessing)
+        self.assertEqual(tgr.skip_words, {'nos'})
+        self.assertIsNotNone(tgr.word_skipper)
+        self.assertEqual(self.get_tags(tgr), self.get_reference_tags())
+
+    def test_literal_words_are_not_regex(self):
+        self.assertEqual(self.tagger.skip_words, {'nos'})
+        self.assertIsNone(self.tagger.word_skipper)
+
+    def test_memoises_texts(self):
+        self.get_tags(self.tagger)
+        self.assertIn("kidney", self.tagger._memo)
+        self.assertLess(len(self.tagger._memo),
+                        len(self.tokenizer(self.TEXT)))
+
+    def test_memo_is_bounded(self):
+        self.cnf.preprocessing.tagging_cache_size = 3
+        self.get_tags(self.tagger)
+        self.assertLessEqual(len(self.tagger._memo), 3)
+        self.assertEqual(self.get_tags(self.tagger),
+                         self.get_reference_tags())
+
+    def test_memo_can_be_disabled(self):
+        self.cnf.preprocessing.tagging_cache_size = 0
+        self.assertEqual(self.get_tags(self.tagger),
+                         self.get_reference_tags())
+        self.assertFalse(self.tagger._memo)
+
+    def test_follows_config_changes(self):
+        self.get_tags(self.tagger)
+        self.cnf.preprocessing.keep_punct = {'.', ':', ','}
+        self.assertIn((",", False, False), self.get_tags(self.tagger))
@@ -1,10 +1,16 @@
 from medcat.pipeline import pipeline
+from medcat.pipeline import profiling
 from medcat.vocab import Vocab
 from medcat.config import Config
+from medcat.config.config import ComponentConfig
+from medcat.cdb import CDB
 
 from ..components.ner.test_vocab_based_ner import FakeCDB as BFakeCDB
 
 import unittest
+from unittest.mock import patch
+import threading
+import time
 
 
 class FakeCDB(BFakeCDB):
@@ -30,3 +36,169 @@ class PlatformInitTests(unittest.TestCase):
     def test_can_create_pipeline(self):
         pf = pipeline.Pipeline(self.cdb, self.vocab, None)
         self.assertIsInstance(pf, pipeline.Pipeline)
+
+
+class _BatchCountingComponent:
+    full_name = "tagging:batch_counting"
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, doc):
+        raise AssertionError("Should have been run over the batch")
+
+    def pipe(self, docs):
+        self.batch_sizes.append(len(docs))
+        return docs
+
+
+class PipelinePipeTests(unittest.TestCase):
+    texts = [
+        "The dog is sitting outside the house.",
+        "Some other text",
+        "",
+        "And a fourth one.",
+        "And a fifth",
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cnf = Config()
+        cls.cdb = CDB(cls.cnf)
+        cls.vocab = Vocab()
+        cls.pf = pipeline.Pipeline(cls.cdb, cls.vocab, None)
+
+    def test_gets_docs_in_order(self):
+        docs = list(self.pf.pipe(self.texts, batch_size=2))
+        self.assertEqual([doc.base.text for doc in docs], self.texts)
+
+    def test_gets_same_tokens_as_get_doc(self):
+        for text, doc in zip(self.texts, self.pf.pipe(self.texts)):
+            with self.subTest(text):
+                exp = self.pf.get_doc(text)
+                self.assertEqual([tkn.base.text for tkn in doc],
+                                 [tkn.base.text for tkn in exp])
+
+    def test_batchable_component_gets_batches(self):
+        comp = _BatchCountingComponent()
+        self.pf._components.append(comp)
+        try:
+            list(self.pf.pipe(self.texts, batch_size=2))
+        finally:
+            self.pf._components.remove(comp)
+        self.assertEqual(comp.batch_sizes, [2, 2, 1])
+
+    def test_cannot_pipe_with_non_positive_batch_size(self):
+        with self.assertRaises(ValueError):
+            list(self.pf.pipe(self.texts, batch_size=0))
+
+
+class PipelineProfilingTests(unittest.TestCase):
+    texts = PipelinePipeTests.texts
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cnf = Config()
+        cls.cdb = CDB(cls.cnf)
+        cls.vocab = Vocab()
+        cls.pf = pipeline.Pipeline(cls.cdb, cls.vocab, None)
+
+    def tearDown(self):
+        self.pf.disable_profiling()
+
+    def test_no_profile_by_default(self):
+        self.assertIsNone(self.pf.profile)
+
+    def test_profiles_every_component(self):
+        profile = self.pf.enable_profiling()
+        for text in self.texts:
+            self.pf.get_doc(text)
+        exp_names = [profiling.TOKENIZER_NAME] + [
+            comp.full_name for comp in self.pf.iter_all_components()]
+        self.assertEqual([name for name, _ in profile], exp_names)
+        for name, comp_profile in profile:
+            with self.subTest(name):
+                self.assertEqual(comp_profile.calls, len(self.texts))
+                self.assertEqual(comp_profile.docs, len(self.texts))
+                self.assertGreater(comp_profile.tokens, 0)
+                self.assertGreaterEqual(comp_profile.wall_time, 0)
+
+    def test_profiles_batches(self):
+        profile = self.pf.enable_profiling()
+        list(self.pf.pipe(self.texts, batch_size=2))
+        for name, comp_profile in profile:
+            with self.subTest(name):
+                self.assertEqual(comp_profile.calls, 3)
+                self.assertEqual(comp_profile.docs, len(self.texts))
+
+    def test_can_merge(self):
+        profile1 = self.pf.enable_profiling()
+        self.pf.get_doc(self.texts[0])
+        profile2 = self.pf.enable_profiling()
+        self.pf.get_doc(self.texts[1])
+        self.pf.get_doc(self.texts[1])
+        profile1.merge(profile2)
+        for name, comp_profile in profile1:
+            with self.subTest(name):
+                self.assertEqual(comp_profile.calls, 3)
+        self.assertEqual(set(profile1.to_dict()), set(profile2.to_dict()))
+
+
+class _SlowAddon:
+    LOAD_TIME = 0.2
+
+    def __init__(self, cnf: ComponentConfig):
+        time.sleep(self.LOAD_TIME)
+        self.config = cnf
+        self.thread = threading.get_ident()
+
+    @property
+    def full_name(self) -> str:
+        return f"addon_{self.config.comp_name}"
+
+
+class PipelineConcurrentLoadTests(unittest.TestCase):
+    NUM_ADDONS = 4
+
+    def setUp(self):
+        self.cnf = Config()
+        self.cnf.components.addons = [
+            ComponentConfig(comp_name=f"slow{num}")
+            for num in range(self.NUM_ADDONS)]
+        self.cdb = CDB(self.cnf)
+        self.vocab = Vocab()
+
+    def create_pipeline(self, num_workers: int) -> pipeline.Pipeline:
+        self.cnf.general.component_load_workers = num_workers
+        with patch.object(pipeline, "create_addon",
+                          lambda name, cnf, **kwargs: _SlowAddon(cnf)):
+            return pipeline.Pipeline(self.cdb, self.vocab, None)
+
+    def test_loads_sequentially_by_default(self):
+        pf = self.create_pipeline(1)
+        self.assertEqual(len({addon.thread for addon in pf._addons}), 1)
+
+    def test_loads_concurrently(self):
+        start = time.perf_counter()
+        pf = self.create_pipeline(self.NUM_ADDONS)
+        elapsed = time.perf_counter() - start
+        self.assertGreater(len({addon.thread for addon in pf._addons}), 1)
+        self.assertLess(elapsed, self.NUM_ADDONS * _SlowAddon.LOAD_TIME)
+
+    def test_keeps_order(self):
+        pf = self.create_pipeline(self.NUM_ADDONS)
+        exp = self.create_pipeline(1)
+        self.assertEqual([comp.full_name for comp in pf._components],
+                         [comp.full_name for comp in exp._components])
+        self.assertEqual([addon.config for addon in pf._addons],
+                         self.cnf.components.addons)
+
+    def test_has_load_times(self):
+        pf = self.create_pipeline(self.NUM_ADDONS)
+        exp_names = [profiling.TOKENIZER_NAME] + [
+            comp.full_name for comp in pf.iter_all_components()]
+        self.assertEqual(list(pf.load_times), exp_names)
+        for addon in pf.iter_addons():
+            with self.subTest(addon.full_name):
+                self.assertGreaterEqual(pf.load_times[addon.full_name],
+                                        _SlowAddon.LOAD_TIME)
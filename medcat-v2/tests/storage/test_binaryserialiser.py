@@ -0,0 +1,140 @@
+import os
+
+from medcat.storage.serialisers import AvailableSerialisers
+from medcat.storage import serialisers
+from medcat.storage.binaryserialiser import BinarySerialiser, NpyArrays
+from medcat.cdb import CDB
+from medcat.cdb.concepts import get_new_cui_info
+from medcat.config import Config
+from medcat.vocab import Vocab
+
+import numpy as np
+import unittest
+import tempfile
+
+
+def get_test_classes():
+    # NOTE: see the note in test_jsonserialiser.py
+    from .test_serialisers import (
+        SerialiserWorksTests, SerialiserFailsTests,
+        NestedSameInstanceSerialisableTests,
+        CanSerialiseCATSimple, CanSerialiseCATSlightlyComplex)
+
+    class BinarySerialiserWorksTests(SerialiserWorksTests):
+        SERIALISER_TYPE = AvailableSerialisers.binary
+
+    class BinarySerialiserFailsTests(SerialiserFailsTests):
+        SERIALISER_TYPE = AvailableSerialisers.binary
+
+    class BinaryNestedSameInstanceSerialisableTests(
+            NestedSameInstanceSerialisableTests):
+        SERIALISER_TYPE = AvailableSerialisers.binary
+
+    class BinaryCanSerialiseCAT(CanSerialiseCATSimple):
+        SERIALISER_TYPE = AvailableSerialisers.binary
+
+    class BinaryCanSerialiseCATSlightlyComplex(
+        CanSerialiseCATSlightlyComplex
+    ):
+        SERIALISER_TYPE = AvailableSerialisers.binary
+
+    return (BinarySerialiserWorksTests, BinarySerialiserFailsTests,
+            BinaryNestedSameInstanceSerialisableTests,
+            BinaryCanSerialiseCAT, BinaryCanSerialiseCATSlightlyComplex)
+
+
+# NOTE: by "dynamically" getting the classes, we avoid re-running
+#       tests on the original classes.
+CLS1, CLS2, CLS3, CLS4, CLS5 = get_test_classes()
+
+
+class NpyArraysTests(unittest.TestCase):
+    SER_TYPE = AvailableSerialisers.binary
+    VEC_SIZE = 20
+    NUM_CUIS = 10
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.cdb = CDB(Config())
+        for num in range(self.NUM_CUIS):
+            cui = f"C{num}"
+            vectors = {ct: rng.standard_normal(self.VEC_SIZE)
+                       for ct in ("short", "long")}
+            self.cdb.cui2info[cui] = get_new_cui_info(
+                cui, cui, context_vectors=vectors if num % 2 else None)
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir = self._temp_dir.name
+        serialisers.serialise(self.SER_TYPE, self.cdb, self.temp_dir)
+        self.loaded = serialisers.deserialise(self.temp_dir)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_is_binary_serialiser(self):
+        ser = serialisers.get_serialiser_from_folder(self.temp_dir)
+        self.assertIsInstance(ser, BinarySerialiser)
+
+    def test_has_same_context_vectors(self):
+        for cui, info in self.cdb.cui2info.items():
+            vectors = info['context_vectors']
+            got = self.loaded.cui2info[cui]['context_vectors']
+            with self.subTest(cui):
+                if vectors is None:
+                    self.assertIsNone(got)
+                    continue
+                self.assertEqual(vectors.keys(), got.keys())
+                for ct, vec in vectors.items():
+                    self.assertTrue(np.array_equal(vec, got[ct]))
+
+    def test_stacks_arrays_of_same_shape(self):
+        raw_file = os.path.join(self.temp_dir, BinarySerialiser.RAW_FILE)
+        arrays = NpyArrays(raw_file)
+        self.assertTrue(os.path.exists(arrays.get_array_file(0)))
+        self.assertFalse(os.path.exists(arrays.get_array_file(1)))
+        stacked = np.load(arrays.get_array_file(0))
+        num_trained = self.NUM_CUIS // 2
+        self.assertEqual(stacked.shape, (num_trained * 2, self.VEC_SIZE))
+
+    def test_vectors_are_memory_mapped(self):
+        vec = self.loaded.cui2info["C1"]['context_vectors']["short"]
+        self.assertFalse(vec.flags.owndata)
+        while not isinstance(vec, np.memmap):
+            vec = vec.base
+            self.assertIsNotNone(vec)
+
+    def test_can_modify_vectors_without_changing_files(self):
+        vec = self.loaded.cui2info["C1"]['context_vectors']["short"]
+        vec *= 2
+        reloaded = serialisers.deserialise(self.temp_dir)
+        self.assertTrue(np.array_equal(
+            reloaded.cui2info["C1"]['context_vectors']["short"],
+            self.cdb.cui2info["C1"]['context_vectors']["short"]))
+
+
+class BinaryVocabTests(unittest.TestCase):
+    SER_TYPE = AvailableSerialisers.binary
+
+    def setUp(self):
+        self.vocab = Vocab()
+        rng = np.random.default_rng(42)
+        for num in range(20):
+            self.vocab.add_word(f"word{num}", cnt=num + 1,
+                                vec=rng.standard_normal(5))
+        self.vocab.init_cumsums()
+
+    def assert_can_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.vocab.save(temp_dir, serialiser=self.SER_TYPE)
+            loaded = Vocab.load(temp_dir)
+            self.assertEqual(loaded, self.vocab)
+            for word in self.vocab.vocab:
+                with self.subTest(word):
+                    self.assertTrue(np.array_equal(loaded.vec(word),
+                                                   self.vocab.vec(word)))
+
+    def test_can_save_and_load(self):
+        self.assert_can_save_and_load()
+
+    def test_can_save_and_load_contiguous(self):
+        self.vocab.make_vectors_contiguous()
+        self.assert_can_save_and_load()
@@ -0,0 +1,182 @@
+import os
+import json
+import pickle
+
+from medcat.storage import mp_ents_save
+
+import numpy as np
+import unittest
+import tempfile
+
+
+def _get_results(start: int, num: int) -> list[tuple[str, dict]]:
+    return [
+        (str(doc_num), {
+            'entities': {
+                0: {'cui': f'C{doc_num}',
+                    'context_similarity': np.float32(0.5)}},
+            'tokens': [], 'text': None})
+        for doc_num in range(start, start + num)
+    ]
+
+
+class AnnotatedIDIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.index = mp_ents_save.AnnotatedIDIndex(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_empty_when_nothing_saved(self):
+        self.assertEqual(self.index.load(), set())
+
+    def test_can_add_and_load(self):
+        self.index.add(["1", "2"])
+        self.index.add(["3", "weird\nid"])
+        self.assertEqual(self.index.load(), {"1", "2", "3", "weird\nid"})
+
+    def test_ignores_partially_written_line(self):
+        self.index.add(["1", "2"])
+        with open(self.index.path, 'a') as f:
+            f.write('"3')
+        self.assertEqual(self.index.load(), {"1", "2"})
+
+
+class PickleSinkTests(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.save_dir = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_writes_parts_and_ids(self):
+        sink = mp_ents_save.PickleSink(self.save_dir)
+        sink.write(_get_results(0, 3))
+        sink.write(_get_results(3, 2))
+        sink.close()
+        with open(os.path.join(self.save_dir, 'annotated_ids.pickle'),
+                  'rb') as f:
+            ids, last_part_num = pickle.load(f)
+        self.assertEqual(ids, [str(num) for num in range(5)])
+        self.assertEqual(last_part_num, 1)
+        with open(os.path.join(self.save_dir, 'part_1.pickle'), 'rb') as f:
+            self.assertEqual(pickle.load(f), dict(_get_results(3, 2)))
+
+    def test_continues_after_existing_parts(self):
+        mp_ents_save.PickleSink(self.save_dir).write(_get_results(0, 3))
+        sink = mp_ents_save.PickleSink(self.save_dir)
+        self.assertEqual(sink.part_number, 1)
+        self.assertEqual(sink.get_annotated_ids(), {"0", "1", "2"})
+
+    def test_appends_ids_without_rewriting(self):
+        sink = mp_ents_save.PickleSink(self.save_dir)
+        sink.write(_get_results(0, 3))
+        sink.write(_get_results(3, 2))
+        # NOTE: the full ID file is only written upon closing
+        self.assertFalse(os.path.exists(sink.annotated_ids_path))
+        self.assertEqual(
+            mp_ents_save.AnnotatedIDIndex(self.save_dir).load(),
+            {str(num) for num in range(5)})
+
+    def test_continues_after_closed_run(self):
+        sink = mp_ents_save.PickleSink(self.save_dir)
+        sink.write(_get_results(0, 3))
+        sink.close()
+        sink = mp_ents_save.PickleSink(self.save_dir)
+        sink.write(_get_results(3, 2))
+        sink.close()
+        with open(sink.annotated_ids_path, 'rb') as f:
+            ids, last_part_num = pickle.load(f)
+        self.assertEqual(ids, [str(num) for num in range(5)])
+        self.assertEqual(last_part_num, 1)
+
+
+class JsonlSinkTests(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.save_dir = self._temp_dir.name
+        self.sink = mp_ents_save.get_sink('jsonl', self.save_dir)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_is_jsonl_sink(self):
+        self.assertIsInstance(self.sink, mp_ents_save.JsonlSink)
+
+    def test_appends_results(self):
+        self.sink.write(_get_results(0, 3))
+        self.sink.write(_get_results(3, 2))
+        with open(os.path.join(self.save_dir, 'annotations.jsonl')) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['id'] for line in lines],
+                         [str(num) for num in range(5)])
+        self.assertEqual(lines[0]['result']['entities']['0']['cui'], 'C0')
+
+    def test_keeps_track_of_ids(self):
+        self.sink.write(_get_results(0, 3))
+        other = mp_ents_save.get_sink('jsonl', self.save_dir)
+        self.assertEqual(other.get_annotated_ids(), {"0", "1", "2"})
+
+
+class ParquetSinkTests(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.save_dir = self._temp_dir.name
+        self.sink = mp_ents_save.get_sink(
+            mp_ents_save.AvailableSinks.parquet, self.save_dir)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_writes_parts(self):
+        import pyarrow.parquet as pq
+        self.sink.write(_get_results(0, 3))
+        self.sink.write(_get_results(3, 2))
+        table = pq.read_table(os.path.join(self.save_dir, 'part_1.parquet'))
+        self.assertEqual(table.column('id').to_pylist(), ["3", "4"])
+        result = json.loads(table.column('result')[0].as_py())
+        self.assertEqual(result['entities']['0']['cui'], 'C3')
+
+    def test_continues_after_existing_parts(self):
+        self.sink.write(_get_results(0, 3))
+        other = mp_ents_save.get_sink('parquet', self.save_dir)
+        self.assertEqual(other.part_number, 1)
+        self.assertEqual(other.get_annotated_ids(), {"0", "1", "2"})
+
+
+class BatchAnnotationSaverTests(unittest.TestCase):
+    batches_per_save = 3
+    num_batches = 10
+    batch_size = 4
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.save_dir = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def assert_saves_all(self, sink: str, background: bool):
+        saver = mp_ents_save.BatchAnnotationSaver(
+            self.save_dir, self.batches_per_save, sink=sink,
+            background=background)
+        for batch_num in range(self.num_batches):
+            saver(_get_results(batch_num * self.batch_size, self.batch_size))
+        saver.close()
+        self.assertEqual(
+            saver.get_annotated_ids(),
+            {str(num) for num in range(self.num_batches * self.batch_size)})
+
+    def test_saves_all(self):
+        for sink in mp_ents_save.AvailableSinks:
+            for background in (False, True):
+                with self.subTest(f"{sink.name} (background: {background})"):
+                    self.assert_saves_all(sink.name, background)
+                    self._temp_dir.cleanup()
+                    os.makedirs(self.save_dir)
@@ -0,0 +1,68 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from medcat.storage import zip_utils
+
+import unittest
+import unittest.mock
+import tempfile
+
+from .. import EXAMPLE_MODEL_PACK_ZIP
+
+
+class UnpackToCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self._temp_dir.name, "model.zip")
+        shutil.copy(EXAMPLE_MODEL_PACK_ZIP, self.zip_path)
+        self.cache_dir = os.path.join(self._temp_dir.name, "cache")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_unpacks_into_cache(self):
+        path = zip_utils.unpack_to_cache(self.zip_path, self.cache_dir)
+        self.assertEqual(os.path.dirname(path), self.cache_dir)
+        self.assertTrue(os.path.isdir(os.path.join(path, "cdb")))
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(path)])
+        # nothing unpacked next to the zip
+        self.assertFalse(os.path.exists(self.zip_path[:-4]))
+
+    def test_unpacks_only_once(self):
+        path = zip_utils.unpack_to_cache(self.zip_path, self.cache_dir)
+        with unittest.mock.patch.object(
+                zip_utils.shutil, "unpack_archive") as unpack:
+            self.assertEqual(
+                zip_utils.unpack_to_cache(self.zip_path, self.cache_dir),
+                path)
+        unpack.assert_not_called()
+
+    def test_same_contents_share_folder(self):
+        other_zip = os.path.join(self._temp_dir.name, "other.zip")
+        shutil.copy(self.zip_path, other_zip)
+        self.assertEqual(
+            zip_utils.unpack_to_cache(self.zip_path, self.cache_dir),
+            zip_utils.unpack_to_cache(other_zip, self.cache_dir))
+
+    def test_different_contents_get_different_folders(self):
+        other_zip = os.path.join(self._temp_dir.name, "other.zip")
+        shutil.make_archive(other_zip[:-4], 'zip',
+                            root_dir=os.path.dirname(zip_utils.__file__))
+        self.assertNotEqual(
+            zip_utils.unpack_to_cache(self.zip_path, self.cache_dir),
+            zip_utils.unpack_to_cache(other_zip, self.cache_dir))
+
+    def test_can_unpack_concurrently(self):
+        num_workers = 4
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            paths = list(executor.map(
+                lambda _: zip_utils.unpack_to_cache(
+                    self.zip_path, self.cache_dir),
+                range(num_workers)))
+        self.assertEqual(len(set(paths)), 1)
+        # no partially unpacked folders left behind
+        self.assertEqual(os.listdir(self.cache_dir),
+                         [os.path.basename(paths[0])])
+        self.assertTrue(os.path.isdir(os.path.join(paths[0], "cdb")))
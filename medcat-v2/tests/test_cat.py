@@ -15,14 +15,19 @@ from medcat.cdb import CDB
 from medcat.tokenizing.tokens import UnregisteredDataPathException
 from medcat.tokenizing.tokenizers import TOKENIZER_PREFIX
 from medcat.utils.cdb_state import captured_state_cdb
+from medcat.storage.mp_ents_save import AnnotatedIDIndex
 from medcat.components.addons.meta_cat import MetaCATAddon
+from medcat.components import types
 from medcat.utils.defaults import AVOID_LEGACY_CONVERSION_ENVIRON
+from medcat.utils.defaults import UNPACK_CACHE_DIR_ENVIRON
 from medcat.utils.defaults import LegacyConversionDisabledError
 
 import unittest
 import tempfile
 import pickle
+import multiprocessing
 import shutil
+import threading
 
 from . import EXAMPLE_MODEL_PACK_ZIP
 from . import V1_MODEL_PACK_PATH, UNPACKED_V1_MODEL_PACK_PATH
@@ -88,6 +93,34 @@ class ModelLoadIWithHiddenFilesTests(unittest.TestCase):
         self.assertIsInstance(inst, cat.CAT)
 
 
+class ModelLoadWithUnpackCacheTests(unittest.TestCase):
+    CONFIG_DICT = {"general": {"nlp": {"provider": "regex"}}}
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self._temp_dir.name, "model.zip")
+        shutil.copy(EXAMPLE_MODEL_PACK_ZIP, self.zip_path)
+        self.cache_dir = os.path.join(self._temp_dir.name, "cache")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def assert_loads_from_cache(self, **kwargs):
+        inst = cat.CAT.load_model_pack(
+            self.zip_path, config_dict=self.CONFIG_DICT, **kwargs)
+        self.assertIsInstance(inst, cat.CAT)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertFalse(os.path.exists(self.zip_path[:-4]))
+
+    def test_can_load_through_cache(self):
+        self.assert_loads_from_cache(unpack_cache_dir=self.cache_dir)
+
+    def test_can_set_cache_through_environ(self):
+        with unittest.mock.patch.dict(
+                os.environ, {UNPACK_CACHE_DIR_ENVIRON: self.cache_dir}):
+            self.assert_loads_from_cache()
+
+
 class TrainedModelTests(unittest.TestCase):
     TRAINED_MODEL_PATH = EXAMPLE_MODEL_PACK_ZIP
 
@@ -477,6 +510,21 @@ class CATWithDictNERSupTrainingTests(CATSupTrainingTests):
             texts, batch_size=2, batch_size_chars=-1))
         self.assert_ents(ents, texts)
 
+    def test_pipe_gets_same_entities(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house.",
+            "",
+        ]*3
+        docs = list(self.cat.pipe(texts, batch_size=2))
+        self.assertEqual(len(docs), len(texts))
+        for num, (text, doc) in enumerate(zip(texts, docs)):
+            with self.subTest(f"{num}: {text}"):
+                # NOTE: empty documents get no output
+                got = self.cat._doc_to_out(doc, only_cui=True) if doc else {}
+                self.assertEqual(
+                    got, self.cat.get_entities(text, only_cui=True))
+
     def assert_ents(self, ents: list[tuple], texts: list[str]):
         self.assertEqual(len(ents), len(texts))
         # NOTE: text IDs are integers starting from 0
@@ -499,6 +547,124 @@ class CATWithDictNERSupTrainingTests(CATSupTrainingTests):
             texts, n_process=3, batch_size=2, batch_size_chars=-1))
         self.assert_ents(ents, texts)
 
+    def test_can_multiprocess_with_worker_pool(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        with self.cat.create_worker_pool(2) as pool:
+            # NOTE: the same pool (and models within) reused for each run
+            for run in range(2):
+                with self.subTest(f"Run {run}"):
+                    ents = list(self.cat.get_entities_multi_texts(
+                        texts, batch_size=2, batch_size_chars=-1,
+                        worker_pool=pool))
+                    self.assert_ents(ents, texts)
+
+    def test_worker_pool_gets_same_results(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        # NOTE: only comparing CUIs since the pretty name for concepts
+        #       with multiple names of the same length depends on set
+        #       ordering which can differ between processes
+        exp = dict(self.cat.get_entities_multi_texts(
+            texts, only_cui=True, batch_size=2, batch_size_chars=-1))
+        with self.cat.create_worker_pool(2) as pool:
+            got = dict(self.cat.get_entities_multi_texts(
+                texts, only_cui=True, batch_size=2, batch_size_chars=-1,
+                worker_pool=pool))
+        self.assertEqual(got, exp)
+
+    def test_multiprocess_ordered_keeps_input_order(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        ents = list(self.cat.get_entities_multi_texts(
+            texts, batch_size=2, batch_size_chars=-1, n_process=3,
+            ordered=True))
+        self.assertEqual([text_index for text_index, _ in ents],
+                         [str(num) for num in range(len(texts))])
+
+    def test_multiprocess_unordered_gets_all_results(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        for batches_per_worker in (1, 3):
+            with self.subTest(f"Batches per worker: {batches_per_worker}"):
+                ents = list(self.cat.get_entities_multi_texts(
+                    texts, batch_size=1, batch_size_chars=-1, n_process=3,
+                    batches_per_worker=batches_per_worker))
+                self.assert_ents(ents, texts)
+
+    def test_can_profile_pipeline(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]
+        with self.cat.profile_pipeline() as profile:
+            for text in texts:
+                self.cat.get_entities(text)
+        self.assertIsNone(self.cat.get_pipeline_profile())
+        linker_name = self.cat._pipeline.get_component(
+            types.CoreComponentType.linking).full_name
+        self.assertEqual(profile.components[linker_name].docs, len(texts))
+        self.assertGreater(profile.components[linker_name].entities, 0)
+
+    def test_multiprocess_merges_worker_profiles(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        with self.cat.profile_pipeline() as profile:
+            list(self.cat.get_entities_multi_texts(
+                texts, batch_size=2, batch_size_chars=-1, n_process=3))
+        for name, comp_profile in profile:
+            with self.subTest(name):
+                self.assertEqual(comp_profile.docs, len(texts))
+
+    def test_cannot_multiprocess_with_no_batches_per_worker(self):
+        with self.assertRaises(ValueError):
+            list(self.cat.get_entities_multi_texts(
+                ["Some text"], n_process=2, batches_per_worker=0))
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(),
+        "Forking not available")
+    def test_forked_worker_pool_gets_same_results(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        exp = dict(self.cat.get_entities_multi_texts(
+            texts, only_cui=True, batch_size=2, batch_size_chars=-1))
+        with self.cat.create_worker_pool(2, use_fork=True) as pool:
+            got = dict(self.cat.get_entities_multi_texts(
+                texts, only_cui=True, batch_size=2, batch_size_chars=-1,
+                worker_pool=pool))
+            mem_usage = pool.get_worker_memory_usage()
+        self.assertEqual(got, exp)
+        if mem_usage:
+            # NOTE: the workers share the memory of the model
+            #       so they should only have a little of their own
+            for usage in mem_usage.values():
+                self.assertLess(usage['uss'], usage['rss'])
+
+    def test_cannot_fork_worker_pool_with_model_pack_path(self):
+        with self.assertRaises(ValueError):
+            self.cat.create_worker_pool(
+                1, model_pack_path="some/path", use_fork=True)
+
+    def test_cannot_use_worker_pool_of_other_model(self):
+        other = cat.CAT(cdb=self.cdb, vocab=self.cat.vocab)
+        with other.create_worker_pool(1) as pool:
+            with self.assertRaises(ValueError):
+                list(self.cat.get_entities_multi_texts(
+                    ["Some text"], worker_pool=pool))
+
     def _do_mp_run_with_save(
             self, save_to: str,
             chars_per_batch: int = 165,
@@ -636,6 +802,102 @@ class CATWithDictNERSupTrainingTests(CATSupTrainingTests):
             self.assert_correct_loaded_output(
                 in_data, out_dict_all, all_loaded_output)
 
+    def _do_interrupted_run(self, save_to: str, stop_after: int = 40,
+                            ) -> tuple[list[str], set[str]]:
+        in_data = [
+            f"The patient presented with {name} and "
+            f"did not have {negname}"
+            for name in self.cdb.name2info
+            for negname in self.cdb.name2info if name != negname
+        ]
+        gen = self.cat.get_entities_multi_texts(
+            in_data, save_dir_path=save_to, batch_size_chars=165,
+            batches_per_save=5)
+        # NOTE: stop consuming half way so the remainder never gets saved
+        for _ in range(stop_after):
+            next(gen)
+        gen.close()
+        with open(os.path.join(save_to, 'annotated_ids.pickle'), 'rb') as f:
+            saved_ids, _ = pickle.load(f)
+        return in_data, set(saved_ids)
+
+    def test_resume_skips_saved_texts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            in_data, saved_ids = self._do_interrupted_run(temp_dir)
+            self.assertTrue(saved_ids)
+            self.assertLess(len(saved_ids), len(in_data))
+            out_data = list(self.cat.get_entities_multi_texts(
+                in_data, save_dir_path=temp_dir, batch_size_chars=165,
+                batches_per_save=5, resume=True))
+            resumed_ids = {text_index for text_index, _ in out_data}
+            self.assertFalse(resumed_ids & saved_ids)
+            self.assertEqual(resumed_ids | saved_ids,
+                             {str(num) for num in range(len(in_data))})
+
+    def test_abandoned_run_saves_buffered_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            in_data = [f"The patient presented with {name}"
+                       for name in self.cdb.name2info] * 5
+            gen = self.cat.get_entities_multi_texts(
+                in_data, save_dir_path=temp_dir, batch_size_chars=165,
+                batches_per_save=100, save_format='jsonl',
+                background_saving=True)
+            yielded = {next(gen)[0] for _ in range(len(in_data) // 2)}
+            gen.close()
+            saved_ids = AnnotatedIDIndex(temp_dir).load()
+        self.assertTrue(yielded)
+        self.assertLessEqual(yielded, saved_ids)
+        self.assertFalse([thread for thread in threading.enumerate()
+                          if thread.name.startswith("medcat-ann-saver")])
+
+    def test_resume_keeps_existing_parts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            in_data, saved_ids = self._do_interrupted_run(temp_dir)
+            with open(os.path.join(temp_dir, 'part_0.pickle'), 'rb') as f:
+                first_part = pickle.load(f)
+            list(self.cat.get_entities_multi_texts(
+                in_data, save_dir_path=temp_dir, batch_size_chars=165,
+                batches_per_save=5, resume=True, n_process=2))
+            with open(os.path.join(temp_dir, 'annotated_ids.pickle'),
+                      'rb') as f:
+                ids, num_last_part = pickle.load(f)
+            self.assertEqual(len(ids), len(in_data))
+            all_loaded_output = {}
+            for num in range(num_last_part + 1):
+                with open(os.path.join(temp_dir, f"part_{num}.pickle"),
+                          'rb') as f:
+                    part_data = pickle.load(f)
+                self.assertFalse(part_data.keys() & all_loaded_output.keys())
+                all_loaded_output.update(part_data)
+            self.assertEqual(all_loaded_output.keys(),
+                             {str(num) for num in range(len(in_data))})
+            with open(os.path.join(temp_dir, 'part_0.pickle'), 'rb') as f:
+                self.assertEqual(pickle.load(f), first_part)
+
+    def test_mp_saves_jsonl_in_background(self):
+        texts = [
+            "The fittest most fit of chronic kidney failure",
+            "The dog is sitting outside the house."
+        ]*10
+        with tempfile.TemporaryDirectory() as temp_dir:
+            out_data = list(self.cat.get_entities_multi_texts(
+                texts, only_cui=True, batch_size=2, batch_size_chars=-1,
+                save_dir_path=temp_dir, batches_per_save=3, n_process=2,
+                save_format='jsonl', background_saving=True))
+            with open(os.path.join(temp_dir, 'annotations.jsonl')) as f:
+                saved = {line['id']: line['result']
+                         for line in map(json.loads, f)}
+        self.assertEqual(saved.keys(), dict(out_data).keys())
+        for text_index, result in out_data:
+            with self.subTest(text_index):
+                self.assertEqual(list(saved[text_index]['entities'].values()),
+                                 list(result['entities'].values()))
+
+    def test_cannot_resume_without_save_path(self):
+        with self.assertRaises(ValueError):
+            list(self.cat.get_entities_multi_texts(
+                ["Some text"], resume=True))
+
 
 class CATWithDocAddonTests(CATIncludingTests):
     EXAMPLE_TEXT = "Example text to tokenize"
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+import unittest
+
+
+class LazyImportTests(unittest.TestCase):
+    # NOTE: these are only needed for some of the functionality
+    #       (e.g multiprocessing, training, addons), so they should
+    #       not be imported along with medcat
+    NOT_IMPORTED = [
+        "concurrent.futures.process",
+        "tqdm",
+        "pandas",
+        "spacy",
+        "torch",
+        "transformers",
+        "medcat.config.config_meta_cat",
+        "medcat.config.config_rel_cat",
+    ]
+
+    def get_imported(self, module: str) -> set[str]:
+        # NOTE: in a separate process since the modules may have already
+        #       been imported by other tests
+        result = subprocess.run(
+            [sys.executable, "-c",
+             f"import sys, {module}; print(*sys.modules, sep=chr(10))"],
+            capture_output=True, text=True, check=True)
+        return set(result.stdout.split())
+
+    def test_does_not_import_unused_modules(self):
+        imported = self.get_imported("medcat.cat")
+        for module in self.NOT_IMPORTED:
+            with self.subTest(module):
+                self.assertNotIn(module, imported)
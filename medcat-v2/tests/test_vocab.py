@@ -215,3 +215,77 @@ class DefaultVocabTests(unittest.TestCase):
             # and can load from saved zip
             loaded = Vocab.load(file_name)
             self.assertIsInstance(loaded, Vocab)
+
+
+class ContiguousVectorsTests(unittest.TestCase):
+    all_words = VocabCreationTests.all_words
+
+    def setUp(self):
+        self.vocab = Vocab()
+        for word in self.all_words:
+            self.vocab.add_word(**word)
+        self.contiguous = Vocab()
+        for word in self.all_words:
+            self.contiguous.add_word(**word)
+        self.contiguous.make_vectors_contiguous()
+
+    def assert_same_vectors(self, vocab1: Vocab, vocab2: Vocab):
+        self.assertEqual(vocab1.vocab.keys(), vocab2.vocab.keys())
+        for word in vocab1.vocab:
+            with self.subTest(word):
+                vec1, vec2 = vocab1.vec(word), vocab2.vec(word)
+                if vec1 is None:
+                    self.assertIsNone(vec2)
+                else:
+                    self.assertTrue(np.array_equal(vec1, vec2))
+
+    def test_has_contiguous_matrix(self):
+        self.assertIsNotNone(self.contiguous.vectors)
+        self.assertEqual(self.contiguous.vectors.matrix.dtype, np.float32)
+        for info in self.contiguous.vocab.values():
+            self.assertIsNone(info['vector'])
+
+    def test_has_same_vectors(self):
+        self.assert_same_vectors(self.vocab, self.contiguous)
+        self.assertEqual(self.vocab, self.contiguous)
+
+    def test_can_add_words(self):
+        for vocab in (self.vocab, self.contiguous):
+            vocab.add_word("WORD7", vec=np.array([1, 2, 3]))
+            vocab.add_word("WORD8")
+            vocab.add_vec("WORD8", np.array([3, 2, 1]))
+            vocab.add_word("WORD9")
+        self.assert_same_vectors(self.vocab, self.contiguous)
+
+    def test_can_remove_words(self):
+        for vocab in (self.vocab, self.contiguous):
+            vocab.add_word("WORD7", cnt=1)
+            vocab.remove_words_below_cnt(2)
+        self.assert_same_vectors(self.vocab, self.contiguous)
+        self.assertEqual(self.vocab.vec_index2word,
+                         self.contiguous.vec_index2word)
+
+    def test_gets_same_negative_sample_vectors(self):
+        inds = list(self.vocab.vec_index2word)
+        for vec1, vec2 in zip(self.vocab.get_vectors(inds),
+                              self.contiguous.get_vectors(inds)):
+            self.assertTrue(np.array_equal(vec1, vec2))
+
+    def test_loads_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.contiguous.save(temp_dir, overwrite=True)
+            loaded = Vocab.load(temp_dir)
+            self.assertIsInstance(loaded.vectors.matrix, np.memmap)
+            self.assertEqual(loaded, self.contiguous)
+            # can still be modified
+            loaded.add_word("WORD7", vec=np.array([1, 2, 3]))
+            self.assertTrue(np.array_equal(loaded.vec("WORD7"), [1, 2, 3]))
+            del loaded
+
+    def test_loads_from_zip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, 'vocab.zip')
+            self.contiguous.save(file_name)
+            loaded = Vocab.load(file_name)
+        self.assertNotIsInstance(loaded.vectors.matrix, np.memmap)
+        self.assertEqual(loaded, self.contiguous)
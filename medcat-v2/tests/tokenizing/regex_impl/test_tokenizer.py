@@ -90,3 +90,55 @@ class EntityComplexAddonTests(EntitySimpleAddonDataTests):
     def _get_expected_data(self, ent_num: int,
                            entity: tokenizer.MutableEntity):
         return {0: ent_num}
+
+
+def _get_tokens_linear(doc: tokenizer.MutableDocument, start_index: int,
+                       end_index: int) -> list[tokenizer.MutableToken]:
+    # NOTE: the original implementation that scans all the tokens
+    return [tkn for tkn in doc
+            if start_index <= tkn.base.char_index <= end_index]
+
+
+class GetTokensTests(TestCase):
+    TEXT = ("The patient (aged 45) had kidney failure - and chronic "
+            "pain.  No signs of   diabetes!")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tokenizer = tokenizer.RegexTokenizer()
+
+    def setUp(self):
+        self.doc = self.tokenizer(self.TEXT)
+
+    def assert_same_tokens(self, start_index: int, end_index: int):
+        got = self.doc.get_tokens(start_index, end_index)
+        exp = _get_tokens_linear(self.doc, start_index, end_index)
+        self.assertEqual([tkn.base.index for tkn in got],
+                         [tkn.base.index for tkn in exp])
+
+    def test_same_as_linear_scan(self):
+        for start_index in range(-1, len(self.TEXT) + 2):
+            # NOTE: up to the length of the longest (relevant) names
+            for end_index in range(start_index - 1, start_index + 30):
+                with self.subTest(f"{start_index}...{end_index}"):
+                    self.assert_same_tokens(start_index, end_index)
+
+    def test_gets_entity_tokens(self):
+        start_index = self.TEXT.index("kidney failure")
+        end_index = start_index + len("kidney failure") - 1
+        tokens = self.doc.get_tokens(start_index, end_index)
+        self.assertEqual([tkn.base.text for tkn in tokens],
+                         ["kidney", "failure"])
+
+
+
+class EntityFromTokensTests(TestCase):
+
+    def test_gets_entity_from_tokens(self):
+        rtokenizer = tokenizer.RegexTokenizer()
+        doc = rtokenizer(GetTokensTests.TEXT)
+        tokens = doc.get_tokens(0, 10)
+        ent = rtokenizer.entity_from_tokens(tokens)
+        self.assertEqual(ent.base.start_index, tokens[0].base.index)
+        self.assertEqual(ent.base.end_index, tokens[-1].base.index)
+        self.assertEqual(ent.base.text, "The patient")
@@ -1,10 +1,15 @@
 from typing import runtime_checkable
 
+import spacy
+
 from medcat.tokenizing import tokenizers
 from medcat.tokenizing.spacy_impl.tokenizers import SpacyTokenizer
 from medcat.tokenizing.regex_impl.tokenizer import RegexTokenizer
+from medcat.tokenizing.spacy_impl.tokens import Document
 from medcat.config import Config
 
+from ..regex_impl.test_tokenizer import GetTokensTests
+
 import unittest
 
 
@@ -38,3 +43,10 @@ class DefaultTokenizerInitTests2(DefaultTokenizerInitTests):
     default_provider = 'regex'
     default_cls = RegexTokenizer
     default_creator = RegexTokenizer.create_new_tokenizer
+
+
+class SpacyGetTokensTests(GetTokensTests):
+
+    def setUp(self):
+        # NOTE: a blank pipeline since no model is needed for tokenizing
+        self.doc = Document(spacy.blank("en")(self.TEXT))
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+from medcat.utils.caching import LRUCache
+
+import unittest
+
+
+class _EvictingDict(OrderedDict):
+    """Evicts the key upon moving it (as another thread could)."""
+
+    def move_to_end(self, key, last=True):
+        del self[key]
+        super().move_to_end(key, last)
+
+
+class LRUCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache: LRUCache[str, int] = LRUCache(2)
+
+    def test_gets_cached(self):
+        self.cache.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+
+    def test_misses_uncached(self):
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_keeps_stats(self):
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("a")
+        self.cache.get("b")
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        self.assertEqual(stats["size"], 1)
+
+    def test_clear_keeps_stats(self):
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_can_be_disabled(self):
+        cache: LRUCache[str, int] = LRUCache(0)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_evicted_during_get_is_missed(self):
+        self.cache.set("a", 1)
+        self.cache._data = _EvictingDict(self.cache._data)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    def test_evicted_during_set_does_not_fail(self):
+        self.cache._data = _EvictingDict()
+        self.cache.set("a", 1)
+        self.assertIsNone(self.cache.get("a"))
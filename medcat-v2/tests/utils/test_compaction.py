@@ -0,0 +1,164 @@
+import os
+import json
+
+import numpy as np
+
+from medcat.cat import CAT
+from medcat.utils import compaction
+
+import unittest
+import unittest.mock
+import tempfile
+
+from .. import UNPACKED_EXAMPLE_MODEL_PACK_PATH
+
+
+class CompactForInferenceTests(unittest.TestCase):
+    CONFIG_DICT = {"general": {"nlp": {"provider": "regex"}}}
+    DTYPE = np.float32
+    TEXT = ("The patient had kidney failure with fever and acute heart "
+            "attack. History of diabetes mellitus and hypertension.")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cat = CAT.load_model_pack(UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+                                      config_dict=cls.CONFIG_DICT)
+        cls.ents = cls.cat.get_entities(cls.TEXT)
+        cls.cat.compact_for_inference(cls.DTYPE)
+        # NOTE: the negative sampling probabilities get recalculated upon use
+        cls.cum_probs = cls.cat.vocab.cum_probs
+
+    def test_strips_descriptive_info(self):
+        for cui, info in self.cat.cdb.cui2info.items():
+            with self.subTest(cui):
+                self.assertIsNone(info['description'])
+                self.assertIsNone(info['original_names'])
+                self.assertIsNone(info['in_other_ontology'])
+
+    def test_keeps_info_used_for_inference(self):
+        for cui, info in self.cat.cdb.cui2info.items():
+            with self.subTest(cui):
+                self.assertTrue(info['names'])
+                self.assertGreater(info['count_train'], 0)
+
+    def test_downcasts_context_vectors(self):
+        for cui, info in self.cat.cdb.cui2info.items():
+            for ct, vec in (info['context_vectors'] or {}).items():
+                with self.subTest(f"{cui}: {ct}"):
+                    self.assertEqual(vec.dtype, self.DTYPE)
+
+    def test_downcasts_word_vectors(self):
+        self.assertIsNotNone(self.cat.vocab.vectors)
+        self.assertEqual(self.cat.vocab.vectors.matrix.dtype, self.DTYPE)
+        self.assertEqual(len(self.cum_probs), 0)
+
+    def test_has_same_entities(self):
+        self.assertTrue(self.ents['entities'])
+        self.assertEqual(compaction.compare_annotations(
+            [self.ents], [self.cat.get_entities(self.TEXT)]), [])
+
+    def test_can_still_get_negative_samples(self):
+        self.assertTrue(self.cat.vocab.get_negative_samples(5))
+
+    def test_can_save_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mpp = self.cat.save_model_pack(temp_dir)
+            loaded = CAT.load_model_pack(mpp, config_dict=self.CONFIG_DICT)
+        self.assertEqual(compaction.compare_annotations(
+            [self.ents], [loaded.get_entities(self.TEXT)]), [])
+
+
+class CompactForInferenceFloat16Tests(CompactForInferenceTests):
+    DTYPE = np.float16
+
+
+class CompactFrozenTests(unittest.TestCase):
+
+    def test_fails_to_compact_frozen(self):
+        cat = CAT.load_model_pack(
+            UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+            config_dict=CompactForInferenceTests.CONFIG_DICT,
+            freeze_cdb=True)
+        with self.assertRaises(ValueError):
+            cat.compact_for_inference()
+
+
+class CompareAnnotationsTests(unittest.TestCase):
+    ENTS = {"entities": {
+        0: {"start": 0, "end": 5, "cui": "C01", "context_similarity": 0.5},
+        1: {"start": 6, "end": 9, "cui": "C02", "context_similarity": 0.4},
+    }}
+
+    def test_same_has_no_differences(self):
+        self.assertEqual(
+            compaction.compare_annotations([self.ENTS], [self.ENTS]), [])
+
+    def test_finds_missing_entity(self):
+        got = {"entities": {0: self.ENTS["entities"][0]}}
+        diffs = compaction.compare_annotations([self.ENTS], [got])
+        self.assertEqual(len(diffs), 1)
+        self.assertIn("only found before", diffs[0])
+
+    def test_finds_changed_similarity(self):
+        got = {"entities": {
+            0: self.ENTS["entities"][0],
+            1: dict(self.ENTS["entities"][1], context_similarity=0.3)}}
+        self.assertEqual(len(compaction.compare_annotations(
+            [self.ENTS], [got], tolerance=0.01)), 1)
+        self.assertEqual(compaction.compare_annotations(
+            [self.ENTS], [got], tolerance=0.2), [])
+
+
+class CompactModelPackTests(unittest.TestCase):
+    TEXTS = [CompactForInferenceTests.TEXT, "Fever and hypertension."]
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir = self._temp_dir.name
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_compacted_pack_is_smaller(self):
+        # NOTE: resaved so that the only difference is the compaction
+        orig_path = CAT.load_model_pack(
+            UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+            config_dict=CompactForInferenceTests.CONFIG_DICT
+        ).save_model_pack(self.temp_dir, pack_name="orig",
+                          make_archive=False, add_hash_to_pack_name=False)
+        report = compaction.compact_model_pack(
+            orig_path, self.temp_dir,
+            texts=self.TEXTS,
+            config_dict=CompactForInferenceTests.CONFIG_DICT,
+            make_archive=False)
+        self.assertTrue(os.path.isdir(report["compacted"]))
+        self.assertLess(report["compacted_size"], report["original_size"])
+        self.assertEqual(report["differences"], [])
+
+    def test_gets_path_size(self):
+        file_path = os.path.join(self.temp_dir, "file.txt")
+        with open(file_path, 'w') as f:
+            f.write("1234")
+        self.assertEqual(compaction.get_path_size(file_path), 4)
+        self.assertEqual(compaction.get_path_size(self.temp_dir), 4)
+
+    def test_main_writes_report(self):
+        texts_path = os.path.join(self.temp_dir, "texts.txt")
+        with open(texts_path, 'w') as f:
+            f.write("\n".join(self.TEXTS))
+        out_path = os.path.join(self.temp_dir, "report.json")
+        orig_load = CAT.load_model_pack
+
+        def load_with_regex(path, **kwargs):
+            # NOTE: the default (spacy) tokenizer may not be available
+            kwargs["config_dict"] = CompactForInferenceTests.CONFIG_DICT
+            return orig_load(path, **kwargs)
+
+        with unittest.mock.patch.object(CAT, "load_model_pack",
+                                        side_effect=load_with_regex):
+            compaction.main([UNPACKED_EXAMPLE_MODEL_PACK_PATH, self.temp_dir,
+                             "--texts", texts_path, "--output", out_path])
+        with open(out_path) as f:
+            report = json.load(f)
+        self.assertEqual(report["differences"], [])
+        self.assertTrue(os.path.exists(report["compacted"]))
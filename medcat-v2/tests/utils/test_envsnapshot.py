@@ -1,6 +1,7 @@
 from medcat.utils import envsnapshot
 
 import unittest
+import unittest.mock
 
 
 class DependencyGetterTests(unittest.TestCase):
@@ -73,3 +74,24 @@ class EnvSnapshotTests(unittest.TestCase):
     def test_has_py3(self):
         self.assertIn("3.", self.env.python_version)
         self.assertTrue(self.env.python_version.startswith("3."))
+
+
+class CurrentEnvironmentTests(unittest.TestCase):
+
+    def test_same_as_environment_info(self):
+        self.assertEqual(envsnapshot.get_current_environment(),
+                         envsnapshot.get_environment_info())
+
+    def test_gets_environment_once(self):
+        envsnapshot._get_environment_info_once.cache_clear()
+        with unittest.mock.patch.object(
+                envsnapshot, "get_environment_info",
+                wraps=envsnapshot.get_environment_info) as mock_get_env:
+            envsnapshot.get_current_environment()
+            envsnapshot.get_current_environment()
+        mock_get_env.assert_called_once()
+
+    def test_gets_copies(self):
+        env = envsnapshot.get_current_environment()
+        env.dependencies.clear()
+        self.assertTrue(envsnapshot.get_current_environment().dependencies)
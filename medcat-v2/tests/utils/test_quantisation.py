@@ -0,0 +1,169 @@
+import os
+import json
+
+import numpy as np
+
+from medcat.cat import CAT
+from medcat.cdb import FrozenCDB
+from medcat.utils import quantisation
+from medcat.utils.compaction import compare_annotations
+from medcat.utils.matutils import quantise_int8, dequantise_int8, unitvec
+
+import unittest
+import unittest.mock
+import tempfile
+
+from .. import UNPACKED_EXAMPLE_MODEL_PACK_PATH
+
+
+class QuantiseInt8Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.matrix = self.rng.standard_normal((10, 300))
+
+    def test_restores_matrix(self):
+        quantised, scales = quantise_int8(self.matrix)
+        self.assertEqual(quantised.dtype, np.int8)
+        self.assertEqual(scales.shape, (10, ))
+        restored = dequantise_int8(quantised, scales)
+        self.assertTrue(np.allclose(restored, self.matrix,
+                                    atol=scales.max() / 2 + 1e-6))
+
+    def test_restores_vector(self):
+        quantised, scale = quantise_int8(self.matrix[0])
+        restored = dequantise_int8(quantised, scale)
+        self.assertEqual(restored.shape, self.matrix[0].shape)
+        self.assertTrue(np.allclose(restored, self.matrix[0],
+                                    atol=scale / 2 + 1e-6))
+
+    def test_keeps_direction(self):
+        quantised, _ = quantise_int8(self.matrix[0])
+        self.assertAlmostEqual(
+            float(unitvec(quantised) @ unitvec(self.matrix[0])), 1.0,
+            places=4)
+
+    def test_handles_zeros(self):
+        quantised, scales = quantise_int8(np.zeros((2, 5)))
+        self.assertFalse(quantised.any())
+        self.assertFalse(dequantise_int8(quantised, scales).any())
+
+
+class QuantisedCATTests(unittest.TestCase):
+    CONFIG_DICT = {"general": {"nlp": {"provider": "regex"}}}
+    DTYPE = "int8"
+    TOLERANCE = 0.01
+    TEXT = ("The patient had kidney failure with fever and acute heart "
+            "attack. History of diabetes mellitus and hypertension.")
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cat = CAT.load_model_pack(UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+                                      config_dict=cls.CONFIG_DICT)
+        cls.quantised = CAT.load_model_pack(
+            UNPACKED_EXAMPLE_MODEL_PACK_PATH, config_dict=cls.CONFIG_DICT,
+            context_vector_dtype=cls.DTYPE)
+
+    def test_freezes_cdb(self):
+        self.assertIsInstance(self.quantised.cdb, FrozenCDB)
+
+    def test_has_same_entities(self):
+        ents = self.cat.get_entities(self.TEXT)
+        self.assertTrue(ents['entities'])
+        self.assertEqual(compare_annotations(
+            [ents], [self.quantised.get_entities(self.TEXT)],
+            self.TOLERANCE), [])
+
+    def test_saves_quantised_cdb_into_model_pack(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mpp = self.quantised.save_model_pack(temp_dir)
+            loaded = CAT.load_model_pack(mpp, config_dict=self.CONFIG_DICT)
+        self.assertIsInstance(loaded.cdb, FrozenCDB)
+        self.assertEqual(loaded.cdb.get_context_vectors_size(),
+                         self.quantised.cdb.get_context_vectors_size())
+        self.assertEqual(compare_annotations(
+            [self.quantised.get_entities(self.TEXT)],
+            [loaded.get_entities(self.TEXT)]), [])
+
+
+class HalfPrecisionCATTests(QuantisedCATTests):
+    DTYPE = "float16"
+
+
+class EvaluateQuantisationTests(unittest.TestCase):
+    TEXTS = [QuantisedCATTests.TEXT, "Fever and hypertension."]
+
+    @classmethod
+    def setUpClass(cls):
+        cat = CAT.load_model_pack(UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+                                  config_dict=QuantisedCATTests.CONFIG_DICT)
+        # NOTE: the annotations are those of the original model
+        #       (along with a deleted one that should be ignored)
+        cls.export = {"projects": [{
+            "name": "Project", "id": 1, "cuis": "", "tuis": None,
+            "documents": [{
+                "name": f"Doc {num}", "id": num, "last_modified": "",
+                "text": text,
+                "annotations": [
+                    {"start": ent["start"], "end": ent["end"],
+                     "cui": ent["cui"], "value": ent["source_value"],
+                     "correct": True, "deleted": False}
+                    for ent in cat.get_entities(text)["entities"].values()
+                ] + [{"start": 0, "end": 3, "cui": "C01", "value": "The",
+                      "correct": True, "deleted": True}]
+            } for num, text in enumerate(cls.TEXTS)]}]}
+        cls.num_anns = sum(len(doc["annotations"]) - 1
+                           for doc in cls.export["projects"][0]["documents"])
+
+    def test_reports_same_decisions(self):
+        _, report = quantisation.evaluate_quantisation(
+            UNPACKED_EXAMPLE_MODEL_PACK_PATH, self.export,
+            config_dict=QuantisedCATTests.CONFIG_DICT)
+        self.assertEqual(report["dtype"], "int8")
+        self.assertLess(report["size_after"], report["size_before"])
+        self.assertEqual(report["annotations"], self.num_anns)
+        self.assertEqual(report["correct_before"], self.num_anns)
+        self.assertEqual(report["correct_after"], self.num_anns)
+        self.assertEqual(report["annotations_changed"], 0)
+        self.assertEqual(report["entities_changed"], 0)
+        self.assertEqual(report["examples"], [])
+
+    def test_reports_changed_decisions(self):
+        cat = CAT.load_model_pack(UNPACKED_EXAMPLE_MODEL_PACK_PATH,
+                                  config_dict=QuantisedCATTests.CONFIG_DICT)
+        ents = cat.get_entities(self.TEXTS[0])["entities"]
+        changed = {key: dict(ent, cui="C99") for key, ent in ents.items()}
+        with unittest.mock.patch.object(
+                CAT, "get_entities", side_effect=[
+                    {"entities": ents}, {"entities": changed},
+                    {"entities": {}}, {"entities": {}}]):
+            report = quantisation.compare_linking(cat, cat, self.export)
+        self.assertEqual(report["entities_changed"], len(ents))
+        self.assertEqual(report["annotations_changed"], len(ents))
+        self.assertEqual(report["correct_after"], 0)
+        self.assertEqual(report["examples"][0]["cui_after"], "C99")
+
+    def test_main_writes_report(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            export_path = os.path.join(temp_dir, "export.json")
+            with open(export_path, 'w') as f:
+                json.dump(self.export, f)
+            out_path = os.path.join(temp_dir, "report.json")
+            orig_load = CAT.load_model_pack
+
+            def load_with_regex(path, **kwargs):
+                # NOTE: the default (spacy) tokenizer may not be available
+                kwargs["config_dict"] = QuantisedCATTests.CONFIG_DICT
+                return orig_load(path, **kwargs)
+
+            with unittest.mock.patch.object(CAT, "load_model_pack",
+                                            side_effect=load_with_regex):
+                quantisation.main([
+                    UNPACKED_EXAMPLE_MODEL_PACK_PATH, export_path,
+                    "--dtype", "float16", "--save-to", temp_dir,
+                    "--output", out_path])
+            with open(out_path) as f:
+                report = json.load(f)
+            self.assertTrue(os.path.exists(report["saved_to"]))
+        self.assertEqual(report["dtype"], "float16")
+        self.assertEqual(report["annotations_changed"], 0)
@@ -105,3 +105,26 @@ class OverallTransformationTests(VocabTransformationTests):
     def do_conversion(cls):
         vocab_utils.convert_vocab_vector_size(cls.cdb, cls.vocab,
                                               cls.TARGET_SIZE)
+
+
+class ContiguousVocabTransformationTests(VocabTransformationTests):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.orig_vocab = Vocab()
+        for word, cnt, vec in WORDS:
+            cls.orig_vocab.add_word(word, cnt, vec)
+        vocab_utils.convert_vocab(
+            cls.orig_vocab, vocab_utils.calc_matrix(cls.orig_vocab, 3))
+        super().setUpClass()
+
+    @classmethod
+    def do_conversion(cls):
+        cls.vocab.make_vectors_contiguous()
+        super().do_conversion()
+
+    def test_same_as_per_word_vectors(self):
+        for w in self.vocab.vocab:
+            with self.subTest(w):
+                self.assertTrue(np.allclose(
+                    self.vocab.vec(w), self.orig_vocab.vec(w), atol=1e-5))